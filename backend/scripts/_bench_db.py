@@ -0,0 +1,123 @@
+"""
+基准测试公共数据库环境
+
+导入本模块时设置 DATABASE_URL（需在导入 src 之前导入本模块）:
+- 默认使用临时 SQLite 文件库（aiosqlite）作为本地替身，并补充业务 SQL 用到的 MySQL 函数
+- 设置 BENCH_DATABASE_URL（mysql+asyncmy://...）时改为在 MySQL 上测试，
+  应指向专用的空库，create_schema/drop_schema 会建表和删除全部业务表
+
+另提供建表和构造课程、用户、学员数据的辅助函数。
+"""
+import os
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+_tmp_dir = tempfile.mkdtemp(prefix="bench-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCH_DATABASE_URL", f"sqlite+aiosqlite:///{_tmp_dir}/bench.db"
+)
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("LOG_DIR", f"{_tmp_dir}/logs")
+os.environ.setdefault("DB_SLOW_QUERY_THRESHOLD", "0")
+os.environ.setdefault("DB_N_PLUS_ONE_THRESHOLD", "0")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+
+from src.core.database import engine, read_engine  # noqa: E402
+from src.models.domain import Community, Course, Student, Teacher, User  # noqa: E402
+from src.models.domain.base import Base  # noqa: E402
+
+IS_SQLITE = engine.dialect.name == "sqlite"
+BACKEND = "sqlite" if IS_SQLITE else engine.dialect.name
+
+if IS_SQLITE:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_functions(dbapi_connection, connection_record) -> None:
+        dbapi_connection.create_function("greatest", -1, max)
+        dbapi_connection.create_function("least", -1, min)
+        # 并发写入时等待锁而不是立即报错
+        dbapi_connection.execute("PRAGMA busy_timeout = 30000")
+
+
+def _create_sqlite_schema(conn) -> None:
+    # SQLite 的索引名在库内全局唯一，索引名加上表名前缀
+    for table in Base.metadata.sorted_tables:
+        conn.execute(CreateTable(table))
+        for index in table.indexes:
+            columns = ", ".join(column.name for column in index.columns)
+            unique = "UNIQUE " if index.unique else ""
+            conn.exec_driver_sql(
+                f"CREATE {unique}INDEX {table.name}__{index.name} ON {table.name} ({columns})"
+            )
+
+
+async def create_schema() -> None:
+    """创建全部业务表"""
+    async with engine.begin() as conn:
+        if IS_SQLITE:
+            await conn.run_sync(_create_sqlite_schema)
+        else:
+            await conn.run_sync(Base.metadata.create_all)
+
+
+async def drop_schema() -> None:
+    """删除全部业务表并释放连接池"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+def bench_id(prefix: str, number: int) -> str:
+    """生成 32 位的测试数据 ID"""
+    return f"{prefix}{number:0{32 - len(prefix)}d}"
+
+
+COMMUNITY_ID = bench_id("community", 1)
+TEACHER_ID = bench_id("teacher", 1)
+
+
+def add_catalog(db) -> None:
+    """添加课程共用的小区和教练"""
+    db.add(Community(
+        id=COMMUNITY_ID, name="小区", address="地址",
+        latitude=Decimal("30.0"), longitude=Decimal("120.0"),
+    ))
+    db.add(Teacher(id=TEACHER_ID, name="教练"))
+
+
+def add_course(db, course_id: str, max_students: int) -> None:
+    """添加一门报名中的课程（需先 add_catalog）"""
+    db.add(Course(
+        id=course_id, community_id=COMMUNITY_ID, teacher_id=TEACHER_ID, name="课程",
+        age_min=3, age_max=12, total_weeks=10, total_lessons=10, schedule_day="6",
+        schedule_start=time(9), schedule_end=time(10, 30),
+        price=Decimal("100.00"), member_price=Decimal("80.00"),
+        min_students=1, max_students=max_students, enrolled_count=0,
+        deadline=datetime.now() + timedelta(days=7), status="enrolling",
+    ))
+
+
+def add_user(db, user_id: str, students: int = 1) -> list[str]:
+    """添加一个用户及其学员
+
+    Returns:
+        学员 ID 列表
+    """
+    db.add(User(id=user_id, openid=f"openid-{user_id}", status=1))
+    student_ids = []
+    for index in range(students):
+        student_id = bench_id(f"s{user_id[-8:]}x", index)
+        db.add(Student(
+            id=student_id, user_id=user_id, id_type="id_card", id_name=f"学员{index}",
+            id_number="encrypted", id_number_hash=f"hash-{student_id}",
+            birthday=date(2018, 1, 1), gender="male",
+        ))
+        student_ids.append(student_id)
+    return student_ids
@@ -0,0 +1,7 @@
+-- 为管理端列表游标分页添加索引
+-- 游标分页按 (created_at, id) 倒序做范围查询，深度翻页也只扫描一页数据
+-- orders 表已有 idx_created_at（InnoDB 二级索引隐含主键列），无需新增
+
+ALTER TABLE `students` ADD KEY `idx_created_at_id` (`created_at`, `id`);
+ALTER TABLE `teachers` ADD KEY `idx_created_at_id` (`created_at`, `id`);
+ALTER TABLE `user_members` ADD KEY `idx_created_at_id` (`created_at`, `id`);
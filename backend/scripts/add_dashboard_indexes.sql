@@ -0,0 +1,6 @@
+-- 为仪表盘统计任务添加索引
+-- 每日统计按 users.created_at 汇总最近两天的新增用户；
+-- 按 orders.updated_at 找出最近有状态变更（退款等）的订单，重新汇总其支付日
+
+ALTER TABLE `users` ADD KEY `idx_created_at` (`created_at`);
+ALTER TABLE `orders` ADD KEY `idx_updated_at` (`updated_at`);
@@ -0,0 +1,4 @@
+-- 为订单过期清理任务添加索引
+-- 后台任务按 status = 'pending' AND expire_at < NOW() 分批扫描，避免全表扫描历史订单
+
+ALTER TABLE `orders` ADD KEY `idx_status_expire_at` (`status`, `expire_at`);
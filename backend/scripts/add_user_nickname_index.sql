@@ -0,0 +1,4 @@
+-- 为管理端用户搜索添加昵称索引
+-- 用户列表按昵称/手机号前缀匹配（LIKE 'kw%'），phone 已有 idx_phone
+
+ALTER TABLE `users` ADD KEY `idx_nickname` (`nickname`);
@@ -0,0 +1,117 @@
+"""
+认证依赖链基准测试
+
+对比每个认证请求在 get_current_user_id + get_current_user 上的耗时:
+- before: 每次校验 JWT 签名，每次查询 users 表（缓存前的实现）
+- miss: 令牌缓存命中，登录主体缓存未命中（查询 users 表并写入快照）
+- hit: 令牌缓存和登录主体缓存都命中（由快照重建实例，不访问数据库）
+另单独对比 decode_access_token 校验签名与命中缓存的耗时。
+
+默认使用临时 SQLite 文件库（aiosqlite）作为本地替身，数据库往返远快于网络上的 MySQL，
+before/miss 与 hit 的真实差距会更大；设置 BENCH_DATABASE_URL（mysql+asyncmy://...）时改为在 MySQL 上测试。
+
+用法（在 backend 目录下）:
+    python scripts/bench_auth.py [请求数]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+_tmp_dir = tempfile.mkdtemp(prefix="bench-auth-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCH_DATABASE_URL", f"sqlite+aiosqlite:///{_tmp_dir}/bench.db"
+)
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from jose import jwt  # noqa: E402
+
+from src.api.deps import get_current_user, get_current_user_id  # noqa: E402
+from src.core import security  # noqa: E402
+from src.core.config import settings  # noqa: E402
+from src.core.database import async_session_maker, engine  # noqa: E402
+from src.models.domain import User  # noqa: E402
+from src.repositories.base import BaseRepository  # noqa: E402
+
+USER_ID = "bench0000000000000000000000user"
+
+
+async def setup() -> str:
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.drop, checkfirst=True)
+        await conn.run_sync(User.__table__.create)
+    async with async_session_maker() as db:
+        db.add(User(id=USER_ID, openid="bench-openid", nickname="bench", status=1))
+        await db.commit()
+    return "Bearer " + security.create_access_token({"sub": USER_ID})
+
+
+async def auth_before(authorization: str) -> None:
+    """缓存前的实现：校验签名 + 查询用户"""
+    token = authorization.split()[1]
+    payload = jwt.decode(token, settings.secret_key, algorithms=[security.ALGORITHM])
+    async with async_session_maker() as db:
+        user = await BaseRepository(User).get(db, payload["sub"])
+        assert user.status == 1
+
+
+async def auth_after(authorization: str) -> None:
+    async with async_session_maker() as db:
+        user_id = await get_current_user_id(authorization)
+        await get_current_user(user_id, db)
+
+
+async def measure(func, authorization: str, requests: int, clear: bool = False) -> float:
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        if clear:
+            security.principal_cache.clear()
+        await func(authorization)
+    return (time.perf_counter() - start_time) / requests * 1e6
+
+
+def measure_decode(token: str, requests: int) -> tuple[float, float]:
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        jwt.decode(token, settings.secret_key, algorithms=[security.ALGORITHM])
+    verify = (time.perf_counter() - start_time) / requests * 1e6
+
+    security.decode_access_token(token)
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        security.decode_access_token(token)
+    cached = (time.perf_counter() - start_time) / requests * 1e6
+    return verify, cached
+
+
+async def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    authorization = await setup()
+    try:
+        verify, cached = measure_decode(authorization.split()[1], requests)
+
+        # 预热连接池
+        await auth_before(authorization)
+        results = [
+            ("before", await measure(auth_before, authorization, requests)),
+            ("miss", await measure(auth_after, authorization, requests, clear=True)),
+            ("hit", await measure(auth_after, authorization, requests)),
+        ]
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.drop, checkfirst=True)
+        await engine.dispose()
+
+    backend = "mysql" if "BENCH_DATABASE_URL" in os.environ else "sqlite"
+    print(f"backend={backend} requests={requests}")
+    print(f"decode verify  {verify:8.2f} us/call")
+    print(f"decode cached  {cached:8.2f} us/call")
+    for name, per_request in results:
+        print(f"{name:14s} {per_request:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+深分页基准测试
+
+在学员表上对比不同页码下单页查询的耗时:
+- offset: get_multi 按 created_at 倒序 OFFSET (page-1)*page_size（优化前的深分页方式）
+- cursor: get_multi_by_cursor 从上一页最后一条记录的 (created_at, id) 开始做范围查询
+
+游标分页的耗时应与页码无关，偏移分页随页码线性增长。
+第 N 页的游标直接由第 N-1 页最后一条记录生成，不逐页翻到第 N 页。
+
+默认使用临时 SQLite 文件库作为本地替身；设置 BENCH_DATABASE_URL 时在 MySQL 上测试。
+
+用法（在 backend 目录下）:
+    python scripts/bench_cursor_pagination.py [最大页码] [每页条数] [重复次数]
+"""
+import asyncio
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import _bench_db
+from _bench_db import add_user, bench_id, create_schema, drop_schema
+
+from sqlalchemy import insert, select
+
+from src.core.database import async_session_maker
+from src.models.domain import Student
+from src.repositories.base import BaseRepository, encode_cursor
+
+USER_ID = bench_id("user", 1)
+# 每批插入的行数
+BATCH_SIZE = 5_000
+
+
+async def seed(rows: int) -> None:
+    async with async_session_maker() as db:
+        add_user(db, USER_ID, 0)
+        await db.flush()
+        start = datetime(2024, 1, 1)
+        for offset in range(0, rows, BATCH_SIZE):
+            await db.execute(insert(Student), [
+                {
+                    "id": bench_id("student", number), "user_id": USER_ID,
+                    "id_type": "id_card", "id_name": f"学员{number}",
+                    "id_number": "encrypted", "id_number_hash": f"hash{number}",
+                    "birthday": date(2018, 1, 1), "gender": "male",
+                    "member_type": "normal", "status": 1,
+                    # 每两条记录的创建时间相同，覆盖按 id 区分先后的情况
+                    "created_at": start + timedelta(seconds=number // 2),
+                    "updated_at": start,
+                }
+                for number in range(offset, min(offset + BATCH_SIZE, rows))
+            ])
+        await db.commit()
+
+
+async def cursor_for(page: int, page_size: int) -> str:
+    """第 page 页的游标（第一页为空字符串）"""
+    if page == 1:
+        return ""
+    async with async_session_maker() as db:
+        last = (await db.execute(
+            select(Student.created_at, Student.id)
+            .order_by(Student.created_at.desc(), Student.id.desc())
+            .offset((page - 1) * page_size - 1)
+            .limit(1)
+        )).one()
+    return encode_cursor(last.created_at, last.id)
+
+
+async def cursor_page(repo: BaseRepository, db, page_size: int, cursor: str) -> list:
+    items, _ = await repo.get_multi_by_cursor(db, limit=page_size, cursor=cursor)
+    return items
+
+
+async def measure(query, repeat: int) -> tuple[float, list[str]]:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        async with async_session_maker() as db:
+            items = await query(db)
+    elapsed = (time.perf_counter() - start_time) / repeat * 1000
+    return elapsed, [item.id for item in items]
+
+
+async def main() -> None:
+    max_page = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    pages = [page for page in (1, 10, 100, 1_000, 10_000) if page < max_page] + [max_page]
+    rows = max_page * page_size
+
+    repo = BaseRepository(Student)
+    await create_schema()
+    try:
+        start_time = time.perf_counter()
+        await seed(rows)
+        print(
+            f"backend={_bench_db.BACKEND} rows={rows} page_size={page_size} repeat={repeat}"
+            f" seed={time.perf_counter() - start_time:.1f}s"
+        )
+        print(f"{'page':>6s} {'offset ms':>10s} {'cursor ms':>10s}")
+        for page in pages:
+            cursor = await cursor_for(page, page_size)
+            offset_ms, offset_ids = await measure(
+                lambda db: repo.get_multi(
+                    db, skip=(page - 1) * page_size, limit=page_size,
+                    order_by="created_at", order_desc=True,
+                ),
+                repeat,
+            )
+            cursor_ms, cursor_ids = await measure(
+                lambda db: cursor_page(repo, db, page_size, cursor), repeat
+            )
+            assert len(cursor_ids) == page_size and len(offset_ids) == page_size
+            print(f"{page:6d} {offset_ms:10.2f} {cursor_ms:10.2f}")
+    finally:
+        await drop_schema()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
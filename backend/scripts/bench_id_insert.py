@@ -0,0 +1,107 @@
+"""
+主键方案插入吞吐基准测试
+
+对比 uuid4().hex（随机）与 generate_id()（UUIDv7，按时间递增）作为 32 位字符串主键时的插入吞吐。
+
+默认使用 SQLite 的 WITHOUT ROWID 表作为本地替身：与 InnoDB 一样按主键组织聚簇 B 树，
+随机主键会插入到树的任意位置，递增主键只追加到最右侧叶子页。
+设置环境变量 BENCH_DATABASE_URL（mysql+pymysql://...）时改为在 MySQL 上测试。
+
+用法（在 backend 目录下）:
+    python scripts/bench_id_insert.py [行数] [每批行数]
+"""
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# 直接加载 id_generator，不依赖 src.utils 中其他模块的第三方包
+_spec = importlib.util.spec_from_file_location(
+    "id_generator",
+    Path(__file__).resolve().parents[1] / "src" / "utils" / "id_generator.py",
+)
+id_generator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(id_generator)
+
+SCHEMES = {
+    "uuid4": lambda: uuid.uuid4().hex,
+    "uuid7": id_generator.generate_id,
+}
+
+# 模拟 orders 表的一行（主键之外约 200 字节）
+PAYLOAD = "x" * 200
+
+
+def bench_sqlite(scheme: str, rows: int, batch: int) -> float:
+    make_id = SCHEMES[scheme]
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        # 缓存远小于表大小，随机插入时需要频繁换入换出页
+        conn.execute("PRAGMA cache_size = -8000")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            "CREATE TABLE orders (id CHAR(32) PRIMARY KEY, payload TEXT) WITHOUT ROWID"
+        )
+        start_time = time.perf_counter()
+        for offset in range(0, rows, batch):
+            conn.executemany(
+                "INSERT INTO orders (id, payload) VALUES (?, ?)",
+                [(make_id(), PAYLOAD) for _ in range(min(batch, rows - offset))],
+            )
+            conn.commit()
+        elapsed = time.perf_counter() - start_time
+        conn.close()
+    return elapsed
+
+
+def bench_mysql(url: str, scheme: str, rows: int, batch: int) -> float:
+    from sqlalchemy import create_engine, text
+
+    make_id = SCHEMES[scheme]
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS bench_orders"))
+        conn.execute(
+            text(
+                "CREATE TABLE bench_orders (id VARCHAR(32) PRIMARY KEY, payload TEXT) "
+                "ENGINE=InnoDB"
+            )
+        )
+    start_time = time.perf_counter()
+    for offset in range(0, rows, batch):
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO bench_orders (id, payload) VALUES (:id, :payload)"),
+                [
+                    {"id": make_id(), "payload": PAYLOAD}
+                    for _ in range(min(batch, rows - offset))
+                ],
+            )
+    elapsed = time.perf_counter() - start_time
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE bench_orders"))
+    engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    url = os.environ.get("BENCH_DATABASE_URL")
+
+    print(f"backend={'mysql' if url else 'sqlite'} rows={rows} batch={batch}")
+    for scheme in SCHEMES:
+        if url:
+            elapsed = bench_mysql(url, scheme, rows, batch)
+        else:
+            elapsed = bench_sqlite(scheme, rows, batch)
+        print(f"{scheme:6s} {elapsed:8.2f}s {rows / elapsed:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
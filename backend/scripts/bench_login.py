@@ -0,0 +1,173 @@
+"""
+管理员登录负载测试
+
+并发管理员登录的同时，以固定间隔请求一个无关接口（GET /），并测量事件循环延迟，对比:
+- idle: 没有登录请求时的基线
+- blocking: 在事件循环中直接调用 bcrypt.checkpw（优化前）
+- executor: verify_password_async 在有界密码线程池中执行（当前实现）
+
+通过 ASGI 直接调用应用（不经过网络），输出登录和无关接口的 p50/p99/max 延迟、
+事件循环最大延迟，以及密码线程池的排队统计。
+
+默认使用临时 SQLite 文件库作为本地替身；设置 BENCH_DATABASE_URL 时在 MySQL 上测试。
+
+用法（在 backend 目录下）:
+    python scripts/bench_login.py [登录总数] [登录并发数]
+"""
+import asyncio
+import os
+import sys
+import time
+
+# 控制台只输出告警，避免逐请求日志干扰延迟
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import _bench_db  # noqa: E402
+from _bench_db import bench_id, create_schema, drop_schema  # noqa: E402
+
+import httpx  # noqa: E402
+
+from src.core.database import async_session_maker  # noqa: E402
+from src.core.executor import password_executor  # noqa: E402
+from src.core.logging import setup_logging, shutdown_logging  # noqa: E402
+from src.main import app  # noqa: E402
+from src.models.domain import Admin  # noqa: E402
+from src.services import admin_service  # noqa: E402
+from src.utils import hash_password, verify_password  # noqa: E402
+
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+# 无关接口的请求间隔和事件循环延迟的采样间隔（秒）
+PROBE_INTERVAL = 0.02
+LAG_INTERVAL = 0.005
+
+original_verify = admin_service.verify_password_async
+
+
+async def verify_password_blocking(plain_password: str, hashed_password: str) -> bool:
+    """优化前的实现：在事件循环中直接计算"""
+    return verify_password(plain_password, hashed_password)
+
+
+async def seed() -> None:
+    async with async_session_maker() as db:
+        db.add(Admin(
+            id=bench_id("admin", 1), username=USERNAME,
+            password_hash=hash_password(PASSWORD), name="管理员", status=1,
+        ))
+        await db.commit()
+
+
+def percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        response = await client.get("/")
+        latencies.append(time.perf_counter() - start_time)
+        assert response.status_code == 200
+        await asyncio.sleep(PROBE_INTERVAL)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start_time - LAG_INTERVAL)
+
+
+async def login(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, latencies: list[float]
+) -> None:
+    async with semaphore:
+        start_time = time.perf_counter()
+        response = await client.post(
+            "/api/v1/admin/auth/login", json={"username": USERNAME, "password": PASSWORD}
+        )
+        latencies.append(time.perf_counter() - start_time)
+        assert response.status_code == 200, response.text
+
+
+async def run(mode: str, logins: int, concurrency: int) -> None:
+    if mode == "blocking":
+        admin_service.verify_password_async = verify_password_blocking
+    else:
+        admin_service.verify_password_async = original_verify
+
+    login_latencies: list[float] = []
+    probe_latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/")
+        background = [
+            asyncio.create_task(probe(client, stop, probe_latencies)),
+            asyncio.create_task(measure_lag(stop, lags)),
+        ]
+        start_time = time.perf_counter()
+        if mode == "idle":
+            await asyncio.sleep(1)
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(
+                login(client, semaphore, login_latencies) for _ in range(logins)
+            ))
+        elapsed = time.perf_counter() - start_time
+        stop.set()
+        await asyncio.gather(*background)
+
+    def ms(value: float) -> str:
+        return f"{value * 1000:8.1f}"
+
+    print(
+        f"{mode:>8s} {elapsed:7.2f}s"
+        f" {ms(percentile(login_latencies, 0.99))}"
+        f" {ms(percentile(probe_latencies, 0.5))}"
+        f" {ms(percentile(probe_latencies, 0.99))}"
+        f" {ms(max(probe_latencies, default=0))}"
+        f" {ms(percentile(lags, 0.99))}"
+        f" {ms(max(lags, default=0))}"
+    )
+
+
+async def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    # 不运行应用的 lifespan，这里按启动流程配置日志
+    setup_logging()
+    await create_schema()
+    try:
+        await seed()
+        print(
+            f"backend={_bench_db.BACKEND} logins={logins} concurrency={concurrency}"
+            f" password_workers={password_executor.max_workers}"
+        )
+        print(
+            f"{'mode':>8s} {'elapsed':>8s} {'login99':>8s}"
+            f" {'probe50':>8s} {'probe99':>8s} {'probeMax':>8s}"
+            f" {'lag99':>8s} {'lagMax':>8s}   (ms)"
+        )
+        for mode in ("idle", "blocking", "executor"):
+            await run(mode, logins, concurrency)
+        stats = password_executor.stats()
+        print(
+            f"password_executor: completed={stats['completed']}"
+            f" max_queued={stats['max_queued']} rejected={stats['rejected']}"
+            f" avg_wait={stats['avg_wait'] * 1000:.1f}ms"
+        )
+    finally:
+        admin_service.verify_password_async = original_verify
+        password_executor.shutdown()
+        await drop_schema()
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+指标收集开销基准测试
+
+模拟一次请求在指标上的全部开销：中间件的处理中计数、begin/end/observe、
+由 scope["route"] 得到路由模板、每条 SQL 的计数，与不带指标的空 ASGI 应用对比。
+路由为 /api/v1 前缀下的带参数路由，与 include_router 引入的业务路由一致。
+
+用法（在 backend 目录下）:
+    python scripts/bench_metrics.py [请求数] [每请求 SQL 数]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.routing import Route  # noqa: E402
+
+from src.core.metrics import (  # noqa: E402
+    HTTP_REQUESTS_IN_FLIGHT,
+    begin_request,
+    end_request,
+    metrics,
+    observe_request,
+    record_statement,
+    route_template,
+)
+
+# include 前缀之外的路由模板，与 scope["route"] 中的原始路由一致
+ROUTES = [Route(f"/resource{i}/{{id}}", endpoint=None) for i in range(50)]
+STATEMENT = "SELECT resources.id FROM resources WHERE resources.id = %s"
+
+
+async def run(requests: int, statements: int, instrumented: bool) -> float:
+    async def endpoint(scope, receive, send):
+        for _ in range(statements):
+            if instrumented:
+                record_statement(STATEMENT, 0.001)
+
+    start_time = time.perf_counter()
+    for i in range(requests):
+        route = ROUTES[i % len(ROUTES)]
+        scope = {
+            "type": "http", "method": "GET",
+            "path": f"/api/v1/resource{i % len(ROUTES)}/{i}", "route": route,
+        }
+        if instrumented:
+            request_start = time.perf_counter()
+            HTTP_REQUESTS_IN_FLIGHT.inc(("GET",))
+            stats, token = begin_request()
+            await endpoint(scope, None, None)
+            HTTP_REQUESTS_IN_FLIGHT.dec(("GET",))
+            end_request(token)
+            observe_request(
+                "GET", route_template(scope), 200,
+                time.perf_counter() - request_start, stats,
+            )
+        else:
+            await endpoint(scope, None, None)
+    return time.perf_counter() - start_time
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    baseline = asyncio.run(run(requests, statements, instrumented=False))
+    measured = asyncio.run(run(requests, statements, instrumented=True))
+    overhead = (measured - baseline) / requests * 1e6
+    print(f"requests={requests} statements/request={statements}")
+    print(f"baseline     {baseline / requests * 1e6:8.2f} us/request")
+    print(f"instrumented {measured / requests * 1e6:8.2f} us/request")
+    print(f"overhead     {overhead:8.2f} us/request")
+
+    start_time = time.perf_counter()
+    output = metrics.render()
+    print(
+        f"render       {(time.perf_counter() - start_time) * 1e3:8.2f} ms "
+        f"({len(output.splitlines())} lines)"
+    )
+
+
+if __name__ == "__main__":
+    main()
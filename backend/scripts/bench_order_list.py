@@ -0,0 +1,138 @@
+"""
+订单列表 SQL 语句数基准测试
+
+对比用户订单列表每页执行的 SQL 语句数和耗时:
+- before: 逐个订单查询课程、小区、教练、课程学员，再逐个查询学员（N+1）
+- after: OrderService.list_orders，count + 订单联表 + 课程学员(IN) + 学员(IN)，语句数固定
+
+默认使用临时 SQLite 文件库作为本地替身（每条语句没有网络往返，耗时差距远小于 MySQL）；
+设置 BENCH_DATABASE_URL（mysql+asyncmy://...，指向专用空库）时在 MySQL 上测试。
+
+用法（在 backend 目录下）:
+    python scripts/bench_order_list.py [订单数] [每单学员数] [重复次数]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import _bench_db
+from _bench_db import add_catalog, add_course, add_user, bench_id, create_schema, drop_schema
+
+from sqlalchemy import func, select
+
+from src.core.database import async_session_maker
+from src.core.metrics import begin_request, end_request
+from src.models.domain import Community, Course, CourseStudent, Order, Student, Teacher
+from src.services.order_service import OrderService, _format_schedule
+
+USER_ID = bench_id("user", 1)
+PAGE_SIZES = (10, 20, 50)
+
+
+async def seed(orders: int, students: int) -> None:
+    async with async_session_maker() as db:
+        add_catalog(db)
+        # 同一学员在一门课程中只能报名一次，每个订单对应一门课程
+        for number in range(orders):
+            add_course(db, bench_id("course", number), 1000)
+        student_ids = add_user(db, USER_ID, students)
+        await db.flush()
+        now = datetime.now()
+        for number in range(orders):
+            order_id = bench_id("order", number)
+            db.add(Order(
+                id=order_id, order_no=bench_id("no", number), user_id=USER_ID,
+                course_id=bench_id("course", number),
+                total_amount=Decimal("200.00"), discount_amount=Decimal("0"),
+                pay_amount=Decimal("200.00"), status="paid",
+                expire_at=now + timedelta(minutes=30),
+                created_at=now - timedelta(seconds=number),
+            ))
+            await db.flush()
+            for index, student_id in enumerate(student_ids):
+                db.add(CourseStudent(
+                    id=bench_id(f"cs{index}x", number), course_id=bench_id("course", number),
+                    student_id=student_id, order_id=order_id, price=Decimal("100.00"),
+                    is_new_user=0, status="active",
+                ))
+        await db.commit()
+
+
+async def list_orders_before(db, user_id: str, page_size: int) -> list[dict]:
+    """优化前的实现：逐个订单查询关联数据"""
+    total = await db.scalar(select(func.count()).select_from(Order).where(Order.user_id == user_id))
+    result = await db.execute(
+        select(Order)
+        .where(Order.user_id == user_id)
+        .order_by(Order.created_at.desc())
+        .limit(page_size)
+    )
+    items = []
+    for order in result.scalars().all():
+        data = {"id": order.id, "total": total}
+        course = await db.scalar(select(Course).where(Course.id == order.course_id))
+        if course:
+            data["course_name"] = course.name
+            data["schedule"] = _format_schedule(course)
+            community = await db.scalar(
+                select(Community).where(Community.id == course.community_id)
+            )
+            data["community_name"] = community.name if community else None
+            teacher = await db.scalar(select(Teacher).where(Teacher.id == course.teacher_id))
+            data["teacher_name"] = teacher.name if teacher else None
+        course_students = (
+            await db.execute(select(CourseStudent).where(CourseStudent.order_id == order.id))
+        ).scalars().all()
+        names = []
+        for cs in course_students:
+            student = await db.scalar(select(Student).where(Student.id == cs.student_id))
+            if student:
+                names.append(student.id_name)
+        data["student_name"] = "、".join(names)
+        items.append(data)
+    return items
+
+
+async def list_orders_after(db, user_id: str, page_size: int) -> list:
+    result = await OrderService().list_orders(db, user_id, page=1, page_size=page_size)
+    return result["items"]
+
+
+async def measure(impl, page_size: int, repeat: int) -> tuple[int, float, int]:
+    statements = 0
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        stats, token = begin_request()
+        try:
+            # 每次使用新会话，与每个请求一个会话一致
+            async with async_session_maker() as db:
+                items = await impl(db, USER_ID, page_size)
+        finally:
+            end_request(token)
+        statements = stats["statements"]
+    elapsed = (time.perf_counter() - start_time) / repeat * 1000
+    return statements, elapsed, len(items)
+
+
+async def main() -> None:
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    await create_schema()
+    try:
+        await seed(orders, students)
+        print(f"backend={_bench_db.BACKEND} orders={orders} students/order={students} repeat={repeat}")
+        print(f"{'page_size':>9s} {'impl':>6s} {'rows':>5s} {'SQL':>5s} {'ms/page':>9s}")
+        for page_size in PAGE_SIZES:
+            for name, impl in (("before", list_orders_before), ("after", list_orders_after)):
+                statements, elapsed, rows = await measure(impl, page_size, repeat)
+                print(f"{page_size:9d} {name:>6s} {rows:5d} {statements:5d} {elapsed:9.2f}")
+    finally:
+        await drop_schema()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
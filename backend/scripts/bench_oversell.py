@@ -0,0 +1,111 @@
+"""
+并发报名超卖测试
+
+N 个用户同时为同一门只有 K 个名额的课程下单（每单一名学员），检查:
+- 成功的订单数不超过 K
+- courses.enrolled_count 等于成功的订单数（不超卖，也没有计数漂移）
+- 占用名额的课程学员记录数等于 enrolled_count
+
+默认使用临时 SQLite 文件库作为本地替身（SQLite 串行执行写事务，并发冲突表现为等锁）；
+设置 BENCH_DATABASE_URL（mysql+asyncmy://...，指向专用空库）时在 MySQL 上测试真实的行锁竞争。
+
+用法（在 backend 目录下）:
+    python scripts/bench_oversell.py [并发下单数 N] [名额 K]
+"""
+import asyncio
+import sys
+import time
+from collections import Counter
+
+import _bench_db
+from _bench_db import add_catalog, add_course, add_user, bench_id, create_schema, drop_schema
+
+from sqlalchemy import func, select
+
+from src.core.database import async_session_maker
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.models.domain import Course, CourseStudent
+from src.models.schemas import OrderCreate
+from src.services.order_service import OrderService
+
+COURSE_ID = bench_id("course", 1)
+
+
+async def seed(users: int, seats: int) -> list[tuple[str, str]]:
+    buyers = []
+    async with async_session_maker() as db:
+        add_catalog(db)
+        add_course(db, COURSE_ID, seats)
+        for number in range(users):
+            user_id = bench_id("user", number)
+            (student_id,) = add_user(db, user_id)
+            buyers.append((user_id, student_id))
+        await db.commit()
+    return buyers
+
+
+async def place_order(user_id: str, student_id: str, start: asyncio.Event) -> str:
+    await start.wait()
+    async with async_session_maker() as db:
+        try:
+            await OrderService().create_order(
+                db, user_id, OrderCreate(course_id=COURSE_ID, student_ids=[student_id])
+            )
+            await db.commit()
+            return "ok"
+        except AppException as e:
+            await db.rollback()
+            return "full" if e.code == ErrorCode.COURSE_FULL else f"error:{e.code}"
+        except Exception as e:
+            await db.rollback()
+            return f"error:{type(e).__name__}"
+
+
+async def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    await create_schema()
+    try:
+        buyers = await seed(users, seats)
+        start = asyncio.Event()
+        tasks = [
+            asyncio.create_task(place_order(user_id, student_id, start))
+            for user_id, student_id in buyers
+        ]
+        start_time = time.perf_counter()
+        start.set()
+        outcomes = Counter(await asyncio.gather(*tasks))
+        elapsed = time.perf_counter() - start_time
+
+        async with async_session_maker() as db:
+            enrolled = await db.scalar(
+                select(Course.enrolled_count).where(Course.id == COURSE_ID)
+            )
+            holding = await db.scalar(
+                select(func.count())
+                .select_from(CourseStudent)
+                .where(
+                    CourseStudent.course_id == COURSE_ID,
+                    CourseStudent.status.notin_(["cancelled", "refunded"]),
+                )
+            )
+    finally:
+        await drop_schema()
+
+    print(f"backend={_bench_db.BACKEND} orders={users} seats={seats} elapsed={elapsed:.2f}s")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"{outcome:24s} {count:6d}")
+    print(f"enrolled_count={enrolled} course_students={holding}")
+
+    assert enrolled <= seats, f"超卖: enrolled_count={enrolled} > {seats}"
+    assert enrolled == outcomes["ok"], f"计数漂移: enrolled_count={enrolled} 成功={outcomes['ok']}"
+    assert holding == enrolled, f"课程学员 {holding} 与 enrolled_count {enrolled} 不一致"
+    if users >= seats and not any(o.startswith("error") for o in outcomes):
+        assert enrolled == seats, f"名额未售完: {enrolled} < {seats}"
+    print("OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,14 @@
+-- 创建 AI 描述缓存表
+-- 相同模型、提示词和温度的描述生成结果直接复用，减少延迟和 token 消耗
+
+CREATE TABLE IF NOT EXISTS `ai_description_cache` (
+  `cache_key` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '缓存键(模型+提示词+温度的SHA-256)',
+  `model` varchar(128) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '模型',
+  `description` text COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '生成的描述',
+  `tokens_used` int NOT NULL DEFAULT '0' COMMENT '生成时消耗的tokens',
+  `hit_count` int NOT NULL DEFAULT '0' COMMENT '命中次数',
+  `created_at` datetime NOT NULL COMMENT '创建时间',
+  `last_used_at` datetime NOT NULL COMMENT '最近使用时间',
+  PRIMARY KEY (`cache_key`),
+  KEY `idx_last_used_at` (`last_used_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI描述缓存表';
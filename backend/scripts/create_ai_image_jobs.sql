@@ -0,0 +1,23 @@
+-- 创建 AI 图片生成任务表
+-- 图片生成改为后台任务执行，提交后返回任务ID，通过轮询或 SSE 获取结果
+
+CREATE TABLE IF NOT EXISTS `ai_image_jobs` (
+  `id` varchar(32) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '任务ID',
+  `admin_id` varchar(32) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '提交的管理员ID',
+  `prompt` varchar(512) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '提示词',
+  `size` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '图片尺寸',
+  `watermark` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否添加水印',
+  `status` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'pending' COMMENT '状态 pending/running/succeeded/failed',
+  `attempts` int NOT NULL DEFAULT '0' COMMENT '已尝试次数',
+  `url` varchar(512) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '本地图片URL',
+  `original_url` varchar(1024) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '原始图片URL',
+  `model` varchar(128) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '使用的模型',
+  `error` varchar(512) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '失败原因',
+  `next_run_at` datetime DEFAULT NULL COMMENT '下次执行时间(重试退避)',
+  `started_at` datetime DEFAULT NULL COMMENT '开始执行时间',
+  `finished_at` datetime DEFAULT NULL COMMENT '完成时间',
+  `created_at` datetime NOT NULL COMMENT '创建时间',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`id`),
+  KEY `idx_status_created_at` (`status`,`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI图片生成任务表';
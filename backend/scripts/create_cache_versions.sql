@@ -0,0 +1,8 @@
+-- 创建缓存版本表
+-- 目录数据缓存（轮播图、权益卡）使用 CACHE_BACKEND=database 时，多个 worker 通过该表共享失效
+
+CREATE TABLE IF NOT EXISTS `cache_versions` (
+  `namespace` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '缓存命名空间',
+  `version` int NOT NULL DEFAULT '0' COMMENT '版本号',
+  PRIMARY KEY (`namespace`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='缓存版本表';
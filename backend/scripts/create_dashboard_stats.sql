@@ -0,0 +1,27 @@
+-- 创建仪表盘统计表
+-- 后台任务定期汇总统计快照和每日订单统计，仪表盘只读取汇总结果，不再每次扫描业务表
+
+CREATE TABLE IF NOT EXISTS `dashboard_snapshots` (
+  `name` varchar(32) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '快照名称',
+  `total_users` int NOT NULL DEFAULT '0' COMMENT '用户总数',
+  `total_orders` int NOT NULL DEFAULT '0' COMMENT '订单总数',
+  `paid_orders` int NOT NULL DEFAULT '0' COMMENT '已支付订单数',
+  `total_revenue` decimal(14,2) NOT NULL DEFAULT '0.00' COMMENT '总收入',
+  `total_courses` int NOT NULL DEFAULT '0' COMMENT '课程总数',
+  `enrolling_courses` int NOT NULL DEFAULT '0' COMMENT '报名中的课程数',
+  `refreshed_at` datetime NOT NULL COMMENT '刷新时间',
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='仪表盘统计快照表';
+
+CREATE TABLE IF NOT EXISTS `daily_order_stats` (
+  `stat_date` date NOT NULL COMMENT '统计日期',
+  `new_users` int NOT NULL DEFAULT '0' COMMENT '新增用户数',
+  `new_orders` int NOT NULL DEFAULT '0' COMMENT '新增订单数',
+  `paid_orders` int NOT NULL DEFAULT '0' COMMENT '支付订单数',
+  `revenue` decimal(14,2) NOT NULL DEFAULT '0.00' COMMENT '支付金额',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`stat_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='每日订单统计表';
+
+-- 每日统计按支付时间汇总
+ALTER TABLE `orders` ADD KEY `idx_pay_time` (`pay_time`);
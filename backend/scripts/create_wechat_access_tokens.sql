@@ -0,0 +1,10 @@
+-- 创建微信 access_token 表
+-- WECHAT_TOKEN_STORE=database 时，多个 worker 通过该表共享 access_token，避免各自刷新
+
+CREATE TABLE IF NOT EXISTS `wechat_access_tokens` (
+  `app_id` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '小程序 AppID',
+  `access_token` varchar(512) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '接口调用凭证',
+  `expires_at` datetime NOT NULL COMMENT '过期时间',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`app_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='微信access_token表';
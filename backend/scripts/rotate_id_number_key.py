@@ -0,0 +1,36 @@
+"""
+证件号加密密钥轮换
+
+步骤:
+1. 在 ID_NUMBER_KEYS 第一位加入新密钥，保留旧密钥（未配置过时旧密钥即 SECRET_KEY），重启服务
+2. 执行本脚本，使用新密钥重新加密 students 表中的全部证件号
+3. 确认完成后从 ID_NUMBER_KEYS 中移除旧密钥
+
+脚本分批处理、每批一个短事务，可在服务运行期间执行，中断后可重复执行。
+
+用法（在 backend 目录下）:
+    python scripts/rotate_id_number_key.py [每批行数]
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.database import engine  # noqa: E402
+from src.core.executor import crypto_executor  # noqa: E402
+from src.services.student_service import rotate_student_id_numbers  # noqa: E402
+
+
+async def main() -> None:
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    try:
+        stats = await rotate_student_id_numbers(batch_size)
+        print(f"完成: {stats}")
+    finally:
+        crypto_executor.shutdown()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,6 @@
 -- 同步所有课程的报名人数
 -- 此脚本用于修复 enrolled_count 字段与实际报名学员数不一致的问题
+-- enrolled_count 统计占用名额的记录：待支付订单的占位(pending)和已支付的报名(active)
 
 -- 更新所有课程的 enrolled_count 为实际的学员数
 UPDATE courses
@@ -7,6 +8,7 @@ SET enrolled_count = (
     SELECT COUNT(*)
     FROM course_students
     WHERE course_id = courses.id
+      AND status IN ('pending', 'active')
 );
 
 -- 查看更新后的结果
@@ -14,7 +16,7 @@ SELECT
     id,
     name,
     enrolled_count as stored_count,
-    (SELECT COUNT(*) FROM course_students WHERE course_id = courses.id) as actual_count,
+    (SELECT COUNT(*) FROM course_students WHERE course_id = courses.id AND status IN ('pending', 'active')) as actual_count,
     max_students
 FROM courses
 ORDER BY enrolled_count DESC;
@@ -8,7 +8,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
 from src.core.exceptions import UnauthorizedException
-from src.core.security import decode_access_token
+from src.core.security import (
+    decode_access_token,
+    principal_cache,
+    restore_principal,
+    snapshot_principal,
+)
 from src.models.domain import User, Admin
 from src.repositories.base import BaseRepository
 
@@ -64,11 +69,19 @@ async def get_current_user(
     Raises:
         UnauthorizedException: 用户不存在
     """
-    user_repo = BaseRepository(User)
-    user = await user_repo.get(db, user_id)
+    version, snapshot = await principal_cache.get("user", user_id)
+    if snapshot is None:
+        user_repo = BaseRepository(User)
+        user = await user_repo.get(db, user_id)
 
-    if not user:
-        raise UnauthorizedException("用户不存在")
+        if not user:
+            raise UnauthorizedException("用户不存在")
+
+        # 缓存只读快照；实例留在本请求的会话中，后续按 ID 获取用户不再查询
+        principal_cache.set("user", user_id, version, snapshot_principal(user))
+    else:
+        # 命中时重建本请求独占的实例（不加入会话），需要最新数据的业务仍从数据库读取
+        user = restore_principal(User, snapshot)
 
     if user.status != 1:
         raise UnauthorizedException("用户已被禁用")
@@ -129,6 +142,8 @@ async def get_current_admin(
     Raises:
         UnauthorizedException: 管理员不存在
     """
+    # 管理员请求量小，且停用管理员只能直接修改数据库（无接口可以触发缓存失效），
+    # 因此每次读取最新状态，停用立即生效；令牌校验结果仍有缓存
     admin_repo = BaseRepository(Admin)
     admin = await admin_repo.get(db, admin_id)
 
@@ -1,15 +1,15 @@
 """
 管理端仪表盘接口
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from datetime import datetime, timedelta
+from sqlalchemy import select
 
 from src.api.deps import get_current_admin
 from src.core.database import get_db
-from src.models.domain import Admin, User, Order, Course
+from src.models.domain import Admin, Order
 from src.models.schemas import ResponseSchema
+from src.services.dashboard_service import DashboardService
 
 router = APIRouter(prefix="/admin/dashboard", tags=["管理端-仪表盘"])
 
@@ -19,49 +19,37 @@ async def get_dashboard_stats(
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    """获取统计数据"""
-    # 统计用户总数
-    stmt = select(func.count(User.id))
-    result = await db.execute(stmt)
-    total_users = result.scalar() or 0
-
-    # 统计订单总数
-    stmt = select(func.count(Order.id))
-    result = await db.execute(stmt)
-    total_orders = result.scalar() or 0
-
-    # 统计已支付订单数
-    stmt = select(func.count(Order.id)).where(Order.status == "paid")
-    result = await db.execute(stmt)
-    paid_orders = result.scalar() or 0
-
-    # 统计总收入
-    stmt = select(func.sum(Order.pay_amount)).where(Order.status == "paid")
-    result = await db.execute(stmt)
-    total_revenue = result.scalar() or 0
+    """获取统计数据
 
-    # 统计课程总数
-    stmt = select(func.count(Course.id))
-    result = await db.execute(stmt)
-    total_courses = result.scalar() or 0
-
-    # 统计进行中的课程
-    stmt = select(func.count(Course.id)).where(Course.status == "enrolling")
-    result = await db.execute(stmt)
-    enrolling_courses = result.scalar() or 0
+    读取后台定时任务生成的统计快照，refreshed_at 为快照生成时间
+    """
+    snapshot = await DashboardService().get_overview(db)
 
     return ResponseSchema(
         data={
-            "total_users": total_users,
-            "total_orders": total_orders,
-            "paid_orders": paid_orders,
-            "total_revenue": float(total_revenue),
-            "total_courses": total_courses,
-            "enrolling_courses": enrolling_courses,
+            "total_users": snapshot.total_users,
+            "total_orders": snapshot.total_orders,
+            "paid_orders": snapshot.paid_orders,
+            "total_revenue": float(snapshot.total_revenue),
+            "total_courses": snapshot.total_courses,
+            "enrolling_courses": snapshot.enrolling_courses,
+            "refreshed_at": snapshot.refreshed_at.isoformat(),
         }
     )
 
 
+@router.get("/series", response_model=ResponseSchema[list[dict]])
+async def get_dashboard_series(
+    period: str = Query("day", pattern="^(day|week)$", description="统计周期 day/week"),
+    days: int = Query(30, ge=1, le=366, description="统计天数"),
+    current_admin: Admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """获取新增用户、订单和收入的按日/按周统计"""
+    series = await DashboardService().get_series(db, period=period, days=days)
+    return ResponseSchema(data=series)
+
+
 @router.get("/recent-orders", response_model=ResponseSchema[list[dict]])
 async def get_recent_orders(
     current_admin: Admin = Depends(get_current_admin),
@@ -1,6 +1,8 @@
 """
 管理端会员卡管理接口
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -84,10 +86,13 @@ async def delete_card(
 async def list_member_records(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="分页游标，传空字符串从第一页开始，传入后忽略 page"
+    ),
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """获取会员购买记录"""
     service = MemberCardService()
-    result = await service.list_user_member_records(db, page, page_size)
+    result = await service.list_user_member_records(db, page, page_size, cursor)
     return ResponseSchema(data=result)
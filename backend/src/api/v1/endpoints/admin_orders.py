@@ -1,6 +1,8 @@
 """
 管理端订单管理接口
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -21,12 +23,15 @@ router = APIRouter(prefix="/admin/orders", tags=["管理端-订单管理"])
 async def list_orders(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="分页游标，传空字符串从第一页开始，传入后忽略 page"
+    ),
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """获取订单列表"""
     service = OrderService()
-    result = await service.list_all_orders(db, page, page_size)
+    result = await service.list_all_orders(db, page, page_size, cursor)
     return ResponseSchema(data=result)
 
 
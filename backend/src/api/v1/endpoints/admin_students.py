@@ -1,6 +1,8 @@
 """
 管理端学员管理接口
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,19 +24,25 @@ router = APIRouter(prefix="/admin/students", tags=["管理端-学员管理"])
 async def list_students(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="分页游标，传空字符串从第一页开始，传入后忽略 page"
+    ),
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """获取学员列表"""
     repo = BaseRepository[Student](Student)
     total = await repo.count(db)
-    students = await repo.get_multi(db, skip=(page - 1) * page_size, limit=page_size)
+    students, next_cursor = await repo.get_page(
+        db, page=page, page_size=page_size, cursor=cursor
+    )
     return ResponseSchema(
         data={
             "items": [StudentResponse.model_validate(s) for s in students],
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
     )
 
@@ -1,6 +1,8 @@
 """
 管理端教练管理接口
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,12 +25,15 @@ router = APIRouter(prefix="/admin/teachers", tags=["管理端-教练管理"])
 async def list_teachers(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="分页游标，传空字符串从第一页开始，传入后忽略 page"
+    ),
     current_admin: Admin = Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """获取教练列表"""
     service = TeacherService()
-    result = await service.list_teachers(db, page, page_size)
+    result = await service.list_teachers(db, page, page_size, cursor)
     return ResponseSchema(data=result)
 
 
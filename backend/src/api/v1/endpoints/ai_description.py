@@ -38,6 +38,10 @@ class GenerateDescriptionRequest(BaseModel):
         ...,
         description="上下文数据"
     )
+    regenerate: bool = Field(
+        False,
+        description="是否忽略缓存重新生成"
+    )
 
     class Config:
         json_schema_extra = {
@@ -59,6 +63,15 @@ class GenerateDescriptionResponse(BaseModel):
     description: str = Field(..., description="生成的图片描述")
     tokens_used: int = Field(..., description="消耗的tokens数量")
     model: str = Field(..., description="使用的模型")
+    cached: bool = Field(False, description="是否命中缓存")
+
+
+class DescriptionCacheStats(BaseModel):
+    """描述缓存统计"""
+
+    hits: int = Field(..., description="命中次数")
+    misses: int = Field(..., description="未命中次数")
+    tokens_saved: int = Field(..., description="节省的tokens数量")
 
 
 @router.post(
@@ -102,15 +115,17 @@ async def generate_description(request: GenerateDescriptionRequest):
     )
 
     try:
-        description, tokens_used = await ai_description_service.generate_description(
+        description, tokens_used, cached = await ai_description_service.generate_description(
             style=request.style,
             context_type=request.context_type,
-            context_data=request.context_data
+            context_data=request.context_data,
+            regenerate=request.regenerate
         )
 
         logger.info(
             "generate_description_success",
             tokens_used=tokens_used,
+            cached=cached,
             description_length=len(description)
         )
 
@@ -118,7 +133,8 @@ async def generate_description(request: GenerateDescriptionRequest):
             data=GenerateDescriptionResponse(
                 description=description,
                 tokens_used=tokens_used,
-                model=ai_description_service.model
+                model=ai_description_service.model,
+                cached=cached
             )
         )
 
@@ -163,3 +179,17 @@ async def generate_description(request: GenerateDescriptionRequest):
             "code": "INTERNAL_ERROR",
             "message": "An unexpected error occurred"
         })
+
+
+@router.get(
+    "/ai/generate-description/cache-stats",
+    response_model=ResponseSchema[DescriptionCacheStats],
+    dependencies=[Depends(get_current_admin)],
+    summary="描述缓存统计",
+    description="查看本进程描述缓存的命中、未命中次数和节省的tokens"
+)
+async def get_description_cache_stats():
+    """获取描述缓存统计"""
+    return ResponseSchema(
+        data=DescriptionCacheStats(**ai_description_service.cache.stats)
+    )
@@ -1,15 +1,29 @@
 """
 AI 图片生成接口
 """
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.database import get_db
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.models.domain import Admin
 from src.models.schemas import ResponseSchema
-from src.services.ai_image_service import ai_image_service
+from src.services.ai_image_job_service import ai_image_job_service, FINAL_STATUSES
 from src.api.deps import get_current_admin
 
 router = APIRouter(tags=["AI 图片生成"])
 
+# 同步生成接口等待任务完成的最长时间（秒）
+SYNC_WAIT_TIMEOUT = 180
+# SSE 心跳间隔（秒）
+SSE_HEARTBEAT_INTERVAL = 15
+
 
 class ImageGenerateRequest(BaseModel):
     """图片生成请求"""
@@ -27,19 +41,148 @@ class ImageGenerateResponse(BaseModel):
     size: str = Field(..., description="图片尺寸")
 
 
+class ImageJobResponse(BaseModel):
+    """图片生成任务响应"""
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+    id: str = Field(..., description="任务ID")
+    status: str = Field(..., description="状态 pending/running/succeeded/failed")
+    prompt: str = Field(..., description="图片描述提示词")
+    size: str = Field(..., description="图片尺寸")
+    attempts: int = Field(..., description="已尝试次数")
+    url: Optional[str] = Field(None, description="图片相对 URL")
+    original_url: Optional[str] = Field(None, description="原始图片 URL")
+    model: Optional[str] = Field(None, description="使用的模型")
+    error: Optional[str] = Field(None, description="失败原因")
+    created_at: datetime = Field(..., description="创建时间")
+    finished_at: Optional[datetime] = Field(None, description="完成时间")
+
+
+@router.post(
+    "/ai/image-jobs",
+    response_model=ResponseSchema[ImageJobResponse],
+)
+async def submit_image_job(
+    request: ImageGenerateRequest,
+    current_admin: Admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    提交 AI 图片生成任务
+
+    立即返回任务 ID，通过 GET /ai/image-jobs/{job_id} 轮询
+    或 GET /ai/image-jobs/{job_id}/events 订阅完成事件
+
+    需要管理员权限
+    """
+    job = await ai_image_job_service.submit(
+        db,
+        prompt=request.prompt,
+        size=request.size,
+        admin_id=current_admin.id,
+    )
+    return ResponseSchema(data=ImageJobResponse.model_validate(job))
+
+
+@router.get(
+    "/ai/image-jobs/{job_id}",
+    response_model=ResponseSchema[ImageJobResponse],
+    dependencies=[Depends(get_current_admin)],
+)
+async def get_image_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    查询 AI 图片生成任务
+
+    需要管理员权限
+    """
+    job = await ai_image_job_service.get_job(db, job_id)
+    return ResponseSchema(data=ImageJobResponse.model_validate(job))
+
+
+@router.get(
+    "/ai/image-jobs/{job_id}/events",
+    dependencies=[Depends(get_current_admin)],
+)
+async def stream_image_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    订阅 AI 图片生成任务状态（Server-Sent Events）
+
+    任务状态变化时推送 status 事件，进入终态后关闭连接
+
+    需要管理员权限
+    """
+    job = await ai_image_job_service.get_job(db, job_id)
+
+    async def event_stream():
+        current = job
+        last_status = None
+        while True:
+            if current is None:
+                return
+            if current.status != last_status:
+                last_status = current.status
+                data = ImageJobResponse.model_validate(current).model_dump_json()
+                yield f"event: status\ndata: {data}\n\n"
+                if current.status in FINAL_STATUSES:
+                    return
+            else:
+                yield ": heartbeat\n\n"
+            current = await ai_image_job_service.wait(job_id, SSE_HEARTBEAT_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/ai/generate-image",
     response_model=ResponseSchema[ImageGenerateResponse],
-    dependencies=[Depends(get_current_admin)],
 )
-async def generate_image(request: ImageGenerateRequest):
+async def generate_image(
+    request: ImageGenerateRequest,
+    current_admin: Admin = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
     """
-    使用 AI 生成图片
+    使用 AI 生成图片（同步等待结果）
+
+    兼容旧接口：内部提交任务并等待完成，等待期间不占用线程。
+    新代码请使用 POST /ai/image-jobs
 
     需要管理员权限
     """
-    result = await ai_image_service.generate_image(
+    job = await ai_image_job_service.submit(
+        db,
         prompt=request.prompt,
         size=request.size,
+        admin_id=current_admin.id,
+    )
+    job_id = job.id
+    # 提交事务后任务才会入队
+    await db.commit()
+
+    job = await ai_image_job_service.wait_until_done(job_id, SYNC_WAIT_TIMEOUT)
+    if job is None or job.status not in FINAL_STATUSES:
+        raise AppException(
+            code=ErrorCode.BUSINESS_ERROR,
+            message="图片生成超时，请稍后通过任务ID查询结果",
+            details={"job_id": job_id},
+        )
+    if job.status == "failed":
+        raise AppException(
+            code=ErrorCode.INTERNAL_ERROR,
+            message=f"AI 图片生成失败: {job.error}",
+            details={"job_id": job.id},
+        )
+
+    return ResponseSchema(
+        data=ImageGenerateResponse(
+            url=job.url,
+            original_url=job.original_url,
+            model=job.model,
+            size=job.size,
+        )
     )
-    return ResponseSchema(data=ImageGenerateResponse(**result))
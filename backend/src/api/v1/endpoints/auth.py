@@ -4,11 +4,13 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends
+from loguru import logger
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_current_user
 from src.core.database import get_db
+from src.core.wechat import wechat_client
 from src.models.domain import User
 from src.models.schemas import ResponseSchema, UserCreate, UserUpdate, UserResponse
 from src.services import UserService
@@ -98,32 +100,15 @@ async def bind_phone(
     2. 传入 code 调用微信接口获取真实手机号（需配置 AppSecret）
     3. 开发环境：如果微信接口调用失败，使用固定测试手机号
     """
-    from src.core.config import settings
-    import httpx
-    
     phone = data.phone
     
     if not phone and data.code:
         # 尝试调用微信接口获取真实手机号
         try:
-            # 1. 先获取 access_token
-            token_url = f"https://api.weixin.qq.com/cgi-bin/token?grant_type=client_credential&appid={settings.wechat_app_id}&secret={settings.wechat_app_secret}"
-            async with httpx.AsyncClient() as client:
-                token_resp = await client.get(token_url)
-                token_data = token_resp.json()
-                access_token = token_data.get("access_token")
-                
-                if access_token:
-                    # 2. 使用 access_token 获取手机号
-                    phone_url = f"https://api.weixin.qq.com/wxa/business/getuserphonenumber?access_token={access_token}"
-                    phone_resp = await client.post(phone_url, json={"code": data.code})
-                    phone_data = phone_resp.json()
-                    
-                    if phone_data.get("errcode") == 0:
-                        phone_info = phone_data.get("phone_info", {})
-                        phone = phone_info.get("phoneNumber") or phone_info.get("purePhoneNumber")
+            phone_info = await wechat_client.get_phone_number(data.code)
+            phone = phone_info.get("phoneNumber") or phone_info.get("purePhoneNumber")
         except Exception as e:
-            print(f"获取微信手机号失败: {e}")
+            logger.warning(f"获取微信手机号失败: {e}")
     
     # 如果仍然没有手机号（开发环境或微信接口失败），使用用户已有手机号或测试手机号
     if not phone:
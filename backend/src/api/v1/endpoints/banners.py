@@ -1,7 +1,7 @@
 """
 轮播图接口
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
@@ -17,5 +17,5 @@ async def list_banners(
 ):
     """获取轮播图列表"""
     service = BannerService()
-    banners = await service.list_banners(db, active_only=True)
-    return ResponseSchema(data=banners)
+    content = await service.list_banners_json(db)
+    return Response(content=content, media_type="application/json")
@@ -4,7 +4,8 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_read_db
+from src.core.responses import model_response
 from src.models.schemas import (
     ResponseSchema,
     PaginatedResponseSchema,
@@ -22,7 +23,7 @@ async def list_courses(
     status: str = Query(None, description="状态"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """获取课程列表"""
     service = CourseService()
@@ -33,15 +34,17 @@ async def list_courses(
         page_size=page_size,
     )
     result = await service.list_courses(db, query)
-    return ResponseSchema(data=result)
+    return model_response(
+        ResponseSchema[PaginatedResponseSchema[CourseResponse]](data=result)
+    )
 
 
 @router.get("/courses/{course_id}", response_model=ResponseSchema[CourseResponse])
 async def get_course(
     course_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """获取课程详情"""
     service = CourseService()
     course = await service.get_course(db, course_id)
-    return ResponseSchema(data=course)
+    return model_response(ResponseSchema[CourseResponse](data=course))
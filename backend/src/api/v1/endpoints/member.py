@@ -1,7 +1,7 @@
 """
 会员卡接口
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_current_user
@@ -24,8 +24,8 @@ async def list_member_cards(
 ):
     """获取权益卡列表"""
     service = MemberCardService()
-    cards = await service.list_cards(db, active_only=True)
-    return ResponseSchema(data=cards)
+    content = await service.list_cards_json(db)
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/member/purchase", response_model=ResponseSchema[UserMemberResponse])
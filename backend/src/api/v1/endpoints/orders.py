@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_current_user
 from src.core.database import get_db
+from src.core.responses import model_response
 from src.models.domain import User
 from src.models.schemas import (
     ResponseSchema,
@@ -42,7 +43,9 @@ async def list_orders(
     """获取订单列表"""
     service = OrderService()
     result = await service.list_orders(db, current_user.id, status, page, page_size)
-    return ResponseSchema(data=result)
+    return model_response(
+        ResponseSchema[PaginatedResponseSchema[OrderResponse]](data=result)
+    )
 
 
 @router.get("/orders/{order_id}", response_model=ResponseSchema[OrderResponse])
@@ -54,7 +57,7 @@ async def get_order(
     """获取订单详情"""
     service = OrderService()
     order = await service.get_order(db, order_id, current_user.id)
-    return ResponseSchema(data=order)
+    return model_response(ResponseSchema[OrderResponse](data=order))
 
 
 @router.post("/orders/{order_id}/cancel", response_model=ResponseSchema[OrderResponse])
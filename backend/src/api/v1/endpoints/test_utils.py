@@ -13,7 +13,7 @@ from src.core.database import get_db
 from src.core.config import settings
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
-from src.models.domain import Admin, Order, Course, CourseStudent
+from src.models.domain import Admin, Order, CourseStudent
 from src.models.schemas import ResponseSchema, OrderResponse
 from src.repositories.base import BaseRepository
 from sqlalchemy import select
@@ -70,21 +70,12 @@ async def mock_pay_order(
         },
     )
     
-    # 更新课程学员状态为已激活
+    # 更新课程学员状态为已激活（名额已在下单时占用）
     stmt = select(CourseStudent).where(CourseStudent.order_id == data.order_id)
     result = await db.execute(stmt)
     course_students = result.scalars().all()
     for cs in course_students:
         cs.status = "active"
     
-    # 更新课程报名人数
-    if course_students:
-        course_repo = BaseRepository[Course](Course)
-        course = await course_repo.get(db, order.course_id)
-        if course:
-            await course_repo.update(
-                db, course, {"enrolled_count": course.enrolled_count + len(course_students)}
-            )
-    
     await db.refresh(order)
     return ResponseSchema(data=OrderResponse.model_validate(order))
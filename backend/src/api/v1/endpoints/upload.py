@@ -1,63 +1,64 @@
 """
 文件上传接口
 """
-import os
-import uuid
-from datetime import datetime
-from fastapi import APIRouter, UploadFile, File
-from pathlib import Path
+from fastapi import APIRouter, Request
 
 from src.models.schemas import ResponseSchema
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
+from src.services.upload_service import (
+    UploadService,
+    UPLOAD_DIR,
+    MAX_FILE_SIZE,
+    MULTIPART_OVERHEAD,
+)
 
 router = APIRouter(tags=["文件上传"])
 
-# 上传目录
-UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-# 允许的图片格式
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# 接口不声明 File 参数，在 OpenAPI 中补充请求体说明
+UPLOAD_IMAGE_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
 
 
-@router.post("/upload/image", response_model=ResponseSchema[dict])
-async def upload_image(file: UploadFile = File(...)):
-    """上传图片"""
-    # 检查文件扩展名
-    ext = Path(file.filename).suffix.lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise AppException(
-            code=ErrorCode.FILE_TYPE_ERROR,
-            message=f"不支持的文件格式,仅支持: {', '.join(ALLOWED_EXTENSIONS)}",
-        )
+@router.post(
+    "/upload/image",
+    response_model=ResponseSchema[dict],
+    openapi_extra=UPLOAD_IMAGE_OPENAPI,
+)
+async def upload_image(request: Request):
+    """上传图片
 
-    # 检查文件大小
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
+    不使用 File(...)：FastAPI 会在调用接口前接收并缓存整个请求体。
+    这里直接读取请求体流，文件内容边接收边写入，超过大小限制立即中止
+    """
+    # 请求体明显超限时不读取直接拒绝
+    content_length = request.headers.get("content-length")
+    if (
+        content_length
+        and content_length.isdigit()
+        and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD
+    ):
         raise AppException(
             code=ErrorCode.FILE_TOO_LARGE,
             message=f"文件大小超过限制({MAX_FILE_SIZE / 1024 / 1024}MB)",
         )
 
-    # 生成文件名
-    date_path = datetime.now().strftime("%Y%m%d")
-    filename = f"{uuid.uuid4().hex}{ext}"
-    file_dir = UPLOAD_DIR / date_path
-    file_dir.mkdir(parents=True, exist_ok=True)
-    file_path = file_dir / filename
-
-    # 保存文件
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    # 返回文件 URL
-    url = f"/uploads/{date_path}/{filename}"
-    return ResponseSchema(
-        data={
-            "url": url,
-            "filename": file.filename,
-            "size": len(contents),
-        }
+    service = UploadService()
+    result = await service.save_image(
+        request.headers.get("content-type", ""), request.stream()
     )
+    return ResponseSchema(data=result)
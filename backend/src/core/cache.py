@@ -0,0 +1,245 @@
+"""
+目录数据缓存模块
+
+缓存轮播图、权益卡等低频变更的目录数据，保存的是序列化后的响应字节，
+命中时不访问数据库、不做 Pydantic 校验。
+
+失效方式:
+1. TTL 到期
+2. create_*/update_*/delete_* 调用 invalidate，递增命名空间版本号
+
+版本号由可插拔的后端保存:
+- local: 进程内保存，仅适用于单 worker
+- database: 保存在 cache_versions 表，多个 uvicorn worker 通过版本号共享失效
+
+另提供进程内的 TTLCache，用于令牌校验结果、登录主体等小对象缓存；
+登录主体缓存同样通过版本号后端在 worker 之间失效。
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import async_session_maker
+from src.models.domain import CacheVersion
+
+
+class TTLCache:
+    """有容量上限的进程内 LRU 缓存，条目带过期时间"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """初始化
+
+        Args:
+            maxsize: 最大条目数，超出时淘汰最久未使用的条目
+            ttl: 默认有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，未命中或已过期返回 None"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            expires_at: 过期时间戳（秒），默认当前时间加 ttl，且不超过 ttl
+        """
+        default_expires_at = time.time() + self.ttl
+        if expires_at is None or expires_at > default_expires_at:
+            expires_at = default_expires_at
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """删除缓存条目"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+
+class CacheBackend(ABC):
+    """缓存版本号后端基类"""
+
+    @abstractmethod
+    async def get_version(self, namespace: str) -> int:
+        """获取命名空间当前版本号
+
+        Args:
+            namespace: 命名空间
+
+        Returns:
+            版本号
+        """
+
+    @abstractmethod
+    async def bump_version(self, db: AsyncSession, namespace: str) -> None:
+        """递增命名空间版本号
+
+        Args:
+            db: 当前写操作所在的数据库会话（与业务写入同事务提交）
+            namespace: 命名空间
+        """
+
+
+class LocalCacheBackend(CacheBackend):
+    """进程内版本号后端"""
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+
+    async def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump_version(self, db: AsyncSession, namespace: str) -> None:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+
+class DatabaseCacheBackend(CacheBackend):
+    """数据库版本号后端
+
+    版本号随业务事务一起提交，其他 worker 只会在提交后看到新版本。
+    读取结果在进程内保留 check_interval 秒，避免每次命中都查询数据库。
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._versions: dict[str, tuple[int, float]] = {}
+
+    async def get_version(self, namespace: str) -> int:
+        cached = self._versions.get(namespace)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(CacheVersion.version).where(CacheVersion.namespace == namespace)
+            )
+            version = result.scalar() or 0
+
+        self._versions[namespace] = (version, now + self.check_interval)
+        return version
+
+    async def bump_version(self, db: AsyncSession, namespace: str) -> None:
+        stmt = mysql_insert(CacheVersion).values(namespace=namespace, version=1)
+        stmt = stmt.on_duplicate_key_update(version=CacheVersion.version + 1)
+        await db.execute(stmt)
+
+    def forget(self, namespace: str) -> None:
+        """丢弃本进程记住的版本号，下次读取时重新查询"""
+        self._versions.pop(namespace, None)
+
+
+class ResponseCache:
+    """序列化响应缓存"""
+
+    def __init__(self, backend: CacheBackend, ttl: int = 300):
+        """初始化
+
+        Args:
+            backend: 版本号后端
+            ttl: 缓存有效期（秒）
+        """
+        self.backend = backend
+        self.ttl = ttl
+        # (namespace, key) -> (版本号, 过期时间, 响应字节)
+        self._entries: dict[tuple[str, str], tuple[int, float, bytes]] = {}
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """读取缓存，未命中时调用 loader 生成并写入
+
+        Args:
+            namespace: 命名空间（失效粒度）
+            key: 缓存键
+            loader: 生成序列化响应的协程函数
+
+        Returns:
+            序列化后的响应字节
+        """
+        version = await self.backend.get_version(namespace)
+        entry = self._entries.get((namespace, key))
+        if entry and entry[0] == version and entry[1] > time.monotonic():
+            return entry[2]
+
+        content = await loader()
+        self._entries[(namespace, key)] = (version, time.monotonic() + self.ttl, content)
+        return content
+
+    async def invalidate(self, db: AsyncSession, namespace: str) -> None:
+        """使命名空间下的缓存失效
+
+        版本号与业务写入在同一事务中递增；本进程条目在事务提交后再清理，
+        避免提交前被并发请求用旧数据回填。
+
+        Args:
+            db: 当前写操作所在的数据库会话
+            namespace: 命名空间
+        """
+        await self.backend.bump_version(db, namespace)
+        self._drop(namespace)
+
+        def _after_commit(session) -> None:
+            self._drop(namespace)
+
+        event.listen(db.sync_session, "after_commit", _after_commit, once=True)
+
+    def clear(self) -> None:
+        """清空本进程全部缓存条目"""
+        self._entries.clear()
+
+    def _drop(self, namespace: str) -> None:
+        for cache_key in [k for k in self._entries if k[0] == namespace]:
+            self._entries.pop(cache_key, None)
+        if isinstance(self.backend, DatabaseCacheBackend):
+            self.backend.forget(namespace)
+
+
+def create_cache_backend(name: str) -> CacheBackend:
+    """根据配置创建缓存后端
+
+    Args:
+        name: 后端名称 local/database
+
+    Returns:
+        缓存后端实例
+    """
+    if name == "database":
+        return DatabaseCacheBackend(check_interval=settings.cache_version_check_interval)
+    if name == "local":
+        return LocalCacheBackend()
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+# 版本号后端实例，目录数据缓存和登录主体缓存共用
+cache_backend = create_cache_backend(settings.cache_backend)
+
+# 目录数据缓存实例
+catalog_cache = ResponseCache(backend=cache_backend, ttl=settings.cache_ttl)
@@ -22,25 +22,98 @@ class Settings(BaseSettings):
     app_env: str = Field(default="development", alias="APP_ENV")
     debug: bool = Field(default=True, alias="DEBUG")
     secret_key: str = Field(default="", alias="SECRET_KEY")
+    # 证件号加密密钥，第一个用于加密，其余仅用于解密旧数据；为空时使用 SECRET_KEY
+    id_number_keys: list[str] = Field(default=[], alias="ID_NUMBER_KEYS")
 
     # 数据库配置
     database_url: str = Field(alias="DATABASE_URL")
+    # 只读副本地址，为空时只读接口也使用主库
+    database_replica_url: str = Field(default="", alias="DATABASE_REPLICA_URL")
+    # 只读引擎（get_read_db）连接池大小，最多再溢出一半
+    db_read_pool_size: int = Field(default=10, alias="DB_READ_POOL_SIZE")
+    # 调用方写入后其只读请求固定使用主库的时长（秒），应大于副本复制延迟
+    db_replica_pin_seconds: float = Field(default=5.0, alias="DB_REPLICA_PIN_SECONDS")
+    # 是否把每条 SQL 输出到日志
+    db_echo: bool = Field(default=False, alias="DB_ECHO")
+    # 慢 SQL 阈值（秒），超过时记录警告和 EXPLAIN 执行计划；0 表示关闭
+    db_slow_query_threshold: float = Field(default=0.2, alias="DB_SLOW_QUERY_THRESHOLD")
+    # 同一请求内相同 SQL（参数不同）执行达到该次数时判定为疑似 N+1；0 表示关闭
+    db_n_plus_one_threshold: int = Field(default=5, alias="DB_N_PLUS_ONE_THRESHOLD")
+    # 每个请求 SQL 语句数超出预算时的处理：off 不检查 / warn 记录警告（预算由测试强制执行）
+    db_statement_budget_mode: str = Field(default="warn", alias="DB_STATEMENT_BUDGET_MODE")
 
     # 文件上传配置
     upload_dir: str = Field(default="./uploads", alias="UPLOAD_DIR")
     max_upload_size: int = Field(default=10485760, alias="MAX_UPLOAD_SIZE")
+    image_derivative_workers: int = Field(default=2, alias="IMAGE_DERIVATIVE_WORKERS")
 
     # 微信小程序配置
     wechat_app_id: str = Field(default="", alias="WECHAT_APP_ID")
     wechat_app_secret: str = Field(default="", alias="WECHAT_APP_SECRET")
+    wechat_api_base_url: str = Field(
+        default="https://api.weixin.qq.com", alias="WECHAT_API_BASE_URL"
+    )
+    wechat_token_store: str = Field(default="local", alias="WECHAT_TOKEN_STORE")
+    wechat_token_refresh_margin: int = Field(
+        default=300, alias="WECHAT_TOKEN_REFRESH_MARGIN"
+    )
 
     # 微信支付配置
     wechat_mch_id: Optional[str] = Field(default=None, alias="WECHAT_MCH_ID")
     wechat_api_key: Optional[str] = Field(default=None, alias="WECHAT_API_KEY")
 
+    # 目录数据缓存配置
+    cache_backend: str = Field(default="local", alias="CACHE_BACKEND")
+    cache_ttl: int = Field(default=300, alias="CACHE_TTL")
+    cache_version_check_interval: float = Field(
+        default=1.0, alias="CACHE_VERSION_CHECK_INTERVAL"
+    )
+
+    # 认证缓存配置
+    token_cache_size: int = Field(default=10000, alias="TOKEN_CACHE_SIZE")
+    token_cache_ttl: int = Field(default=3600, alias="TOKEN_CACHE_TTL")
+    principal_cache_size: int = Field(default=10000, alias="PRINCIPAL_CACHE_SIZE")
+    # 用户状态缓存的兜底有效期；变更通过 CACHE_BACKEND 的版本号失效，
+    # database 后端下其他 worker 最多滞后 CACHE_VERSION_CHECK_INTERVAL 秒
+    principal_cache_ttl: int = Field(default=30, alias="PRINCIPAL_CACHE_TTL")
+    user_count_cache_ttl: int = Field(default=30, alias="USER_COUNT_CACHE_TTL")
+
+    # 出站 HTTP 连接池配置
+    http_max_connections: int = Field(default=20, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(
+        default=10, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    http_keepalive_expiry: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY")
+    http_connect_timeout: float = Field(default=5.0, alias="HTTP_CONNECT_TIMEOUT")
+    http_retries: int = Field(default=1, alias="HTTP_RETRIES")
+
+    # 密码哈希线程池配置
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    password_hash_queue_size: int = Field(default=64, alias="PASSWORD_HASH_QUEUE_SIZE")
+
+    # 证件号批量加解密线程池配置
+    crypto_workers: int = Field(default=2, alias="CRYPTO_WORKERS")
+    crypto_queue_size: int = Field(default=64, alias="CRYPTO_QUEUE_SIZE")
+
+    # 订单过期清理配置
+    order_expiry_enabled: bool = Field(default=True, alias="ORDER_EXPIRY_ENABLED")
+    order_expiry_interval: int = Field(default=60, alias="ORDER_EXPIRY_INTERVAL")
+    order_expiry_batch_size: int = Field(default=500, alias="ORDER_EXPIRY_BATCH_SIZE")
+
+    # 仪表盘统计刷新配置
+    dashboard_refresh_enabled: bool = Field(default=True, alias="DASHBOARD_REFRESH_ENABLED")
+    dashboard_refresh_interval: int = Field(default=60, alias="DASHBOARD_REFRESH_INTERVAL")
+
+    # 指标配置
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    metrics_token: str = Field(default="", alias="METRICS_TOKEN")
+
     # 日志配置
     log_level: str = Field(default="DEBUG", alias="LOG_LEVEL")
     log_dir: str = Field(default="./logs", alias="LOG_DIR")
+    log_json: bool = Field(default=False, alias="LOG_JSON")
+    log_queue_size: int = Field(default=10000, alias="LOG_QUEUE_SIZE")
+    log_sample_rates: dict[str, float] = Field(default={}, alias="LOG_SAMPLE_RATES")
 
     # CORS 配置
     cors_origins: list[str] = Field(
@@ -58,6 +131,12 @@ class Settings(BaseSettings):
         alias="VOLCANO_MODEL_ID"
     )
 
+    # AI 图片生成任务配置
+    ai_image_concurrency: int = Field(default=2, alias="AI_IMAGE_CONCURRENCY")
+    ai_image_max_attempts: int = Field(default=3, alias="AI_IMAGE_MAX_ATTEMPTS")
+    ai_image_retry_backoff: float = Field(default=2.0, alias="AI_IMAGE_RETRY_BACKOFF")
+    ai_image_poll_interval: float = Field(default=1.0, alias="AI_IMAGE_POLL_INTERVAL")
+
     # 硅基流动 AI 描述生成配置
     siliconflow_api_key: str = Field(default="", alias="SILICONFLOW_API_KEY")
     siliconflow_base_url: str = Field(
@@ -69,6 +148,15 @@ class Settings(BaseSettings):
         alias="SILICONFLOW_MODEL"
     )
     siliconflow_timeout: int = Field(default=30, alias="SILICONFLOW_TIMEOUT")
+    ai_description_cache_ttl: int = Field(
+        default=2592000, alias="AI_DESCRIPTION_CACHE_TTL"
+    )
+    ai_description_cache_max_entries: int = Field(
+        default=10000, alias="AI_DESCRIPTION_CACHE_MAX_ENTRIES"
+    )
+    ai_description_cache_evict_interval: int = Field(
+        default=600, alias="AI_DESCRIPTION_CACHE_EVICT_INTERVAL"
+    )
 
     @property
     def is_siliconflow_enabled(self) -> bool:
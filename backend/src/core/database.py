@@ -1,43 +1,235 @@
 """
 数据库配置模块
+
+- 主库引擎 engine：所有写操作和默认的读操作
+- 只读引擎 read_engine：供目录类只读接口（get_read_db）使用，连接 DATABASE_REPLICA_URL，
+  未配置副本时连接主库。连接为自动提交模式，读请求不开启事务，结束时不需要 COMMIT/ROLLBACK
+- 读己之写：请求写入主库后，响应带上签名的 X-Primary-Pin 头，客户端在后续请求中带回，
+  DB_REPLICA_PIN_SECONDS 内的只读请求仍走主库。签名使用 SECRET_KEY，多个 worker 均可校验
 """
+import hashlib
+import hmac
+import time
 from collections.abc import AsyncGenerator
+from typing import Any, Optional
 
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.config import settings
+from src.core import query_monitor
+from src.core.metrics import CallbackGauge, DB_POOL_CHECKOUT_WAIT, metrics
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """统计获取连接等待时间的连接池"""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start_time)
+
+
+def _create_engine(url: str, pool_size: int, **kwargs: Any) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=pool_size // 2,
+        pool_pre_ping=True,
+        echo=settings.db_echo,
+        **kwargs,
+    )
+    # 语句计数、耗时和慢 SQL 执行计划
+    query_monitor.install(new_engine)
+    return new_engine
+
+
+def _pool_gauge(name: str, target: AsyncEngine) -> CallbackGauge:
+    return CallbackGauge(
+        name,
+        "Database pool connections by state",
+        lambda: {
+            ("size",): target.pool.size(),
+            ("checked_out",): target.pool.checkedout(),
+            ("checked_in",): target.pool.checkedin(),
+            ("overflow",): target.pool.overflow(),
+        },
+        ("state",),
+    )
+
 
 # 创建异步数据库引擎
-engine = create_async_engine(
-    settings.database_url,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,
-    echo=settings.debug,
+engine = _create_engine(settings.database_url, 20)
+metrics.register(_pool_gauge("db_pool_connections", engine))
+
+# 只读引擎：自动提交模式的连接执行 SELECT 不开启事务，
+# skip_autocommit_rollback 让会话关闭时也不再发送 ROLLBACK
+read_engine = _create_engine(
+    settings.database_replica_url or settings.database_url,
+    settings.db_read_pool_size,
+    isolation_level="AUTOCOMMIT",
+    skip_autocommit_rollback=True,
 )
+metrics.register(_pool_gauge("db_read_pool_connections", read_engine))
+
+# 是否配置了只读副本（未配置时只读引擎连接主库，不需要读己之写）
+REPLICA_ENABLED = bool(settings.database_replica_url)
+
+
+class WriteTrackingSession(Session):
+    """记录是否执行过写操作的会话，get_db 据此决定请求结束时是否提交"""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _mark_statement(orm_execute_state):
+    # UPDATE/INSERT/DELETE 语句和无法判断的文本 SQL 都按写操作处理
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get("has_writes") or session.new or session.dirty or session.deleted
+    )
+
 
 # 创建异步会话工厂
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=WriteTrackingSession,
     expire_on_commit=False,
 )
 
+# 只读会话工厂
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# 写入主库后带回的主库固定令牌
+PRIMARY_PIN_HEADER = "X-Primary-Pin"
+
+
+def _sign_pin(until: int) -> str:
+    message = f"primary-pin:{until}".encode()
+    return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).hexdigest()[:32]
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """获取数据库会话
+
+def create_primary_pin(seconds: Optional[float] = None) -> str:
+    """生成主库固定令牌
+
+    Args:
+        seconds: 固定时长（秒），默认 DB_REPLICA_PIN_SECONDS
+
+    Returns:
+        "{到期时间戳}.{签名}"
+    """
+    if seconds is None:
+        seconds = settings.db_replica_pin_seconds
+    until = int(time.time() + seconds) + 1
+    return f"{until}.{_sign_pin(until)}"
+
+
+def is_primary_pinned(token: Optional[str]) -> bool:
+    """主库固定令牌是否有效且未到期
+
+    Args:
+        token: 请求带回的 X-Primary-Pin 头
+
+    Returns:
+        是否应使用主库
+    """
+    if not token:
+        return False
+    until_text, _, signature = token.partition(".")
+    if not until_text.isdigit():
+        return False
+    until = int(until_text)
+    now = time.time()
+    # 到期时间不应超出一个固定窗口（另留 1 秒取整和各服务器时钟误差）
+    if not now < until <= now + settings.db_replica_pin_seconds + 2:
+        return False
+    return hmac.compare_digest(signature, _sign_pin(until))
+
+
+def primary_pin_for(request: Request) -> Optional[str]:
+    """请求写入了主库时返回应下发的主库固定令牌
+
+    由请求中间件在生成响应后调用（get_db 的提交在响应之后执行，不能在其中设置响应头）
+
+    Args:
+        request: 当前请求
+
+    Returns:
+        令牌，未配置副本或请求没有写入时为 None
+    """
+    if not REPLICA_ENABLED:
+        return None
+    session = getattr(request.state, "db_session", None)
+    if session is None or not _has_writes(session):
+        return None
+    return create_primary_pin()
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """获取主库会话
+
+    请求结束时只有执行过写操作才提交，避免只读请求提交会话中意外残留的状态。
+    跳过提交不减少往返：关闭会话时会回滚读事务，连接归还连接池时还会再回滚一次，
+    与提交时的 COMMIT + 归还时的 ROLLBACK 次数相同。只读接口应使用 get_read_db，不开启事务
+
+    Args:
+        request: 当前请求
 
     Yields:
         AsyncSession: 数据库会话
     """
     async with async_session_maker() as session:
+        # 供请求中间件判断是否写入了主库
+        request.state.db_session = session
         try:
             yield session
-            await session.commit()
+            if _has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """获取只读会话，用于目录类只读接口
+
+    连接只读引擎（副本，未配置时为主库），不开启事务；
+    请求带有有效的 X-Primary-Pin 时仍连接主库（读己之写）。
+    每条语句各自读取最新数据，同一请求内的多条查询不保证一致快照。
+    会话不提交，不能用于写操作。
+
+    Args:
+        request: 当前请求
+
+    Yields:
+        AsyncSession: 数据库会话
+    """
+    session_maker = read_session_maker
+    if REPLICA_ENABLED and is_primary_pinned(request.headers.get(PRIMARY_PIN_HEADER)):
+        session_maker = async_session_maker
+    async with session_maker() as session:
+        yield session
@@ -14,6 +14,7 @@
 | 10007 | 文件过大 |
 | 10008 | 文件类型错误 |
 | 10009 | 服务器内部错误 |
+| 10010 | 服务繁忙(请求排队已满，稍后重试) |
 """
 from enum import Enum
 
@@ -34,6 +35,7 @@ class ErrorCode(int, Enum):
     FILE_TOO_LARGE = 10007  # 文件过大
     FILE_TYPE_ERROR = 10008  # 文件类型错误
     INTERNAL_ERROR = 10009  # 服务器内部错误
+    SERVICE_BUSY = 10010  # 服务繁忙(过载，客户端应稍后重试)
 
     # 以下为兼容旧代码的别名
     FORBIDDEN = 10003  # 禁止访问(等同于未授权)
@@ -98,4 +100,5 @@ ERROR_MESSAGES = {
     ErrorCode.FILE_TOO_LARGE: "文件过大",
     ErrorCode.FILE_TYPE_ERROR: "文件类型错误",
     ErrorCode.INTERNAL_ERROR: "服务器内部错误",
+    ErrorCode.SERVICE_BUSY: "系统繁忙，请稍后重试",
 }
@@ -0,0 +1,115 @@
+"""
+有界线程池模块
+
+bcrypt 等 CPU 密集的同步调用放到专用线程池执行，不阻塞事件循环。
+- max_workers 限制同时执行的任务数
+- max_queue 限制排队等待的任务数，超出时直接拒绝，避免登录风暴堆积请求
+"""
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from src.core.config import settings
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """带并发上限和排队上限的线程池"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """初始化
+
+        Args:
+            name: 线程池名称（线程名前缀）
+            max_workers: 最大并发数
+            max_queue: 最大排队数
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._stats = {
+            "running": 0,
+            "queued": 0,
+            "max_queued": 0,
+            "completed": 0,
+            "rejected": 0,
+            "total_wait": 0.0,
+        }
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """在线程池中执行同步函数
+
+        Args:
+            func: 同步函数
+            *args: 函数参数
+
+        Returns:
+            函数返回值
+
+        Raises:
+            AppException: 排队数已满（SERVICE_BUSY）
+        """
+        stats = self._stats
+        if self._semaphore.locked() and stats["queued"] >= self.max_queue:
+            stats["rejected"] += 1
+            raise AppException(ErrorCode.SERVICE_BUSY)
+
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+        start_time = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            stats["queued"] -= 1
+        stats["total_wait"] += time.perf_counter() - start_time
+
+        stats["running"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            stats["running"] -= 1
+            stats["completed"] += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, Any]:
+        """获取运行统计
+
+        Returns:
+            并发数、排队数、拒绝数等统计
+        """
+        completed = self._stats["completed"]
+        return {
+            **self._stats,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "avg_wait": self._stats["total_wait"] / completed if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """关闭线程池"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 密码哈希线程池
+password_executor = BoundedExecutor(
+    "password",
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_queue_size,
+)
+
+# 证件号批量加解密线程池
+crypto_executor = BoundedExecutor(
+    "crypto",
+    max_workers=settings.crypto_workers,
+    max_queue=settings.crypto_queue_size,
+)
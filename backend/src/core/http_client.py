@@ -0,0 +1,179 @@
+"""
+出站 HTTP 客户端模块
+
+按上游分别维护一个带连接池的 httpx.AsyncClient，应用启动时创建、关闭时释放，
+请求之间复用 TCP/TLS 连接。每个上游独立配置连接数上限、超时和连接重试，
+并统计请求延迟和连接池占用情况。
+"""
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from src.core.config import settings
+
+
+@dataclass
+class UpstreamConfig:
+    """上游配置"""
+
+    timeout: float
+    max_connections: int
+    max_keepalive_connections: int
+    base_url: str = ""
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """统计延迟和并发的传输层"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_connections: int):
+        self._transport = transport
+        self.max_connections = max_connections
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+        }
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.stats
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        start_time = time.perf_counter()
+        try:
+            return await self._transport.handle_async_request(request)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start_time
+            stats["in_flight"] -= 1
+            stats["requests"] += 1
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientManager:
+    """按上游管理的共享 HTTP 客户端"""
+
+    def __init__(self):
+        self._configs: dict[str, UpstreamConfig] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, InstrumentedTransport] = {}
+
+    def register(self, name: str, config: UpstreamConfig) -> None:
+        """注册上游
+
+        Args:
+            name: 上游名称
+            config: 上游配置
+        """
+        self._configs[name] = config
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """获取上游客户端，未创建时按配置创建
+
+        Args:
+            name: 上游名称
+
+        Returns:
+            共享的 AsyncClient，调用方不应关闭
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+        return client
+
+    def start(self) -> None:
+        """创建所有已注册上游的客户端"""
+        for name in self._configs:
+            self.get(name)
+
+    async def close(self) -> None:
+        """关闭全部客户端"""
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception:
+                logger.exception(f"关闭 HTTP 客户端 {name} 失败")
+        self._clients.clear()
+        self._transports.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """获取各上游的请求统计
+
+        Returns:
+            上游名称 -> 请求数、错误数、平均/最大延迟、并发和连接池占用率
+        """
+        result = {}
+        for name, transport in self._transports.items():
+            stats = transport.stats
+            requests = stats["requests"]
+            result[name] = {
+                **stats,
+                "avg_latency": stats["total_latency"] / requests if requests else 0.0,
+                "max_connections": transport.max_connections,
+                "saturation": stats["in_flight"] / transport.max_connections,
+            }
+        return result
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        config = self._configs.get(name)
+        if config is None:
+            raise ValueError(f"Unknown upstream: {name}")
+
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        transport = InstrumentedTransport(
+            httpx.AsyncHTTPTransport(limits=limits, retries=settings.http_retries),
+            max_connections=config.max_connections,
+        )
+        client = httpx.AsyncClient(
+            base_url=config.base_url,
+            transport=transport,
+            timeout=httpx.Timeout(config.timeout, connect=settings.http_connect_timeout),
+        )
+        self._clients[name] = client
+        self._transports[name] = transport
+        return client
+
+
+# 共享 HTTP 客户端实例
+http_clients = HttpClientManager()
+http_clients.register(
+    "siliconflow",
+    UpstreamConfig(
+        timeout=settings.siliconflow_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+    ),
+)
+http_clients.register(
+    "wechat",
+    UpstreamConfig(
+        timeout=10.0,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        base_url=settings.wechat_api_base_url,
+    ),
+)
+# AI 生成图片下载（图片体积较大）
+http_clients.register(
+    "image_download",
+    UpstreamConfig(
+        timeout=60.0,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+    ),
+)
@@ -1,49 +1,275 @@
 """
 日志配置模块
+
+日志写入不占用事件循环线程:
+- loguru 只注册一个处理器，记录日志时只把日志记录放入有界队列；
+  后台线程批量格式化并写入控制台、app.log、error.log
+- 队列已满（磁盘写入跟不上）时丢弃并计数，不阻塞请求
+- 文件日志为 JSON 行格式，控制台按 LOG_JSON 输出 JSON 或文本
+- 请求内的日志绑定 request_id，可按请求串联
+- 高频的请求日志按级别采样（LOG_SAMPLE_RATES）
 """
+import json
+import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Optional
 
 from loguru import logger
 
 from src.core.config import settings
 
+# 队列结束标记
+_STOP = object()
+
+# 每次从队列取出后批量写入的最大条数
+_BATCH_SIZE = 1000
+
+# 当前生效的日志队列，用于统计
+_active_sink: Optional["QueueSink"] = None
+
+
+def _text_line(record: dict) -> str:
+    """把日志记录格式化为一行文本，附带通过 bind 或关键字参数传入的额外字段"""
+    extra = dict(record["extra"])
+    request_id = extra.pop("request_id", "-")
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S} | {record['level'].name: <8} | {request_id} | "
+        f"{record['name']}:{record['function']}:{record['line']} - {record['message']}"
+    )
+    if extra:
+        line += " | " + " ".join(f"{key}={value}" for key, value in extra.items())
+    line += "\n"
+    exception = record["exception"]
+    if exception is not None:
+        line += "".join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+    return line
+
+
+def _json_line(record: dict) -> str:
+    """把日志记录序列化为一行 JSON"""
+    extra = dict(record["extra"])
+    data = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "request_id": extra.pop("request_id", None),
+    }
+    if extra:
+        data["extra"] = extra
+    exception = record["exception"]
+    if exception is not None:
+        data["exception"] = "".join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+    return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+
+@dataclass
+class LogOutput:
+    """日志输出目标"""
+
+    name: str
+    level: str
+    write: Callable[[str], None]
+    formatter: Callable[[dict], str] = _json_line
+    level_no: int = 0
+    written: int = 0
+    errors: int = 0
+    # 文件输出的处理器，队列写完后关闭
+    handler: Optional[logging.Handler] = None
+
+    def close(self) -> None:
+        """关闭输出占用的文件"""
+        if self.handler is not None:
+            self.handler.close()
+
+
+class QueueSink:
+    """有界队列 + 后台线程的日志处理器
+
+    作为 loguru 唯一的处理器，记录日志的线程只把日志记录放入队列；
+    后台线程批量取出，按级别分发到各输出并格式化、写入
+    """
+
+    def __init__(self, outputs: list[LogOutput], maxsize: int):
+        """初始化
+
+        Args:
+            outputs: 输出目标
+            maxsize: 队列容量，已满时丢弃新日志
+        """
+        self.outputs = outputs
+        for output in outputs:
+            output.level_no = logger.level(output.level).no
+        self.level_no = min(output.level_no for output in outputs)
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message) -> None:
+        """入队（由 loguru 在记录日志的线程中调用）"""
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """写完队列中剩余的日志后停止并关闭输出（由 logger.remove 调用）"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+        if self._thread.is_alive():
+            # 后台线程仍在写入时不关闭文件，由进程退出时释放
+            print("log writer did not finish in 5s, files left open", file=sys.stderr)
+            return
+        for output in self.outputs:
+            output.close()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """获取队列和各输出的统计"""
+        result = {
+            output.name: {"written": output.written, "errors": output.errors}
+            for output in self.outputs
+        }
+        result["queue"] = {"queued": self._queue.qsize(), "dropped": self.dropped}
+        return result
+
+    def _run(self) -> None:
+        while True:
+            records = [self._queue.get()]
+            while len(records) < _BATCH_SIZE:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in records
+            if stop:
+                records = [r for r in records if r is not _STOP]
+            self._write_batch(records)
+            if stop:
+                return
+
+    def _write_batch(self, records: list[dict]) -> None:
+        dropped = self.dropped
+        notice = ""
+        if dropped > self._reported_dropped:
+            notice = f"log queue full, dropped {dropped - self._reported_dropped} records\n"
+            self._reported_dropped = dropped
+
+        # 同一格式只格式化一次
+        formatted: dict[Callable, list[str]] = {}
+        for output in self.outputs:
+            lines = []
+            for index, record in enumerate(records):
+                if record["level"].no < output.level_no:
+                    continue
+                cache = formatted.setdefault(output.formatter, [None] * len(records))
+                if cache[index] is None:
+                    cache[index] = output.formatter(record)
+                lines.append(cache[index])
+            if not lines and not notice:
+                continue
+            try:
+                output.write(notice + "".join(lines))
+                output.written += len(lines)
+            except Exception:
+                output.errors += 1
+                traceback.print_exc(file=sys.stderr)
+
+
+def _stream_writer(stream) -> Callable[[str], None]:
+    def write(line: str) -> None:
+        stream.write(line)
+        stream.flush()
+
+    return write
+
+
+def _file_output(name: str, level: str, path: Path) -> LogOutput:
+    """按天轮转、保留 30 天的 JSON 行文件输出"""
+    handler = logging.handlers.TimedRotatingFileHandler(
+        path, when="midnight", backupCount=30, encoding="utf-8"
+    )
+    handler.terminator = ""
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def write(line: str) -> None:
+        handler.emit(logging.makeLogRecord({"msg": line}))
+
+    return LogOutput(name, level, write, handler=handler)
+
+
+def sampled(level: str) -> bool:
+    """按 LOG_SAMPLE_RATES 判断本条高频日志是否输出
+
+    Args:
+        level: 日志级别名称
+
+    Returns:
+        是否输出，未配置采样率的级别总是输出
+    """
+    rate = settings.log_sample_rates.get(level, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+def logging_stats() -> dict[str, dict[str, Any]]:
+    """获取日志队列和各输出的写入、丢弃统计
+
+    Returns:
+        输出名称 -> 统计，queue 为队列统计
+    """
+    return _active_sink.stats() if _active_sink else {}
+
 
 def setup_logging() -> None:
     """配置日志系统"""
-    # 移除默认处理器
-    logger.remove()
+    global _active_sink
 
-    # 添加控制台输出
-    logger.add(
-        sys.stdout,
-        level=settings.log_level,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True,
-    )
+    # 移除已有处理器（会写完其队列中的日志并关闭文件）
+    logger.remove()
+    logger.configure(extra={"request_id": "-"})
 
-    # 添加文件输出
     log_dir = Path(settings.log_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    # 所有日志
-    logger.add(
-        log_dir / "app.log",
-        level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="00:00",
-        retention="30 days",
-        encoding="utf-8",
-    )
-
-    # 错误日志
-    logger.add(
-        log_dir / "error.log",
-        level="ERROR",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="00:00",
-        retention="30 days",
-        encoding="utf-8",
-    )
+    outputs = [
+        # 控制台输出
+        LogOutput(
+            "console",
+            settings.log_level,
+            _stream_writer(sys.stdout),
+            _json_line if settings.log_json else _text_line,
+        ),
+        # 所有日志（JSON 行）
+        _file_output("app", "DEBUG", log_dir / "app.log"),
+        # 错误日志（JSON 行）
+        _file_output("error", "ERROR", log_dir / "error.log"),
+    ]
+    _active_sink = QueueSink(outputs, settings.log_queue_size)
+    # 格式化在后台线程完成，这里只保留消息本身
+    logger.add(_active_sink, level=_active_sink.level_no, format="{message}", colorize=False)
 
     logger.info("日志系统初始化完成")
+
+
+def shutdown_logging() -> None:
+    """写完队列中的日志并关闭输出"""
+    global _active_sink
+    # QueueSink.stop 在队列写完后关闭日志文件
+    logger.remove()
+    _active_sink = None
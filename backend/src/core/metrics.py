@@ -0,0 +1,438 @@
+"""
+应用指标模块
+
+进程内收集指标，由 GET /metrics 以 Prometheus 文本格式暴露:
+- HTTP: 按路由模板统计的请求延迟直方图、按方法统计的处理中请求数
+- 数据库: 连接池获取连接的等待时间、连接池占用、SQL 语句耗时、每个请求执行的 SQL 语句数和耗时、
+  疑似 N+1 和超出语句数预算的次数
+- 各组件已有的运行统计（线程池、出站 HTTP、定时任务、缓存）
+
+指标只在事件循环线程中更新，不加锁；直方图 observe 为一次二分查找和几次加法，
+可以在生产环境常开。多个 uvicorn worker 各自统计，由 Prometheus 按实例聚合。
+"""
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Any, Optional
+
+# 默认延迟直方图桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 每请求 SQL 语句数直方图桶
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """指标基类"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """初始化
+
+        Args:
+            name: 指标名称
+            help: 说明
+            labelnames: 标签名，更新指标时按相同顺序传入标签值
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def render(self, lines: list[str]) -> None:
+        """按文本格式输出指标"""
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.type}")
+        self._render_samples(lines)
+
+    @abstractmethod
+    def _render_samples(self, lines: list[str]) -> None:
+        """输出指标的样本行"""
+
+
+class Counter(Metric):
+    """计数器"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _render_samples(self, lines: list[str]) -> None:
+        for labels, value in self._values.items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+
+
+class Gauge(Counter):
+    """仪表盘（可增可减）"""
+
+    type = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self._values[labels] = value
+
+
+class CallbackGauge(Metric):
+    """输出时调用函数取值的仪表盘"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        func: Callable[[], dict[tuple, float]],
+        labelnames: tuple[str, ...] = (),
+    ):
+        """初始化
+
+        Args:
+            name: 指标名称
+            help: 说明
+            func: 返回 标签值 -> 数值 的函数
+            labelnames: 标签名
+        """
+        super().__init__(name, help, labelnames)
+        self.func = func
+
+    def _render_samples(self, lines: list[str]) -> None:
+        for labels, value in self.func().items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+
+
+class Histogram(Metric):
+    """直方图"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数..., +Inf 桶计数, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        data = self._values.get(labels)
+        if data is None:
+            data = self._values[labels] = [0] * (len(self.buckets) + 2)
+        data[bisect_left(self.buckets, value)] += 1
+        data[-1] += value
+
+    def _render_samples(self, lines: list[str]) -> None:
+        bucket_names = self.labelnames + ("le",)
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, data in self._values.items():
+            cumulative = 0
+            for bound, count in zip(bounds, data):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_names, labels + (bound,))} "
+                    f"{cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(data[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+
+
+class StatsCollector(Metric):
+    """把组件的统计字典转换为仪表盘指标
+
+    数值字段输出为 {prefix}_{字段名}，datetime 输出为时间戳，None 和其他类型忽略
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        prefix: str,
+        func: Callable[[], dict[str, Any]],
+        label: Optional[str] = None,
+    ):
+        """初始化
+
+        Args:
+            prefix: 指标名前缀
+            func: 返回统计字典的函数
+            label: 不为空时 func 返回 标签值 -> 统计字典，标签值输出到该标签
+        """
+        super().__init__(prefix, f"{prefix} stats")
+        self.func = func
+        self.label = label
+
+    def render(self, lines: list[str]) -> None:
+        # 每个字段是一个独立的指标，TYPE 行在 _render_samples 中按字段输出
+        self._render_samples(lines)
+
+    def _render_samples(self, lines: list[str]) -> None:
+        stats = self.func()
+        groups = stats.items() if self.label else [(None, stats)]
+        samples: dict[str, list[str]] = {}
+        for label_value, values in groups:
+            label_text = (
+                _format_labels((self.label,), (label_value,)) if self.label else ""
+            )
+            for key, value in values.items():
+                if isinstance(value, datetime):
+                    value = value.timestamp()
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                samples.setdefault(f"{self.name}_{key}", []).append(
+                    f"{self.name}_{key}{label_text} {_format_value(value)}"
+                )
+        for name, sample_lines in samples.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(sample_lines)
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """注册指标
+
+        Args:
+            metric: 指标
+
+        Returns:
+            传入的指标，便于赋值
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(
+        self,
+        prefix: str,
+        func: Callable[[], dict[str, Any]],
+        label: Optional[str] = None,
+    ) -> None:
+        """注册组件统计字典
+
+        Args:
+            prefix: 指标名前缀
+            func: 返回统计字典的函数
+            label: 见 StatsCollector
+        """
+        self.register(StatsCollector(prefix, func, label))
+
+    def render(self) -> str:
+        """输出全部指标"""
+        lines: list[str] = []
+        for metric in self._metrics:
+            metric.render(lines)
+        lines.append("")
+        return "\n".join(lines)
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics.register(
+    Gauge(
+        "http_requests_in_flight",
+        "HTTP requests currently being handled",
+        ("method",),
+    )
+)
+DB_POOL_CHECKOUT_WAIT = metrics.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a connection from the database pool",
+    )
+)
+DB_STATEMENTS = metrics.register(
+    Counter("db_statements_total", "SQL statements executed")
+)
+DB_STATEMENT_DURATION = metrics.register(
+    Histogram("db_statement_duration_seconds", "SQL statement execution time")
+)
+DB_STATEMENTS_PER_REQUEST = metrics.register(
+    Histogram(
+        "db_statements_per_request",
+        "SQL statements executed per HTTP request by route template",
+        ("route",),
+        buckets=STATEMENT_BUCKETS,
+    )
+)
+DB_TIME_PER_REQUEST = metrics.register(
+    Histogram(
+        "db_time_per_request_seconds",
+        "Total SQL execution time per HTTP request by route template",
+        ("route",),
+    )
+)
+DB_N_PLUS_ONE = metrics.register(
+    Counter(
+        "db_n_plus_one_total",
+        "Requests that repeated the same SQL statement past the N+1 threshold",
+        ("route",),
+    )
+)
+DB_STATEMENT_BUDGET_EXCEEDED = metrics.register(
+    Counter(
+        "db_statement_budget_exceeded_total",
+        "Requests that executed more SQL statements than the route budget",
+        ("route",),
+    )
+)
+
+# 当前请求的统计，由请求中间件设置
+_request_stats: ContextVar[Optional[dict[str, Any]]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def begin_request() -> tuple[dict[str, Any], Token]:
+    """开始统计当前请求
+
+    Returns:
+        (请求统计字典, 用于 end_request 的 token)
+    """
+    stats = {"statements": 0, "statement_time": 0.0, "statement_counts": {}}
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    """结束统计当前请求"""
+    _request_stats.reset(token)
+
+
+def record_statement(statement: str, duration: float) -> None:
+    """记录一条 SQL 语句（由数据库引擎事件调用）
+
+    Args:
+        statement: SQL 文本（参数为占位符，参数不同的同一查询文本相同）
+        duration: 执行耗时（秒）
+    """
+    DB_STATEMENTS.inc()
+    DB_STATEMENT_DURATION.observe(duration)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats["statements"] += 1
+        stats["statement_time"] += duration
+        counts = stats["statement_counts"]
+        counts[statement] = counts.get(statement, 0) + 1
+
+
+def instrument_routes(routes: Iterable[Any]) -> None:
+    """为应用顶层的路由和挂载写入 scope["metrics_route"]
+
+    挂载的子应用（如 /uploads）匹配后不设置 scope["route"]，需要在这里记录挂载路径。
+    在注册完所有路由后调用一次
+
+    Args:
+        routes: app.routes（APIRoute、Mount 等带 app 和 path 属性的路由）
+    """
+    for route in routes:
+        label = getattr(route, "path_format", None) or getattr(route, "path", None)
+        if not label or not hasattr(route, "app"):
+            continue
+        route.app = _instrument_app(route.app, label)
+
+
+def _instrument_app(app: Callable, label: str) -> Callable:
+    async def instrumented(scope, receive, send):
+        scope["metrics_route"] = label
+        await app(scope, receive, send)
+
+    return instrumented
+
+
+# id(路由) -> include 前缀（路由对象定义了 __eq__，不可哈希；路由在应用运行期间不会释放）
+_route_prefixes: dict[int, str] = {}
+
+
+def route_template(scope: dict[str, Any]) -> Optional[str]:
+    """获取已完成路由匹配的请求的路由模板
+
+    include_router 引入的路由不在 app.routes 中，匹配后 scope["route"] 是原始路由，
+    其模板不含 include 前缀。前缀取请求路径中去掉与路由正则匹配的后缀的部分
+    （前缀不含路径参数，本应用只有 /api/v1）
+
+    Args:
+        scope: 请求 scope
+
+    Returns:
+        路由模板，未匹配到路由时为 None
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return scope.get("metrics_route")
+    path = scope["path"]
+    prefix = _route_prefixes.get(id(route))
+    if prefix is not None and path.startswith(prefix) and route.path_regex.match(
+        path[len(prefix):]
+    ):
+        return prefix + path_format
+    start = 0
+    while start != -1:
+        if route.path_regex.match(path[start:]):
+            # 路由数量有限，按路由缓存前缀，之后一般只需匹配一次
+            _route_prefixes[id(route)] = path[:start]
+            return path[:start] + path_format
+        start = path.find("/", start + 1)
+    return path_format
+
+
+def observe_request(
+    method: str, route: str, status: int, duration: float, stats: dict[str, Any]
+) -> None:
+    """记录一次请求的延迟、SQL 语句数和耗时
+
+    Args:
+        method: 请求方法
+        route: 路由模板
+        status: 响应状态码
+        duration: 耗时（秒）
+        stats: begin_request 返回的请求统计
+    """
+    HTTP_REQUEST_DURATION.observe(duration, (method, route, str(status)))
+    DB_STATEMENTS_PER_REQUEST.observe(stats["statements"], (route,))
+    DB_TIME_PER_REQUEST.observe(stats["statement_time"], (route,))
@@ -0,0 +1,181 @@
+"""
+SQL 语句监控模块
+
+通过数据库引擎的 before/after_cursor_execute 事件:
+- 统计每条语句的耗时，按请求累计语句数、耗时和各语句的执行次数（见 core.metrics）
+- 超过 DB_SLOW_QUERY_THRESHOLD 的 SELECT 语句在同一连接上执行 EXPLAIN，连同执行计划记录警告
+
+请求结束时由中间件调用 check_statements:
+- 同一 SQL 文本（参数不同）执行次数达到 DB_N_PLUS_ONE_THRESHOLD 时记录疑似 N+1
+- 语句数超过 STATEMENT_BUDGETS 中的路由预算时记录警告（DB_STATEMENT_BUDGET_MODE=warn）
+
+检查只记录日志和指标，不影响响应（此时事务已经提交）；预算由测试强制执行
+（tests/test_statement_budgets.py 按 STATEMENT_BUDGETS 断言，服务层测试使用 statement_budget）
+"""
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.metrics import (
+    DB_N_PLUS_ONE,
+    DB_STATEMENT_BUDGET_EXCEEDED,
+    begin_request,
+    end_request,
+    record_statement,
+)
+
+# 热点路由每个请求的 SQL 语句数预算，(请求方法, 路由模板) -> 最大语句数
+# 语句数应与数据量无关，新增查询时同步调整
+STATEMENT_BUDGETS: dict[tuple[str, str], int] = {
+    # 当前用户 + count + 订单(联表课程/小区/教练) + 课程学员 + 学员
+    ("GET", "/api/v1/orders"): 5,
+    # 用户 + 课程 + 学员(IN) + 已报名检查 + 插入订单 + 插入课程学员(多行) + 占用名额
+    # 用户只查询一次：认证缓存未命中时由认证查询并留在会话中供下单复用，
+    # 命中时认证不查询，由下单读取最新的会员状态
+    ("POST", "/api/v1/orders"): 7,
+    # 当前用户 + 订单(加锁) + 支付记录 + 更新支付记录 + 更新订单 + 更新课程学员
+    ("POST", "/api/v1/payment/confirm"): 6,
+}
+
+# 日志中 SQL 文本的最大长度
+_MAX_SQL_LENGTH = 500
+
+
+class StatementBudgetExceeded(AssertionError):
+    """代码块执行的 SQL 语句数超出预算（statement_budget 抛出）"""
+
+
+def _shorten(statement: str) -> str:
+    text = " ".join(statement.split())
+    if len(text) > _MAX_SQL_LENGTH:
+        text = text[:_MAX_SQL_LENGTH] + "..."
+    return text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_monitor_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_monitor_start", None)
+    duration = time.perf_counter() - start_time if start_time is not None else 0.0
+    record_statement(statement, duration)
+
+    threshold = settings.db_slow_query_threshold
+    if threshold and duration >= threshold:
+        plan = None
+        if (
+            not executemany
+            and context is not None
+            and not context.execution_options.get("stream_results")
+        ):
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "慢 SQL: 耗时={:.3f}s SQL={} EXPLAIN={}", duration, _shorten(statement), plan
+        )
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[list[dict[str, Any]]]:
+    """在同一连接上获取 SELECT 语句的执行计划
+
+    直接使用 DBAPI 游标执行，不会再次触发引擎事件
+
+    Returns:
+        执行计划的行，非 SELECT 语句或执行失败时返回 None
+    """
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.debug(f"获取执行计划失败: {e}")
+        return None
+
+
+def install(engine: AsyncEngine) -> None:
+    """在数据库引擎上注册语句监控事件
+
+    Args:
+        engine: 异步数据库引擎
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def check_statements(method: str, route: str, stats: dict[str, Any]) -> None:
+    """检查一个请求执行的 SQL：疑似 N+1 和语句数预算
+
+    Args:
+        method: 请求方法
+        route: 路由模板
+        stats: begin_request 返回的请求统计
+    """
+    threshold = settings.db_n_plus_one_threshold
+    if threshold:
+        repeated = [
+            (statement, count)
+            for statement, count in stats["statement_counts"].items()
+            if count >= threshold
+        ]
+        if repeated:
+            DB_N_PLUS_ONE.inc((route,))
+            for statement, count in repeated:
+                logger.warning(
+                    "疑似 N+1: {} {} 相同 SQL 执行 {} 次: {}",
+                    method, route, count, _shorten(statement),
+                )
+
+    mode = settings.db_statement_budget_mode
+    budget = STATEMENT_BUDGETS.get((method, route))
+    if mode == "off" or budget is None or stats["statements"] <= budget:
+        return
+
+    DB_STATEMENT_BUDGET_EXCEEDED.inc((route,))
+    logger.warning(
+        "{} {} 执行 {} 条 SQL，超出预算 {}", method, route, stats["statements"], budget
+    )
+
+
+@contextmanager
+def statement_budget(limit: int) -> Iterator[dict[str, Any]]:
+    """限制代码块内执行的 SQL 语句数，用于测试中直接调用服务层的场景
+
+    用法:
+        with statement_budget(3):
+            await OrderService().list_orders(db, user_id)
+
+    Args:
+        limit: 最大语句数
+
+    Yields:
+        代码块内的语句统计（同 begin_request）
+
+    Raises:
+        StatementBudgetExceeded: 语句数超出 limit
+    """
+    stats, token = begin_request()
+    try:
+        yield stats
+    finally:
+        end_request(token)
+    if stats["statements"] > limit:
+        raise StatementBudgetExceeded(
+            f"执行 {stats['statements']} 条 SQL，超出预算 {limit}: "
+            + "; ".join(
+                f"{count}x {_shorten(statement)}"
+                for statement, count in stats["statement_counts"].items()
+            )
+        )
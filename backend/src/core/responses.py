@@ -0,0 +1,41 @@
+"""
+JSON 响应模块
+
+使用 pydantic-core 的 Rust 序列化器直接输出 UTF-8 字节，
+原生支持 Decimal、datetime、date、time 以及 Pydantic 模型。
+"""
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 pydantic-core 序列化的 JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: Optional[dict[str, str]] = None,
+) -> FastJSONResponse:
+    """直接序列化已校验的响应模型
+
+    路由返回 Response 实例时 FastAPI 不再按 response_model 做二次校验和转换，
+    response_model 仍保留用于生成接口文档。
+
+    Args:
+        model: 已构造好的响应模型
+        status_code: HTTP 状态码
+        headers: 额外的响应头
+
+    Returns:
+        JSON 响应
+    """
+    return FastJSONResponse(content=model, status_code=status_code, headers=headers)
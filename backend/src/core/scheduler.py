@@ -0,0 +1,100 @@
+"""
+后台定时任务模块
+
+多个 uvicorn worker 都会启动定时任务，通过 MySQL 命名锁 GET_LOCK 选主，
+只有持有锁的 worker 执行任务。锁绑定在 leader 的一条专用连接上，
+worker 退出或连接断开时锁自动释放，其他 worker 在下个周期接管。
+选主连接不占用请求连接池；未获得锁的 worker 立即断开连接，等待期间不持有连接。
+"""
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.config import settings
+
+# 选主专用引擎：不复用连接，连接只在持有锁期间保留
+_lock_engine = create_async_engine(settings.database_url, poolclass=NullPool)
+
+
+class PeriodicTask:
+    """选主执行的周期任务"""
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[None]],
+    ):
+        """初始化
+
+        Args:
+            name: 任务名称，同时作为 MySQL 命名锁名称
+            interval: 执行间隔（秒）
+            func: 任务协程函数
+        """
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """启动任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """停止任务并释放锁"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        lock_name = f"spot:{self.name}"
+        while True:
+            try:
+                async with _lock_engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    acquired = await conn.scalar(
+                        text("SELECT GET_LOCK(:name, 0)"), {"name": lock_name}
+                    )
+                    # 未获得锁时退出 async with，先断开连接再等待
+                    if acquired == 1:
+                        self.is_leader = True
+                        logger.info(f"定时任务 {self.name} 获得执行权")
+                        try:
+                            while await self._still_leader(conn, lock_name):
+                                await self._run_once()
+                                await asyncio.sleep(self.interval)
+                        finally:
+                            self.is_leader = False
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"定时任务 {self.name} 选主连接异常")
+            await asyncio.sleep(self.interval)
+
+    async def _still_leader(self, conn, lock_name: str) -> bool:
+        """确认锁仍由当前连接持有（同时保持连接活跃）"""
+        holder = await conn.scalar(
+            text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": lock_name}
+        )
+        return holder == 1
+
+    async def _run_once(self) -> None:
+        try:
+            await self.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"定时任务 {self.name} 执行失败")
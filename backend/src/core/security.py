@@ -1,17 +1,125 @@
 """
 JWT 认证工具
 """
+import hashlib
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Optional, Any
 
 from jose import JWTError, jwt
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from src.core.cache import CacheBackend, DatabaseCacheBackend, TTLCache, cache_backend
 from src.core.config import settings
 
 # JWT 配置
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 天
 
+# 已校验令牌缓存：令牌 SHA-256 -> payload，过期时间不晚于令牌 exp
+_token_cache = TTLCache(
+    maxsize=settings.token_cache_size,
+    ttl=settings.token_cache_ttl,
+)
+
+
+class PrincipalCache:
+    """登录主体缓存
+
+    条目为 (主体类型, ID) -> (版本号, 列值的只读快照)。缓存的是不可变的快照而不是 ORM 实例，
+    每个请求由快照重建自己的实例，请求之间不共享对象。
+
+    失效通过版本号后端在 worker 之间传播：主体变更时递增 principal:{主体类型} 的版本号，
+    读取时版本号不一致的条目视为失效。使用 database 后端时，其他 worker 最迟在
+    CACHE_VERSION_CHECK_INTERVAL 秒后看到新版本；local 后端只适用于单 worker。
+    """
+
+    def __init__(self, backend: CacheBackend, maxsize: int, ttl: float):
+        """初始化
+
+        Args:
+            backend: 版本号后端
+            maxsize: 最大条目数
+            ttl: 条目有效期（秒），版本号失效之外的兜底
+        """
+        self.backend = backend
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(
+        self, principal_type: str, principal_id: str
+    ) -> tuple[int, Optional[Mapping[str, Any]]]:
+        """读取缓存
+
+        Args:
+            principal_type: 主体类型 user
+            principal_id: 主体 ID
+
+        Returns:
+            (当前版本号, 快照)，未命中时快照为 None；写入时传回该版本号
+        """
+        version = await self.backend.get_version(f"principal:{principal_type}")
+        entry = self._entries.get((principal_type, principal_id))
+        if entry is not None and entry[0] == version:
+            return version, entry[1]
+        return version, None
+
+    def set(
+        self,
+        principal_type: str,
+        principal_id: str,
+        version: int,
+        snapshot: Mapping[str, Any],
+    ) -> None:
+        """写入缓存
+
+        Args:
+            principal_type: 主体类型 user
+            principal_id: 主体 ID
+            version: 读取数据库前由 get 返回的版本号
+            snapshot: snapshot_principal 返回的快照
+        """
+        self._entries.set((principal_type, principal_id), (version, snapshot))
+
+    async def invalidate(
+        self, db: AsyncSession, principal_type: str, principal_id: str
+    ) -> None:
+        """使登录主体缓存失效
+
+        版本号与业务写入在同一事务中递增；本进程条目立即清理一次，
+        事务提交后再清理一次，避免提交前被并发请求用旧数据回填
+
+        Args:
+            db: 当前写操作所在的数据库会话
+            principal_type: 主体类型 user
+            principal_id: 主体 ID
+        """
+        namespace = f"principal:{principal_type}"
+        key = (principal_type, principal_id)
+        await self.backend.bump_version(db, namespace)
+        self._entries.pop(key)
+
+        def _after_commit(session) -> None:
+            self._entries.pop(key)
+            if isinstance(self.backend, DatabaseCacheBackend):
+                self.backend.forget(namespace)
+
+        event.listen(db.sync_session, "after_commit", _after_commit, once=True)
+
+    def clear(self) -> None:
+        """清空本进程全部条目"""
+        self._entries.clear()
+
+
+# 登录主体缓存实例，用于状态校验
+principal_cache = PrincipalCache(
+    backend=cache_backend,
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+
 
 def create_access_token(
     data: dict[str, Any],
@@ -47,8 +155,61 @@ def decode_access_token(token: str) -> Optional[dict[str, Any]]:
     Returns:
         解码后的数据，失败返回 None
     """
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _token_cache.set(cache_key, payload, expires_at=exp)
+    return payload
+
+
+def snapshot_principal(obj: Any) -> Mapping[str, Any]:
+    """提取登录主体的列值快照
+
+    Args:
+        obj: User 等模型实例
+
+    Returns:
+        只读的 列名 -> 值 映射
+    """
+    mapper = inspect(obj).mapper
+    return MappingProxyType({attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+
+
+def restore_principal(model: type, snapshot: Mapping[str, Any]) -> Any:
+    """由快照重建登录主体实例
+
+    重建的实例处于脱离会话（detached）状态，属性齐全，不会触发查询；
+    每次调用返回新的实例，修改它不会影响缓存和其他请求
+
+    Args:
+        model: 模型类
+        snapshot: snapshot_principal 返回的快照
+
+    Returns:
+        模型实例
+    """
+    obj = model(**snapshot)
+    make_transient_to_detached(obj)
+    return obj
+
+
+async def invalidate_principal(
+    db: AsyncSession, principal_type: str, principal_id: str
+) -> None:
+    """使登录主体缓存失效（用户状态或信息变更后调用），所有 worker 生效
+
+    Args:
+        db: 当前写操作所在的数据库会话
+        principal_type: 主体类型 user
+        principal_id: 主体 ID
+    """
+    await principal_cache.invalidate(db, principal_type, principal_id)
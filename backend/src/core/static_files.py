@@ -0,0 +1,224 @@
+"""
+上传文件静态服务
+
+在 StaticFiles 基础上支持按需生成图片衍生图:
+    /uploads/{path}?w=400&fmt=webp
+
+- w: 目标宽度，向上取整到 ALLOWED_WIDTHS 中的档位，避免任意尺寸撑爆缓存
+- fmt: 输出格式 webp/jpeg/png，默认保持原格式
+
+衍生图由 Pillow 在进程池中生成，保存在静态目录之外的 cache_dir 下。
+缓存键由原图路径、修改时间、大小和参数计算，原图不变则衍生图不变，
+因此可以使用强 ETag 和 immutable 缓存头。
+生成失败（文件损坏、不是有效图片等）时返回原图，失败结果缓存一段时间，不反复生成。
+路径中含以 . 开头的部分（写入中的隐藏文件等）时返回 404。
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import stat
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+import anyio.to_thread
+from fastapi.staticfiles import StaticFiles
+from loguru import logger
+from PIL import Image, ImageOps
+from starlette.datastructures import Headers, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+# 衍生图宽度档位
+ALLOWED_WIDTHS = (160, 320, 480, 640, 960, 1280)
+
+# 输出格式 -> (Pillow 格式, Content-Type, 保存参数)
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+    "png": ("PNG", "image/png", {"optimize": True}),
+}
+
+# 原图扩展名 -> 默认输出格式
+SOURCE_FORMATS = {
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".png": "png",
+    ".gif": "png",
+    ".webp": "webp",
+}
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 生成失败的衍生图在该时间内直接返回原图（秒）
+FAILURE_TTL = 3600
+# 最多记录的失败数量
+MAX_FAILURES = 1024
+
+
+def render_derivative(source: str, target: str, width: Optional[int], fmt: str) -> None:
+    """生成衍生图（在子进程中执行）
+
+    Args:
+        source: 原图路径
+        target: 衍生图保存路径
+        width: 目标宽度，为空或不小于原图宽度时不缩放
+        fmt: 输出格式
+    """
+    pil_format, _, options = OUTPUT_FORMATS[fmt]
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if width and img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+        if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        img.save(tmp_path, format=pil_format, **options)
+    os.replace(tmp_path, target)
+
+
+class ImageStaticFiles(StaticFiles):
+    """支持图片衍生图的静态文件服务"""
+
+    def __init__(self, *, directory: str, cache_dir: str, max_workers: int = 2, **kwargs):
+        """初始化
+
+        Args:
+            directory: 静态文件目录
+            cache_dir: 衍生图缓存目录，不能位于静态文件目录内
+            max_workers: 衍生图进程池大小
+            **kwargs: 透传给 StaticFiles 的参数
+        """
+        super().__init__(directory=directory, **kwargs)
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # 正在生成的衍生图，相同请求并发到达时只生成一次
+        self._pending: dict[str, asyncio.Future] = {}
+        # 生成失败的缓存键 -> 失效时间（本模块会在衍生图子进程中导入，不依赖应用模块）
+        self._failed: dict[str, float] = {}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if any(part.startswith(".") for part in Path(path).parts):
+            raise HTTPException(status_code=404)
+
+        params = QueryParams(scope["query_string"])
+        if "w" not in params and "fmt" not in params:
+            return await super().get_response(path, scope)
+
+        full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+        suffix = Path(full_path).suffix.lower()
+        if (
+            stat_result is None
+            or not stat.S_ISREG(stat_result.st_mode)
+            or suffix not in SOURCE_FORMATS
+        ):
+            return await super().get_response(path, scope)
+
+        width = self._parse_width(params.get("w"))
+        fmt = params.get("fmt") or SOURCE_FORMATS[suffix]
+        if fmt not in OUTPUT_FORMATS:
+            raise HTTPException(status_code=400, detail="Unsupported format")
+
+        key = hashlib.sha256(
+            f"{path}:{stat_result.st_mtime_ns}:{stat_result.st_size}:{width}:{fmt}".encode()
+        ).hexdigest()
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if Headers(scope=scope).get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        target = self.cache_dir / key[:2] / f"{key}.{fmt}"
+        if not self._has_failed(key):
+            try:
+                await self._ensure_derivative(key, full_path, target, width, fmt)
+            except Exception as e:
+                logger.warning(f"生成衍生图失败，返回原图: {path} w={width} fmt={fmt}: {e!r}")
+                if len(self._failed) >= MAX_FAILURES:
+                    self._failed.clear()
+                self._failed[key] = time.monotonic() + FAILURE_TTL
+            else:
+                return FileResponse(
+                    target, media_type=OUTPUT_FORMATS[fmt][1], headers=headers
+                )
+        return await super().get_response(path, scope)
+
+    def shutdown(self) -> None:
+        """关闭衍生图进程池"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _has_failed(self, key: str) -> bool:
+        expires_at = self._failed.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._failed[key]
+            return False
+        return True
+
+    async def _ensure_derivative(
+        self, key: str, source: str, target: Path, width: Optional[int], fmt: str
+    ) -> None:
+        if await anyio.to_thread.run_sync(target.exists):
+            return
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        try:
+            await anyio.to_thread.run_sync(
+                lambda: target.parent.mkdir(parents=True, exist_ok=True)
+            )
+            if self._pool is None:
+                # spawn 启动的子进程不继承父进程的线程、锁和数据库连接
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = self._pool
+            try:
+                await loop.run_in_executor(
+                    pool, render_derivative, source, str(target), width, fmt
+                )
+            except BrokenProcessPool:
+                # 子进程异常退出（如内存不足被杀）后进程池不可再用，下次请求重建
+                if self._pool is pool:
+                    self._pool = None
+                raise
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+            # 等待方会收到同一异常，这里标记为已读取避免告警
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            self._pending.pop(key, None)
+
+    @staticmethod
+    def _parse_width(value: Optional[str]) -> Optional[int]:
+        if not value:
+            return None
+        if not value.isdigit() or int(value) <= 0:
+            raise HTTPException(status_code=400, detail="Invalid width")
+        width = int(value)
+        for allowed in ALLOWED_WIDTHS:
+            if width <= allowed:
+                return allowed
+        return ALLOWED_WIDTHS[-1]
+
@@ -0,0 +1,299 @@
+"""
+微信接口客户端
+
+access_token 有效期 2 小时，且 cgi-bin/token 接口有调用频率限制，因此:
+1. 缓存 access_token，在过期前 refresh_margin 秒提前刷新
+2. 刷新为 single-flight，并发请求共享同一次刷新
+3. 通过可插拔的存储在多个 worker 之间共享 access_token
+   - local: 进程内保存，仅适用于单 worker
+   - database: 保存在 wechat_access_tokens 表，刷新时持有 MySQL 命名锁 GET_LOCK
+4. 刷新前（以及获得锁后）重新读取存储，其他 worker 已刷新时直接使用；
+   token 被微信判定无效时，只有存储中仍是这个 token 才刷新，
+   避免多个 worker 轮流刷新、互相使对方刚获取的 token 失效
+
+WECHAT_API_BASE_URL 可指向本地模拟服务进行测试。
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from src.core.config import settings
+from src.core.database import async_session_maker, engine
+from src.core.http_client import http_clients
+from src.models.domain import WechatAccessToken
+
+# access_token 无效或已过期的错误码
+INVALID_TOKEN_ERRCODES = {40001, 40014, 42001}
+
+
+class WechatAPIError(Exception):
+    """微信接口返回错误"""
+
+    def __init__(self, errcode: int, errmsg: str):
+        super().__init__(f"WeChat API error {errcode}: {errmsg}")
+        self.errcode = errcode
+        self.errmsg = errmsg
+
+
+class TokenStore(ABC):
+    """access_token 存储基类"""
+
+    @abstractmethod
+    async def load(self, app_id: str) -> Optional[tuple[str, datetime]]:
+        """读取 access_token
+
+        Args:
+            app_id: 小程序 AppID
+
+        Returns:
+            (access_token, 过期时间)，不存在返回 None
+        """
+
+    @abstractmethod
+    async def save(self, app_id: str, token: str, expires_at: datetime) -> None:
+        """保存 access_token
+
+        Args:
+            app_id: 小程序 AppID
+            token: access_token
+            expires_at: 过期时间
+        """
+
+    @abstractmethod
+    def refresh_lock(self, app_id: str) -> AbstractAsyncContextManager[None]:
+        """刷新 access_token 的互斥锁，共享存储的所有 worker 同时只有一个在刷新
+
+        Args:
+            app_id: 小程序 AppID
+        """
+
+
+class LocalTokenStore(TokenStore):
+    """进程内存储"""
+
+    def __init__(self):
+        self._tokens: dict[str, tuple[str, datetime]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def load(self, app_id: str) -> Optional[tuple[str, datetime]]:
+        return self._tokens.get(app_id)
+
+    async def save(self, app_id: str, token: str, expires_at: datetime) -> None:
+        self._tokens[app_id] = (token, expires_at)
+
+    @asynccontextmanager
+    async def refresh_lock(self, app_id: str) -> AsyncIterator[None]:
+        async with self._locks.setdefault(app_id, asyncio.Lock()):
+            yield
+
+
+class DatabaseTokenStore(TokenStore):
+    """数据库存储，多个 worker 共享"""
+
+    def __init__(self, lock_timeout: int = 10):
+        """初始化
+
+        Args:
+            lock_timeout: 等待其他 worker 刷新的最长秒数，超时后不加锁直接刷新
+        """
+        self.lock_timeout = lock_timeout
+
+    async def load(self, app_id: str) -> Optional[tuple[str, datetime]]:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(WechatAccessToken.access_token, WechatAccessToken.expires_at)
+                .where(WechatAccessToken.app_id == app_id)
+            )
+            row = result.first()
+        return (row[0], row[1]) if row else None
+
+    async def save(self, app_id: str, token: str, expires_at: datetime) -> None:
+        now = datetime.now()
+        stmt = mysql_insert(WechatAccessToken).values(
+            app_id=app_id, access_token=token, expires_at=expires_at, updated_at=now
+        )
+        stmt = stmt.on_duplicate_key_update(
+            access_token=token, expires_at=expires_at, updated_at=now
+        )
+        async with async_session_maker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    @asynccontextmanager
+    async def refresh_lock(self, app_id: str) -> AsyncIterator[None]:
+        # 命名锁绑定在连接上，刷新期间（一次微信接口调用）保留这条连接
+        lock_name = f"wechat_access_token:{app_id}"
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": lock_name, "timeout": self.lock_timeout},
+            )
+            if acquired != 1:
+                logger.warning(f"等待微信 access_token 刷新锁超时，直接刷新: {lock_name}")
+            try:
+                yield
+            finally:
+                if acquired == 1:
+                    await conn.execute(
+                        text("SELECT RELEASE_LOCK(:name)"), {"name": lock_name}
+                    )
+
+
+class WechatClient:
+    """微信小程序服务端接口客户端"""
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        store: TokenStore,
+        refresh_margin: int = 300,
+    ):
+        """初始化
+
+        Args:
+            app_id: 小程序 AppID
+            app_secret: 小程序 AppSecret
+            store: access_token 存储
+            refresh_margin: 提前刷新的秒数
+        """
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.store = store
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._token: Optional[tuple[str, datetime]] = None
+        # 进行中的刷新，按被拒绝的 token 区分（None 表示正常过期）
+        self._refresh_tasks: dict[Optional[str], asyncio.Task] = {}
+
+    async def get_access_token(self, rejected: Optional[str] = None) -> str:
+        """获取 access_token
+
+        Args:
+            rejected: 被微信判定无效的 access_token，不会再返回这个 token；
+                存储中已是其他 worker 刷新的新 token 时直接使用，否则刷新
+
+        Returns:
+            access_token
+        """
+        if rejected is None and self._is_fresh(self._token):
+            return self._token[0]
+        # 其他 worker 可能已经刷新
+        stored = await self.store.load(self.app_id)
+        if self._is_usable(stored, rejected):
+            self._token = stored
+            return stored[0]
+
+        # single-flight: 同一进程内并发请求共享一次刷新
+        task = self._refresh_tasks.get(rejected)
+        if task is None:
+            task = asyncio.create_task(self._refresh(rejected))
+            self._refresh_tasks[rejected] = task
+            task.add_done_callback(lambda _: self._refresh_tasks.pop(rejected, None))
+        return await asyncio.shield(task)
+
+    async def get_phone_number(self, code: str) -> dict[str, Any]:
+        """通过手机号快速验证组件返回的 code 获取手机号
+
+        Args:
+            code: 前端 getPhoneNumber 返回的 code
+
+        Returns:
+            phone_info
+
+        Raises:
+            WechatAPIError: 微信接口返回错误
+        """
+        data = await self._call(
+            "POST", "/wxa/business/getuserphonenumber", json={"code": code}
+        )
+        return data.get("phone_info", {})
+
+    async def _call(self, method: str, path: str, **kwargs) -> dict[str, Any]:
+        """调用需要 access_token 的接口，token 失效时换用新 token 重试一次"""
+        client = http_clients.get("wechat")
+        rejected = None
+        for attempt in range(2):
+            access_token = await self.get_access_token(rejected=rejected)
+            response = await client.request(
+                method, path, params={"access_token": access_token}, **kwargs
+            )
+            data = response.json()
+            errcode = data.get("errcode", 0)
+            if errcode == 0:
+                return data
+            if errcode not in INVALID_TOKEN_ERRCODES or attempt > 0:
+                raise WechatAPIError(errcode, data.get("errmsg", ""))
+            logger.warning(f"微信 access_token 已失效，重新获取: errcode={errcode}")
+            rejected = access_token
+        raise AssertionError("unreachable")
+
+    async def _refresh(self, rejected: Optional[str]) -> str:
+        async with self.store.refresh_lock(self.app_id):
+            # 等待锁期间其他 worker 可能已经刷新
+            stored = await self.store.load(self.app_id)
+            if self._is_usable(stored, rejected):
+                self._token = stored
+                return stored[0]
+            return await self._fetch_token()
+
+    async def _fetch_token(self) -> str:
+        client = http_clients.get("wechat")
+        response = await client.get(
+            "/cgi-bin/token",
+            params={
+                "grant_type": "client_credential",
+                "appid": self.app_id,
+                "secret": self.app_secret,
+            },
+        )
+        data = response.json()
+        token = data.get("access_token")
+        if not token:
+            raise WechatAPIError(data.get("errcode", -1), data.get("errmsg", ""))
+
+        expires_at = datetime.now() + timedelta(seconds=int(data.get("expires_in", 7200)))
+        self._token = (token, expires_at)
+        await self.store.save(self.app_id, token, expires_at)
+        logger.info(f"微信 access_token 已刷新，过期时间 {expires_at}")
+        return token
+
+    def _is_fresh(self, token: Optional[tuple[str, datetime]]) -> bool:
+        return token is not None and token[1] - self.refresh_margin > datetime.now()
+
+    def _is_usable(
+        self, token: Optional[tuple[str, datetime]], rejected: Optional[str]
+    ) -> bool:
+        return self._is_fresh(token) and token[0] != rejected
+
+
+def create_token_store(name: str) -> TokenStore:
+    """根据配置创建 access_token 存储
+
+    Args:
+        name: 存储名称 local/database
+
+    Returns:
+        存储实例
+    """
+    if name == "database":
+        return DatabaseTokenStore()
+    if name == "local":
+        return LocalTokenStore()
+    raise ValueError(f"Unknown token store: {name}")
+
+
+# 微信客户端实例
+wechat_client = WechatClient(
+    app_id=settings.wechat_app_id,
+    app_secret=settings.wechat_app_secret,
+    store=create_token_store(settings.wechat_token_store),
+    refresh_margin=settings.wechat_token_refresh_margin,
+)
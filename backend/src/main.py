@@ -4,50 +4,48 @@
 FastAPI 应用入口
 """
 from contextlib import asynccontextmanager
-from datetime import datetime
-from decimal import Decimal
-import json
 import time
+import uuid
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from loguru import logger
 
 from src.api.v1.router import api_router
 from src.core.config import settings
+from src.core.database import PRIMARY_PIN_HEADER, primary_pin_for
+from src.core.executor import crypto_executor, password_executor
+from src.core.http_client import http_clients
 from src.core.errors import ErrorCode
 from src.core.exceptions import AppException
-from src.core.logging import setup_logging
-
-
-# 自定义 JSON 编码器
-class CustomJSONEncoder(json.JSONEncoder):
-    """自定义 JSON 编码器，支持 Decimal 和 datetime"""
-
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
-
-
-# 自定义 JSONResponse
-class CustomJSONResponse(JSONResponse):
-    """自定义 JSONResponse，使用自定义编码器"""
-
-    def render(self, content) -> bytes:
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-            cls=CustomJSONEncoder,
-        ).encode("utf-8")
+from src.core.logging import logging_stats, sampled, setup_logging, shutdown_logging
+from src.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_REQUESTS_IN_FLIGHT,
+    begin_request,
+    end_request,
+    instrument_routes,
+    metrics,
+    observe_request,
+    route_template,
+)
+from src.core.query_monitor import check_statements
+from src.core.responses import FastJSONResponse
+from src.core.scheduler import PeriodicTask
+from src.core.static_files import ImageStaticFiles
+from src.services.ai_image_job_service import ai_image_job_service
+from src.services.ai_image_service import ai_image_service
+from src.services.ai_description_service import (
+    ai_description_service,
+    evict_description_cache,
+)
+from src.services.dashboard_service import (
+    dashboard_refresh_stats,
+    refresh_dashboard_stats,
+)
+from src.services.order_expiry_service import order_expiry_stats, sweep_expired_orders
 
 
 @asynccontextmanager
@@ -58,10 +56,48 @@ async def lifespan(app: FastAPI):
     logger.info(f"应用启动 - 环境: {settings.app_env}")
     logger.info(f"调试模式: {settings.debug}")
 
+    # 创建出站 HTTP 客户端
+    http_clients.start()
+
+    # 启动订单过期清理任务
+    order_expiry_task = PeriodicTask(
+        "order_expiry", settings.order_expiry_interval, sweep_expired_orders
+    )
+    if settings.order_expiry_enabled:
+        order_expiry_task.start()
+
+    # 启动仪表盘统计刷新任务
+    dashboard_task = PeriodicTask(
+        "dashboard_stats", settings.dashboard_refresh_interval, refresh_dashboard_stats
+    )
+    if settings.dashboard_refresh_enabled:
+        dashboard_task.start()
+
+    # 启动 AI 描述缓存清理任务
+    description_cache_task = PeriodicTask(
+        "ai_description_cache",
+        settings.ai_description_cache_evict_interval,
+        evict_description_cache,
+    )
+    description_cache_task.start()
+
+    # 启动 AI 图片生成任务 worker
+    await ai_image_job_service.start()
+
     yield
 
     # 关闭时执行
+    await order_expiry_task.stop()
+    await dashboard_task.stop()
+    await description_cache_task.stop()
+    await ai_image_job_service.stop()
+    ai_image_service.shutdown()
+    password_executor.shutdown()
+    crypto_executor.shutdown()
+    await http_clients.close()
+    upload_files.shutdown()
     logger.info("应用关闭")
+    shutdown_logging()
 
 
 # 创建 FastAPI 应用
@@ -72,33 +108,67 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
-    default_response_class=CustomJSONResponse,
+    default_response_class=FastJSONResponse,
 )
 
 
 # 请求日志中间件
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """记录请求日志"""
-    start_time = time.time()
-
-    # 记录请求
-    logger.info(f"请求开始: {request.method} {request.url.path}")
-
-    # 处理请求
-    response = await call_next(request)
-
-    # 计算处理时间
-    process_time = time.time() - start_time
-
-    # 记录响应
-    logger.info(
-        f"请求完成: {request.method} {request.url.path} "
-        f"状态码={response.status_code} 耗时={process_time:.3f}s"
-    )
+    """记录请求日志和请求指标"""
+    start_time = time.perf_counter()
+    request_stats, token = begin_request()
+    request_id = request.headers.get("x-request-id", "")[:64] or uuid.uuid4().hex
+
+    with logger.contextualize(request_id=request_id):
+        # 记录请求
+        if sampled("DEBUG"):
+            logger.debug("请求开始: {} {}", request.method, request.url.path)
+
+        # 处理请求
+        status_code = 500
+        in_flight_key = (request.method,)
+        HTTP_REQUESTS_IN_FLIGHT.inc(in_flight_key)
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(in_flight_key)
+            end_request(token)
+            process_time = time.perf_counter() - start_time
+            # 未匹配到路由的请求（404）不记录，避免路径作为标签无限增长
+            route = route_template(request.scope)
+            if route:
+                observe_request(
+                    request.method, route, status_code, process_time, request_stats
+                )
+
+        # 记录响应
+        if sampled("INFO"):
+            logger.info(
+                "请求完成: {} {} 状态码={} 耗时={:.3f}s SQL={} SQL耗时={:.3f}s",
+                request.method,
+                request.url.path,
+                status_code,
+                process_time,
+                request_stats["statements"],
+                request_stats["statement_time"],
+            )
+
+        # 疑似 N+1 和语句数预算
+        if route:
+            check_statements(request.method, route, request_stats)
 
     # 添加处理时间头
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Request-ID"] = request_id
+    # 写入主库的请求下发主库固定令牌，客户端带回后短时间内读主库
+    primary_pin = primary_pin_for(request)
+    if primary_pin:
+        response.headers[PRIMARY_PIN_HEADER] = primary_pin
+    if settings.debug:
+        response.headers["X-SQL-Count"] = str(request_stats["statements"])
+        response.headers["X-SQL-Time"] = f"{request_stats['statement_time']:.6f}"
 
     return response
 
@@ -108,13 +178,16 @@ async def log_requests(request: Request, call_next):
 async def app_exception_handler(request: Request, exc: AppException):
     """应用异常处理"""
     logger.error(f"应用异常: {exc.message}")
-    return JSONResponse(
+    # 过载拒绝时提示客户端退避后重试
+    headers = {"Retry-After": "1"} if exc.code == ErrorCode.SERVICE_BUSY else None
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "code": exc.code,
             "message": exc.message,
             "data": exc.details,
         },
+        headers=headers,
     )
 
 
@@ -140,7 +213,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         formatted_errors.append(formatted_error)
 
     logger.error(f"参数验证失败: {formatted_errors}")
-    return CustomJSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "code": ErrorCode.BAD_REQUEST,
@@ -154,7 +227,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def global_exception_handler(request: Request, exc: Exception):
     """全局异常处理"""
     logger.exception("未处理的异常")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "code": ErrorCode.INTERNAL_ERROR,
@@ -174,7 +247,12 @@ app.add_middleware(
 )
 
 # 配置静态文件服务
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+upload_files = ImageStaticFiles(
+    directory="uploads",
+    cache_dir="cache/uploads",
+    max_workers=settings.image_derivative_workers,
+)
+app.mount("/uploads", upload_files, name="uploads")
 
 # 注册路由
 app.include_router(api_router, prefix="/api/v1")
@@ -190,6 +268,18 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus 指标"""
+    if not settings.metrics_enabled:
+        return PlainTextResponse("Not Found", status_code=status.HTTP_404_NOT_FOUND)
+    if settings.metrics_token and (
+        request.headers.get("authorization") != f"Bearer {settings.metrics_token}"
+    ):
+        return PlainTextResponse("Unauthorized", status_code=status.HTTP_401_UNAUTHORIZED)
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health():
     """根路径健康检查（兼容测试脚本）"""
@@ -215,3 +305,17 @@ async def health():
             "database": db_status,
         },
     }
+
+
+# 注册组件运行统计
+metrics.register_stats("password_executor", password_executor.stats)
+metrics.register_stats("crypto_executor", crypto_executor.stats)
+metrics.register_stats("log_sink", logging_stats, label="sink")
+metrics.register_stats("http_client", http_clients.stats, label="upstream")
+metrics.register_stats("order_expiry", lambda: order_expiry_stats)
+metrics.register_stats("dashboard_refresh", lambda: dashboard_refresh_stats)
+metrics.register_stats("ai_description_cache", lambda: ai_description_service.cache.stats)
+
+# 为所有路由加上指标统计（需在注册完全部路由后执行）
+if settings.metrics_enabled:
+    instrument_routes(app.routes)
@@ -14,6 +14,11 @@ from .payment import Payment
 from .member_card import MemberCard
 from .user_member import UserMember
 from .banner import Banner
+from .cache_version import CacheVersion
+from .wechat_access_token import WechatAccessToken
+from .ai_description_cache import AIDescriptionCacheEntry
+from .ai_image_job import AIImageJob
+from .dashboard_stats import DashboardSnapshot, DailyOrderStats
 
 __all__ = [
     "Base",
@@ -29,4 +34,10 @@ __all__ = [
     "MemberCard",
     "UserMember",
     "Banner",
+    "CacheVersion",
+    "WechatAccessToken",
+    "AIDescriptionCacheEntry",
+    "AIImageJob",
+    "DashboardSnapshot",
+    "DailyOrderStats",
 ]
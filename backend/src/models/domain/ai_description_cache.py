@@ -0,0 +1,36 @@
+"""
+AI 描述缓存模型
+"""
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class AIDescriptionCacheEntry(Base):
+    """AI 描述缓存表"""
+
+    __tablename__ = "ai_description_cache"
+
+    cache_key: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="缓存键(模型+提示词+温度的SHA-256)"
+    )
+    model: Mapped[str] = mapped_column(String(128), nullable=False, comment="模型")
+    description: Mapped[str] = mapped_column(Text, nullable=False, comment="生成的描述")
+    tokens_used: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="生成时消耗的tokens"
+    )
+    hit_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="命中次数"
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, comment="创建时间"
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, index=True, comment="最近使用时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<AIDescriptionCacheEntry(cache_key={self.cache_key}, model={self.model})>"
@@ -0,0 +1,62 @@
+"""
+AI 图片生成任务模型
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, Boolean, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class AIImageJob(Base, TimestampMixin):
+    """AI 图片生成任务表"""
+
+    __tablename__ = "ai_image_jobs"
+    __table_args__ = (
+        Index("idx_status_created_at", "status", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, comment="任务ID")
+    admin_id: Mapped[Optional[str]] = mapped_column(
+        String(32), nullable=True, comment="提交的管理员ID"
+    )
+    prompt: Mapped[str] = mapped_column(String(512), nullable=False, comment="提示词")
+    size: Mapped[str] = mapped_column(String(20), nullable=False, comment="图片尺寸")
+    watermark: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, comment="是否添加水印"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        comment="状态 pending/running/succeeded/failed",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="已尝试次数"
+    )
+    url: Mapped[Optional[str]] = mapped_column(
+        String(512), nullable=True, comment="本地图片URL"
+    )
+    original_url: Mapped[Optional[str]] = mapped_column(
+        String(1024), nullable=True, comment="原始图片URL"
+    )
+    model: Mapped[Optional[str]] = mapped_column(
+        String(128), nullable=True, comment="使用的模型"
+    )
+    error: Mapped[Optional[str]] = mapped_column(
+        String(512), nullable=True, comment="失败原因"
+    )
+    next_run_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, comment="下次执行时间(重试退避)"
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, comment="开始执行时间"
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, comment="完成时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<AIImageJob(id={self.id}, status={self.status})>"
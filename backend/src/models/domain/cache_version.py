@@ -0,0 +1,23 @@
+"""
+缓存版本模型
+"""
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class CacheVersion(Base):
+    """缓存版本表"""
+
+    __tablename__ = "cache_versions"
+
+    namespace: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="缓存命名空间"
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="版本号"
+    )
+
+    def __repr__(self) -> str:
+        return f"<CacheVersion(namespace={self.namespace}, version={self.version})>"
@@ -0,0 +1,54 @@
+"""
+仪表盘统计模型
+"""
+from datetime import datetime, date
+from decimal import Decimal
+
+from sqlalchemy import String, Integer, Numeric, DateTime, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DashboardSnapshot(Base):
+    """仪表盘统计快照表"""
+
+    __tablename__ = "dashboard_snapshots"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True, comment="快照名称")
+    total_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="用户总数")
+    total_orders: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="订单总数")
+    paid_orders: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="已支付订单数")
+    total_revenue: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, comment="总收入"
+    )
+    total_courses: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="课程总数")
+    enrolling_courses: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="报名中的课程数"
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, comment="刷新时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<DashboardSnapshot(name={self.name}, refreshed_at={self.refreshed_at})>"
+
+
+class DailyOrderStats(Base):
+    """每日订单统计表"""
+
+    __tablename__ = "daily_order_stats"
+
+    stat_date: Mapped[date] = mapped_column(Date, primary_key=True, comment="统计日期")
+    new_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="新增用户数")
+    new_orders: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="新增订单数")
+    paid_orders: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="支付订单数")
+    revenue: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, comment="支付金额"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, comment="更新时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<DailyOrderStats(stat_date={self.stat_date})>"
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
-from sqlalchemy import String, Numeric, DateTime, ForeignKey
+from sqlalchemy import String, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -15,6 +15,11 @@ class Order(Base, TimestampMixin):
     """订单表"""
 
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("idx_status_expire_at", "status", "expire_at"),
+        Index("idx_pay_time", "pay_time"),
+        Index("idx_updated_at", "updated_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, comment="订单ID")
     order_no: Mapped[str] = mapped_column(
@@ -4,7 +4,7 @@
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import String, Integer, Date, ForeignKey
+from sqlalchemy import String, Integer, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -14,6 +14,9 @@ class Student(Base, TimestampMixin):
     """学员表"""
 
     __tablename__ = "students"
+    __table_args__ = (
+        Index("idx_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, comment="学员ID")
     user_id: Mapped[str] = mapped_column(
@@ -3,7 +3,7 @@
 """
 from typing import Optional
 
-from sqlalchemy import String, Integer, Text
+from sqlalchemy import String, Integer, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -13,6 +13,9 @@ class Teacher(Base, TimestampMixin):
     """教练表"""
 
     __tablename__ = "teachers"
+    __table_args__ = (
+        Index("idx_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, comment="教练ID")
     name: Mapped[str] = mapped_column(
@@ -4,7 +4,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, DateTime
+from sqlalchemy import String, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -14,6 +14,9 @@ class User(Base, TimestampMixin):
     """用户表"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("idx_created_at", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(32), primary_key=True, comment="用户ID")
     openid: Mapped[str] = mapped_column(
@@ -26,7 +29,7 @@ class User(Base, TimestampMixin):
         String(20), unique=True, nullable=True, index=True, comment="手机号"
     )
     nickname: Mapped[Optional[str]] = mapped_column(
-        String(64), nullable=True, comment="昵称"
+        String(64), nullable=True, index=True, comment="昵称"
     )
     avatar: Mapped[Optional[str]] = mapped_column(
         String(512), nullable=True, comment="头像URL"
@@ -0,0 +1,31 @@
+"""
+微信 access_token 模型
+"""
+from datetime import datetime
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class WechatAccessToken(Base):
+    """微信 access_token 表"""
+
+    __tablename__ = "wechat_access_tokens"
+
+    app_id: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="小程序 AppID"
+    )
+    access_token: Mapped[str] = mapped_column(
+        String(512), nullable=False, comment="接口调用凭证"
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, comment="过期时间"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, comment="更新时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<WechatAccessToken(app_id={self.app_id}, expires_at={self.expires_at})>"
@@ -30,3 +30,6 @@ class PaginatedResponseSchema(BaseModel, Generic[T]):
     total: int = Field(description="总数")
     page: int = Field(description="当前页码")
     page_size: int = Field(description="每页数量")
+    next_cursor: Optional[str] = Field(
+        default=None, description="下一页游标(游标分页时返回，为空表示没有下一页)"
+    )
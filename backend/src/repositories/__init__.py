@@ -2,5 +2,6 @@
 Repository 层
 """
 from .base import BaseRepository
+from .loader import EntityLoader, get_loader
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "EntityLoader", "get_loader"]
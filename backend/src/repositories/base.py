@@ -1,15 +1,54 @@
 """
 Repository 基类
 """
+import base64
+import json
+from datetime import datetime
 from typing import Generic, TypeVar, Type, Optional, Any
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.exceptions import BadRequestException
 from src.models.domain.base import Base
+from src.repositories.loader import get_loader
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """编码分页游标
+
+    Args:
+        created_at: 本页最后一条记录的创建时间
+        id: 本页最后一条记录的 ID
+
+    Returns:
+        不透明的游标字符串
+    """
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """解码分页游标
+
+    Args:
+        cursor: 游标字符串
+
+    Returns:
+        (created_at, id)
+
+    Raises:
+        BadRequestException: 游标无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(id)
+    except (ValueError, TypeError):
+        raise BadRequestException("分页游标无效")
+
+
 class BaseRepository(Generic[ModelType]):
     """Repository 基类"""
 
@@ -24,6 +63,9 @@ class BaseRepository(Generic[ModelType]):
     async def get(self, db: AsyncSession, id: str) -> Optional[ModelType]:
         """根据 ID 获取单条记录
 
+        通过会话内的加载器读取：并发的 get 合并为一次 IN 查询，
+        同一会话内重复读取直接返回缓存的实例
+
         Args:
             db: 数据库会话
             id: 记录 ID
@@ -31,8 +73,21 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             模型实例或 None
         """
-        result = await db.execute(select(self.model).filter(self.model.id == id))
-        return result.scalar_one_or_none()
+        return await get_loader(db, self.model).load(id)
+
+    async def get_many(
+        self, db: AsyncSession, ids: list[str]
+    ) -> list[Optional[ModelType]]:
+        """根据 ID 批量获取记录
+
+        Args:
+            db: 数据库会话
+            ids: 记录 ID 列表
+
+        Returns:
+            与 ids 顺序一致的模型实例列表，不存在的位置为 None
+        """
+        return await get_loader(db, self.model).load_many(ids)
 
     async def get_multi(
         self,
@@ -57,12 +112,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             模型实例列表
         """
-        query = select(self.model)
-
-        # 应用过滤条件
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
+        query = self._apply_filters(select(self.model), filters)
 
         # 应用排序
         if order_by and hasattr(self.model, order_by):
@@ -73,6 +123,85 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> tuple[list[ModelType], Optional[str]]:
+        """游标分页获取多条记录
+
+        按 (created_at, id) 倒序，使用上一页最后一条记录作为起点做范围查询，
+        不论翻到第几页都只扫描 limit 条索引记录
+
+        Args:
+            db: 数据库会话
+            limit: 返回记录数
+            cursor: 上一页返回的游标，为空时从第一条开始
+            **filters: 过滤条件
+
+        Returns:
+            (模型实例列表, 下一页游标)，没有下一页时游标为 None
+        """
+        created_at_column = self.model.created_at
+        id_column = self.model.id
+        query = self._apply_filters(select(self.model), filters)
+
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            # 单独的 created_at <= 条件让索引从游标位置开始范围扫描，
+            # 只有 OR 条件时优化器会从索引头部逐条过滤，越往后翻越慢
+            query = query.filter(
+                created_at_column <= last_created_at,
+                or_(created_at_column < last_created_at, id_column < last_id),
+            )
+
+        # 多取一条判断是否还有下一页
+        query = query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return items, next_cursor
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> tuple[list[ModelType], Optional[str]]:
+        """分页获取多条记录
+
+        未传 cursor 时使用 page/page_size 偏移分页；
+        传入 cursor（空字符串表示第一页）时使用游标分页，忽略 page
+
+        Args:
+            db: 数据库会话
+            page: 页码
+            page_size: 每页数量
+            cursor: 分页游标
+            **filters: 过滤条件
+
+        Returns:
+            (模型实例列表, 下一页游标)，偏移分页时游标为 None
+        """
+        if cursor is None:
+            items = await self.get_multi(
+                db, skip=(page - 1) * page_size, limit=page_size, **filters
+            )
+            return items, None
+        return await self.get_multi_by_cursor(
+            db, limit=page_size, cursor=cursor, **filters
+        )
+
     async def count(self, db: AsyncSession, **filters: Any) -> int:
         """统计记录数
 
@@ -83,22 +212,20 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             记录数
         """
-        query = select(func.count(self.model.id))
-
-        # 应用过滤条件
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-
+        query = self._apply_filters(select(func.count(self.model.id)), filters)
         result = await db.execute(query)
         return result.scalar() or 0
 
-    async def create(self, db: AsyncSession, obj_in: dict) -> ModelType:
+    async def create(
+        self, db: AsyncSession, obj_in: dict, *, refresh: bool = True
+    ) -> ModelType:
         """创建记录
 
         Args:
             db: 数据库会话
             obj_in: 创建数据
+            refresh: 插入后是否重新查询。模型没有数据库端默认值时，
+                插入后的字段均已在本地确定，可传 False 省去一次查询
 
         Returns:
             创建的模型实例
@@ -106,9 +233,33 @@ class BaseRepository(Generic[ModelType]):
         db_obj = self.model(**obj_in)
         db.add(db_obj)
         await db.flush()
-        await db.refresh(db_obj)
+        if refresh:
+            await db.refresh(db_obj)
+        get_loader(db, self.model).prime(db_obj)
         return db_obj
 
+    async def create_many(self, db: AsyncSession, objs_in: list[dict]) -> int:
+        """批量创建记录
+
+        使用一条多行 INSERT 写入，语句数不随记录数增长。
+        不返回模型实例，也不会加入会话的 identity map，
+        需要实例时调用方自行查询
+
+        Args:
+            db: 数据库会话
+            objs_in: 创建数据列表，每条数据的字段需一致
+
+        Returns:
+            创建的记录数
+        """
+        if not objs_in:
+            return 0
+        await db.execute(insert(self.model).values(objs_in))
+        loader = get_loader(db, self.model)
+        for obj_in in objs_in:
+            loader.clear(obj_in.get("id"))
+        return len(objs_in)
+
     async def update(
         self, db: AsyncSession, db_obj: ModelType, obj_in: dict
     ) -> ModelType:
@@ -145,5 +296,13 @@ class BaseRepository(Generic[ModelType]):
         if db_obj:
             await db.delete(db_obj)
             await db.flush()
+            get_loader(db, self.model).clear(id)
             return True
         return False
+
+    def _apply_filters(self, query, filters: dict[str, Any]):
+        """应用等值过滤条件"""
+        for key, value in filters.items():
+            if hasattr(self.model, key):
+                query = query.filter(getattr(self.model, key) == value)
+        return query
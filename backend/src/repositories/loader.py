@@ -0,0 +1,148 @@
+"""
+请求级实体加载器
+
+同一个请求（即同一个数据库会话）内按主键读取实体时:
+1. 同一轮事件循环中并发发起的 get(id) 合并为一条 WHERE id IN (...) 查询
+2. 查询结果在会话内缓存，重复读取同一实体不再访问数据库；不存在的 ID 不缓存
+
+查询由第一个等待方在自己的协程中执行，不另起任务；同一会话的各个加载器共用
+session.info 中的一把锁，不同模型的查询依次执行，不会在同一会话上并发操作。
+会话上的其他语句不受这把锁保护，仍不能与 get 并发执行。
+
+加载器保存在 session.info 中，随会话释放。事务提交或回滚后清空缓存，
+对象被移出会话（expunge/delete）后也不再复用。
+"""
+import asyncio
+from typing import Any, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# session.info 中保存加载器和查询锁的键
+LOADERS_KEY = "entity_loaders"
+LOCK_KEY = "entity_loader_lock"
+
+
+class EntityLoader:
+    """按主键批量加载并缓存实体"""
+
+    def __init__(self, db: AsyncSession, model: type, lock: asyncio.Lock):
+        """初始化
+
+        Args:
+            db: 数据库会话
+            model: 模型类，主键字段需为 id
+            lock: 会话内各加载器共用的查询锁
+        """
+        self.db = db
+        self.model = model
+        self.lock = lock
+        self._cache: dict[str, Any] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+    async def load(self, id: str) -> Optional[Any]:
+        """加载单个实体
+
+        Args:
+            id: 主键
+
+        Returns:
+            模型实例或 None
+        """
+        obj = self._cache.get(id)
+        if obj is not None:
+            if obj in self.db:
+                return obj
+            del self._cache[id]
+
+        future = self._pending.get(id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[id] = future
+        # 让出一轮事件循环，收集同时发起的其他 load 后由第一个等待方统一查询
+        await asyncio.sleep(0)
+        async with self.lock:
+            if not future.done():
+                await self._dispatch()
+        return future.result()
+
+    async def load_many(self, ids: list[str]) -> list[Optional[Any]]:
+        """加载多个实体
+
+        Args:
+            ids: 主键列表
+
+        Returns:
+            与 ids 顺序一致的模型实例列表，不存在的位置为 None
+        """
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def prime(self, obj: Any) -> None:
+        """写入缓存（新建实体后调用，之后按 ID 读取不再查询）"""
+        self._cache[obj.id] = obj
+
+    def clear(self, id: Optional[str] = None) -> None:
+        """清除缓存
+
+        Args:
+            id: 主键，为空时清除全部
+        """
+        if id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id, None)
+
+    async def _dispatch(self) -> None:
+        """查询当前收集到的全部 ID（持有查询锁时调用）"""
+        pending, self._pending = self._pending, {}
+        try:
+            result = await self.db.execute(
+                select(self.model).where(self.model.id.in_(list(pending)))
+            )
+            found = {obj.id: obj for obj in result.scalars().all()}
+        except asyncio.CancelledError:
+            # 执行查询的协程被取消，放回待查询列表，由其他等待方重新查询
+            self._pending.update(pending)
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for id, future in pending.items():
+            obj = found.get(id)
+            # 不缓存不存在的 ID：之后由其他会话或原生 INSERT 写入的记录仍能读到
+            if obj is not None:
+                self._cache[id] = obj
+            if not future.done():
+                future.set_result(obj)
+
+
+def _clear_loaders(session, *args) -> None:
+    for loader in session.info.get(LOADERS_KEY, {}).values():
+        loader.clear()
+
+
+def get_loader(db: AsyncSession, model: type) -> EntityLoader:
+    """获取会话内指定模型的加载器，不存在时创建
+
+    Args:
+        db: 数据库会话
+        model: 模型类
+
+    Returns:
+        加载器
+    """
+    loaders = db.info.get(LOADERS_KEY)
+    if loaders is None:
+        loaders = db.info[LOADERS_KEY] = {}
+        sync_session = db.sync_session
+        event.listen(sync_session, "after_commit", _clear_loaders)
+        event.listen(sync_session, "after_rollback", _clear_loaders)
+
+    loader = loaders.get(model)
+    if loader is None:
+        lock = db.info.setdefault(LOCK_KEY, asyncio.Lock())
+        loader = loaders[model] = EntityLoader(db, model, lock)
+    return loader
@@ -11,6 +11,8 @@ from .order_service import OrderService
 from .payment_service import PaymentService
 from .member_card_service import MemberCardService
 from .banner_service import BannerService
+from .upload_service import UploadService
+from .dashboard_service import DashboardService
 
 __all__ = [
     "AdminService",
@@ -23,4 +25,6 @@ __all__ = [
     "PaymentService",
     "MemberCardService",
     "BannerService",
+    "UploadService",
+    "DashboardService",
 ]
@@ -11,7 +11,7 @@ from src.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.models.domain import Admin
 from src.models.schemas import AdminLogin, AdminTokenResponse, AdminResponse
 from src.repositories.base import BaseRepository
-from src.utils import hash_password, verify_password
+from src.utils import verify_password_async
 
 
 class AdminService:
@@ -45,7 +45,7 @@ class AdminService:
             raise AppException(ErrorCode.INVALID_CREDENTIALS)
 
         # 验证密码
-        if not verify_password(credentials.password, admin.password_hash):
+        if not await verify_password_async(credentials.password, admin.password_hash):
             raise AppException(ErrorCode.INVALID_CREDENTIALS)
 
         # 检查状态
@@ -1,11 +1,27 @@
 """
 AI 描述生成服务
+
+生成结果按 (模型, 提示词, 温度) 的哈希持久化缓存在 ai_description_cache 表，
+相同输入直接返回缓存结果，不再调用模型接口。
 """
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
 import httpx
-from typing import Dict, Any, Tuple
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from src.core.config import settings
+from src.core.database import async_session_maker
+from src.core.http_client import http_clients
 from src.core.logging import logger
+from src.models.domain import AIDescriptionCacheEntry
+
+# 生成参数
+TEMPERATURE = 0.7
+MAX_TOKENS = 500
 
 
 # 系统提示词
@@ -131,6 +147,144 @@ class GenerationError(AIDescriptionError):
         self.status_code = 500
 
 
+class DescriptionCache:
+    """AI 描述结果缓存
+
+    - TTL: 超过 ttl 未使用的条目视为失效，读取时即不再命中
+    - LRU: 条目数超过 max_entries 时淘汰最久未使用的条目
+
+    写入只做一次 upsert；过期和超量条目由定时任务调用 evict 统一清理，
+    两次清理之间条目数可能短暂超过 max_entries
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        """初始化
+
+        Args:
+            ttl: 有效期（秒）
+            max_entries: 最大条目数
+        """
+        self.ttl = timedelta(seconds=ttl)
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float) -> str:
+        """计算缓存键
+
+        Args:
+            model: 模型
+            prompt: 完整提示词（含系统提示词）
+            temperature: 温度
+
+        Returns:
+            SHA-256 十六进制摘要
+        """
+        payload = json.dumps([model, prompt, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (description, 生成时消耗的 tokens)，未命中返回 None
+        """
+        now = datetime.now()
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(
+                    AIDescriptionCacheEntry.description,
+                    AIDescriptionCacheEntry.tokens_used,
+                ).where(
+                    AIDescriptionCacheEntry.cache_key == key,
+                    AIDescriptionCacheEntry.last_used_at > now - self.ttl,
+                )
+            )
+            row = result.first()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            await session.execute(
+                update(AIDescriptionCacheEntry)
+                .where(AIDescriptionCacheEntry.cache_key == key)
+                .values(
+                    last_used_at=now,
+                    hit_count=AIDescriptionCacheEntry.hit_count + 1,
+                )
+            )
+            await session.commit()
+
+        self.stats["hits"] += 1
+        self.stats["tokens_saved"] += row.tokens_used
+        return row.description, row.tokens_used
+
+    async def set(self, key: str, model: str, description: str, tokens_used: int) -> None:
+        """写入缓存
+
+        Args:
+            key: 缓存键
+            model: 模型
+            description: 生成的描述
+            tokens_used: 消耗的 tokens
+        """
+        now = datetime.now()
+        stmt = mysql_insert(AIDescriptionCacheEntry).values(
+            cache_key=key,
+            model=model,
+            description=description,
+            tokens_used=tokens_used,
+            hit_count=0,
+            created_at=now,
+            last_used_at=now,
+        )
+        stmt = stmt.on_duplicate_key_update(
+            description=description,
+            tokens_used=tokens_used,
+            created_at=now,
+            last_used_at=now,
+        )
+        async with async_session_maker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def evict(self) -> int:
+        """删除过期条目，并在条目数超过上限时淘汰最久未使用的条目
+
+        Returns:
+            删除的条目数
+        """
+        now = datetime.now()
+        async with async_session_maker() as session:
+            result = await session.execute(
+                delete(AIDescriptionCacheEntry).where(
+                    AIDescriptionCacheEntry.last_used_at <= now - self.ttl
+                )
+            )
+            evicted = result.rowcount or 0
+            count = await session.scalar(
+                select(func.count()).select_from(AIDescriptionCacheEntry)
+            )
+            overflow = (count or 0) - self.max_entries
+            if overflow > 0:
+                keys = await session.scalars(
+                    select(AIDescriptionCacheEntry.cache_key)
+                    .order_by(AIDescriptionCacheEntry.last_used_at)
+                    .limit(overflow)
+                )
+                result = await session.execute(
+                    delete(AIDescriptionCacheEntry).where(
+                        AIDescriptionCacheEntry.cache_key.in_(keys.all())
+                    )
+                )
+                evicted += result.rowcount or 0
+            await session.commit()
+        return evicted
+
+
 class AIDescriptionService:
     """AI描述生成服务"""
 
@@ -139,13 +293,18 @@ class AIDescriptionService:
         self.base_url = settings.siliconflow_base_url
         self.model = settings.siliconflow_model
         self.timeout = settings.siliconflow_timeout
+        self.cache = DescriptionCache(
+            ttl=settings.ai_description_cache_ttl,
+            max_entries=settings.ai_description_cache_max_entries,
+        )
 
     async def generate_description(
         self,
         style: str,
         context_type: str,
-        context_data: Dict[str, Any]
-    ) -> Tuple[str, int]:
+        context_data: Dict[str, Any],
+        regenerate: bool = False,
+    ) -> Tuple[str, int, bool]:
         """
         生成图片描述
 
@@ -153,9 +312,10 @@ class AIDescriptionService:
             style: 风格代码
             context_type: 上下文类型 (banner/course)
             context_data: 上下文数据
+            regenerate: 是否忽略缓存重新生成
 
         Returns:
-            (description, tokens_used)
+            (description, tokens_used, cached)，命中缓存时 tokens_used 为 0
 
         Raises:
             APIKeyMissingError: API Key未配置
@@ -176,57 +336,69 @@ class AIDescriptionService:
             prompt_length=len(prompt)
         )
 
+        # 查询缓存
+        cache_key = self.cache.make_key(
+            self.model, f"{SYSTEM_PROMPT}\n{prompt}", TEMPERATURE
+        )
+        if not regenerate:
+            try:
+                cached = await self.cache.get(cache_key)
+            except Exception as e:
+                logger.warning("ai_description_cache_read_error", error=str(e))
+                cached = None
+            if cached is not None:
+                logger.info("ai_description_cache_hit", tokens_saved=cached[1])
+                return cached[0], 0, True
+
         # 调用API
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": SYSTEM_PROMPT
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 500,
-                    }
+            client = http_clients.get("siliconflow")
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "temperature": TEMPERATURE,
+                    "max_tokens": MAX_TOKENS,
+                }
+            )
+
+            if response.status_code == 401:
+                logger.error("ai_description_api_key_invalid")
+                raise APIKeyInvalidError()
+            elif response.status_code == 429:
+                logger.error("ai_description_quota_exceeded")
+                raise QuotaExceededError()
+            elif response.status_code != 200:
+                logger.error(
+                    "ai_description_api_error",
+                    status_code=response.status_code,
+                    response=response.text
                 )
+                raise GenerationError(f"API error: {response.status_code}")
 
-                if response.status_code == 401:
-                    logger.error("ai_description_api_key_invalid")
-                    raise APIKeyInvalidError()
-                elif response.status_code == 429:
-                    logger.error("ai_description_quota_exceeded")
-                    raise QuotaExceededError()
-                elif response.status_code != 200:
-                    logger.error(
-                        "ai_description_api_error",
-                        status_code=response.status_code,
-                        response=response.text
-                    )
-                    raise GenerationError(f"API error: {response.status_code}")
+            result = response.json()
+            description = result['choices'][0]['message']['content'].strip()
+            tokens_used = result['usage']['total_tokens']
 
-                result = response.json()
-                description = result['choices'][0]['message']['content'].strip()
-                tokens_used = result['usage']['total_tokens']
-
-                logger.info(
-                    "ai_description_generate_success",
-                    tokens_used=tokens_used,
-                    description_length=len(description)
-                )
-
-                return description, tokens_used
+            logger.info(
+                "ai_description_generate_success",
+                tokens_used=tokens_used,
+                description_length=len(description)
+            )
 
         except httpx.TimeoutException:
             logger.error("ai_description_timeout")
@@ -235,6 +407,12 @@ class AIDescriptionService:
             logger.error("ai_description_request_error", error=str(e))
             raise GenerationError(f"Request error: {str(e)}")
 
+        try:
+            await self.cache.set(cache_key, self.model, description, tokens_used)
+        except Exception as e:
+            logger.warning("ai_description_cache_write_error", error=str(e))
+        return description, tokens_used, False
+
     def _build_prompt(
         self,
         style: str,
@@ -347,3 +525,10 @@ class AIDescriptionService:
 
 # 服务实例
 ai_description_service = AIDescriptionService()
+
+
+async def evict_description_cache() -> None:
+    """清理过期和超量的描述缓存（定时任务入口）"""
+    evicted = await ai_description_service.cache.evict()
+    if evicted:
+        logger.info(f"清理 AI 描述缓存 {evicted} 条")
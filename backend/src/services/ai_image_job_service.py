@@ -0,0 +1,396 @@
+"""
+AI 图片生成任务服务
+
+图片生成耗时数十秒，改为后台任务执行:
+1. 提交任务后立即返回任务 ID，任务状态持久化在 ai_image_jobs 表
+2. 固定数量的 worker 协程消费队列，限制对火山引擎的并发
+3. 失败按指数退避重试，超过最大次数标记为 failed
+4. 调用方通过轮询或 SSE 等待任务完成
+
+多个 uvicorn worker 各自维护队列，执行前用条件 UPDATE 认领任务，同一任务只会执行一次。
+停止服务时本进程执行中的任务放回待执行；进程异常退出留下的任务由各进程定期恢复。
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import event, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import async_session_maker
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.models.domain import AIImageJob
+from src.services.ai_image_service import AIImageService, ai_image_service
+from src.utils import generate_id
+
+# 任务终态
+FINAL_STATUSES = {"succeeded", "failed"}
+
+
+class AIImageJobService:
+    """AI 图片生成任务服务"""
+
+    def __init__(
+        self,
+        image_service: AIImageService,
+        concurrency: int = 2,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+        stale_timeout: int = 600,
+        recover_interval: float = 60,
+    ):
+        """初始化
+
+        Args:
+            image_service: 图片生成服务（测试时可传入使用模拟 Ark 客户端的实例）
+            concurrency: worker 数量，即同时生成的图片数
+            max_attempts: 最大尝试次数
+            retry_backoff: 重试退避基数（秒），第 n 次重试等待 backoff * 2^(n-1)
+            stale_timeout: 执行中任务超过该秒数未完成、待执行任务超过该秒数仍未执行，
+                视为所在进程已退出，重新入队
+            recover_interval: 定期恢复中断任务的间隔（秒）
+        """
+        self.image_service = image_service
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.stale_timeout = timedelta(seconds=stale_timeout)
+        self.recover_interval = recover_interval
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        # 本进程认领后尚未结束的任务
+        self._running: set[str] = set()
+        # 任务状态变化通知，等待方被唤醒后重新查询
+        self._events: dict[str, asyncio.Event] = {}
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        prompt: str,
+        size: str = "2K",
+        watermark: bool = False,
+        admin_id: Optional[str] = None,
+    ) -> AIImageJob:
+        """提交图片生成任务
+
+        任务在事务提交后入队
+
+        Args:
+            db: 数据库会话
+            prompt: 图片描述提示词
+            size: 图片尺寸
+            watermark: 是否添加水印
+            admin_id: 提交的管理员 ID
+
+        Returns:
+            任务
+        """
+        self.image_service.validate_prompt(prompt)
+        # 未配置 API Key 时直接报错，不进入队列
+        self.image_service.ensure_configured()
+
+        job = AIImageJob(
+            id=generate_id(),
+            admin_id=admin_id,
+            prompt=prompt,
+            size=size,
+            watermark=watermark,
+            status="pending",
+            attempts=0,
+        )
+        db.add(job)
+        await db.flush()
+
+        job_id = job.id
+        # 提交后入队；任务随回滚被撤销时不再入队，避免会话之后的提交带出不存在的任务
+        enqueue = True
+
+        def _after_commit(session) -> None:
+            nonlocal enqueue
+            if enqueue:
+                enqueue = False
+                self._queue.put_nowait(job_id)
+
+        def _after_soft_rollback(session, previous_transaction) -> None:
+            nonlocal enqueue
+            if job not in session:
+                enqueue = False
+
+        event.listen(db.sync_session, "after_commit", _after_commit, once=True)
+        event.listen(db.sync_session, "after_soft_rollback", _after_soft_rollback)
+        return job
+
+    async def get_job(self, db: AsyncSession, job_id: str) -> AIImageJob:
+        """获取任务
+
+        Args:
+            db: 数据库会话
+            job_id: 任务 ID
+
+        Returns:
+            任务
+        """
+        job = await db.get(AIImageJob, job_id)
+        if not job:
+            raise AppException(ErrorCode.NOT_FOUND, "任务不存在")
+        return job
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[AIImageJob]:
+        """等待任务状态变化
+
+        本进程执行的任务通过事件唤醒，其他进程执行的任务按 poll_interval 轮询
+
+        Args:
+            job_id: 任务 ID
+            timeout: 最长等待秒数
+
+        Returns:
+            等待结束时的任务，不存在返回 None
+        """
+        waiter = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        async with async_session_maker() as db:
+            job = await db.get(AIImageJob, job_id)
+        if job is None or job.status in FINAL_STATUSES:
+            self._events.pop(job_id, None)
+        return job
+
+    async def wait_until_done(self, job_id: str, timeout: float) -> Optional[AIImageJob]:
+        """等待任务进入终态
+
+        Args:
+            job_id: 任务 ID
+            timeout: 最长等待秒数
+
+        Returns:
+            任务（超时时可能仍未完成），不存在返回 None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            interval = min(settings.ai_image_poll_interval, max(remaining, 0))
+            job = await self.wait(job_id, interval)
+            if job is None or job.status in FINAL_STATUSES or remaining <= 0:
+                return job
+
+    async def start(self) -> None:
+        """启动 worker 并恢复未完成的任务"""
+        if self._workers:
+            return
+        for i in range(self.concurrency):
+            self._workers.append(
+                asyncio.create_task(self._worker(), name=f"ai_image_job_{i}")
+            )
+        self._workers.append(
+            asyncio.create_task(self._recover_loop(), name="ai_image_job_recover")
+        )
+        try:
+            await self._recover()
+        except Exception:
+            logger.exception("恢复 AI 图片生成任务失败")
+
+    async def stop(self) -> None:
+        """停止 worker，本进程执行中的任务放回待执行
+
+        放回的任务不计入尝试次数，由下次启动或其他进程的定期恢复继续执行
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        if not self._running:
+            return
+        job_ids = list(self._running)
+        self._running.clear()
+        try:
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(AIImageJob)
+                    .where(AIImageJob.id.in_(job_ids), AIImageJob.status == "running")
+                    .values(
+                        status="pending",
+                        attempts=AIImageJob.attempts - 1,
+                        next_run_at=None,
+                        updated_at=datetime.now(),
+                    )
+                )
+                await db.commit()
+            logger.info(f"停止时放回 {len(job_ids)} 个执行中的 AI 图片生成任务")
+        except Exception:
+            logger.exception("放回执行中的 AI 图片生成任务失败")
+
+    async def _recover_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.recover_interval)
+            try:
+                await self._recover(overdue_only=True)
+            except Exception:
+                logger.exception("恢复 AI 图片生成任务失败")
+
+    async def _recover(self, overdue_only: bool = False) -> None:
+        """重新入队待执行和中断的任务
+
+        执行中超过 stale_timeout 的任务（本进程正在执行的除外）先放回待执行
+
+        Args:
+            overdue_only: 只入队超过 stale_timeout 仍未执行的待执行任务（定期恢复，
+                这些任务所在的进程已经退出）；为 False 时入队全部待执行任务（启动时）
+        """
+        now = datetime.now()
+        stale_before = now - self.stale_timeout
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(AIImageJob.id)
+                .where(
+                    AIImageJob.status == "running",
+                    AIImageJob.started_at < stale_before,
+                )
+                .with_for_update()
+            )
+            stale_ids = [job_id for job_id in result.scalars() if job_id not in self._running]
+            if stale_ids:
+                await db.execute(
+                    update(AIImageJob)
+                    .where(AIImageJob.id.in_(stale_ids))
+                    .values(status="pending", next_run_at=None, updated_at=now)
+                )
+            await db.commit()
+
+            stmt = select(AIImageJob.id, AIImageJob.next_run_at).where(
+                AIImageJob.status == "pending"
+            )
+            if overdue_only:
+                stmt = stmt.where(
+                    or_(
+                        AIImageJob.id.in_(stale_ids),
+                        func.coalesce(AIImageJob.next_run_at, AIImageJob.updated_at)
+                        < stale_before,
+                    )
+                )
+            result = await db.execute(stmt.order_by(AIImageJob.created_at))
+            rows = result.all()
+
+        for job_id, next_run_at in rows:
+            delay = (next_run_at - now).total_seconds() if next_run_at else 0
+            self._schedule(job_id, delay)
+        if rows:
+            logger.info(f"恢复 {len(rows)} 个 AI 图片生成任务")
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"AI 图片生成任务 {job_id} 执行异常")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        # 认领任务
+        now = datetime.now()
+        async with async_session_maker() as db:
+            result = await db.execute(
+                update(AIImageJob)
+                .where(AIImageJob.id == job_id, AIImageJob.status == "pending")
+                .values(
+                    status="running",
+                    attempts=AIImageJob.attempts + 1,
+                    next_run_at=None,
+                    started_at=now,
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                return
+            job = await db.get(AIImageJob, job_id)
+        self._notify(job_id)
+
+        self._running.add(job_id)
+        try:
+            await self._execute(job)
+        except asyncio.CancelledError:
+            # 停止服务时被取消，保留记录由 stop 把任务放回待执行
+            raise
+        except Exception:
+            self._running.discard(job_id)
+            raise
+        self._running.discard(job_id)
+
+    async def _execute(self, job: AIImageJob) -> None:
+        job_id = job.id
+        values: dict = {"updated_at": datetime.now()}
+        try:
+            result = await self.image_service.generate_image(
+                prompt=job.prompt, size=job.size, watermark=job.watermark
+            )
+        except Exception as e:
+            message = getattr(e, "message", None) or str(e)
+            retryable = (
+                getattr(e, "code", None) != ErrorCode.BAD_REQUEST
+                and job.attempts < self.max_attempts
+            )
+            values["error"] = message[:512]
+            if retryable:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                values.update(
+                    status="pending", next_run_at=datetime.now() + timedelta(seconds=delay)
+                )
+                logger.warning(
+                    f"AI 图片生成任务 {job_id} 第 {job.attempts} 次失败，{delay:.0f}s 后重试: {message}"
+                )
+            else:
+                values.update(status="failed", finished_at=datetime.now())
+                logger.error(f"AI 图片生成任务 {job_id} 失败: {message}")
+        else:
+            delay = None
+            values.update(
+                status="succeeded",
+                url=result["url"],
+                original_url=result["original_url"],
+                model=result["model"],
+                error=None,
+                finished_at=datetime.now(),
+            )
+
+        async with async_session_maker() as db:
+            await db.execute(
+                update(AIImageJob).where(AIImageJob.id == job_id).values(**values)
+            )
+            await db.commit()
+        self._notify(job_id)
+
+        if values["status"] == "pending":
+            self._schedule(job_id, delay)
+
+    def _schedule(self, job_id: str, delay: float) -> None:
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job_id)
+        else:
+            self._queue.put_nowait(job_id)
+
+    def _notify(self, job_id: str) -> None:
+        waiter = self._events.pop(job_id, None)
+        if waiter is not None:
+            waiter.set()
+
+
+# 服务单例
+ai_image_job_service = AIImageJobService(
+    image_service=ai_image_service,
+    concurrency=settings.ai_image_concurrency,
+    max_attempts=settings.ai_image_max_attempts,
+    retry_backoff=settings.ai_image_retry_backoff,
+)
@@ -5,7 +5,7 @@ AI 图片生成服务
 import os
 import uuid
 import asyncio
-import httpx
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -15,34 +15,72 @@ from volcenginesdkarkruntime import Ark
 
 from src.core.config import settings
 from src.core.exceptions import AppException
+from src.core.http_client import http_clients
 from src.core.errors import ErrorCode
 
 
 class AIImageService:
     """AI 图片生成服务"""
 
-    def __init__(self):
-        """初始化服务"""
+    def __init__(self, client: Optional[Ark] = None):
+        """初始化服务
+
+        Args:
+            client: Ark 客户端，为空时按配置懒加载（测试时可传入模拟客户端）
+        """
         self.api_key = settings.volcano_api_key
         self.base_url = settings.volcano_base_url
         self.model_id = settings.volcano_model_id
-        self._client: Optional[Ark] = None
+        self._client: Optional[Ark] = client
+        # Ark SDK 为同步调用，使用专用线程池并限制对火山引擎的并发
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.ai_image_concurrency, thread_name_prefix="ark"
+        )
+
+    def ensure_configured(self) -> None:
+        """检查是否可以调用火山引擎
+
+        Raises:
+            AppException: 未传入客户端且未配置 API Key
+        """
+        if self._client is None and not self.api_key:
+            raise AppException(
+                code=ErrorCode.INTERNAL_ERROR,
+                message="未配置火山引擎 API Key，请设置环境变量 VOLCANO_API_KEY",
+            )
 
     @property
     def client(self) -> Ark:
         """获取 Ark 客户端（懒加载）"""
         if self._client is None:
-            if not self.api_key:
-                raise AppException(
-                    code=ErrorCode.INTERNAL_ERROR,
-                    message="未配置火山引擎 API Key，请设置环境变量 VOLCANO_API_KEY",
-                )
+            self.ensure_configured()
             self._client = Ark(
                 base_url=self.base_url,
                 api_key=self.api_key,
             )
         return self._client
 
+    def validate_prompt(self, prompt: str) -> None:
+        """校验提示词
+
+        Args:
+            prompt: 图片描述提示词
+
+        Raises:
+            AppException: 提示词为空或过长
+        """
+        if not prompt or not prompt.strip():
+            raise AppException(
+                code=ErrorCode.BAD_REQUEST,
+                message="图片描述不能为空",
+            )
+
+        if len(prompt) > 300:
+            raise AppException(
+                code=ErrorCode.BAD_REQUEST,
+                message="图片描述不能超过300字",
+            )
+
     async def generate_image(
         self,
         prompt: str,
@@ -60,25 +98,15 @@ class AIImageService:
         Returns:
             包含图片 URL 的字典
         """
-        if not prompt or not prompt.strip():
-            raise AppException(
-                code=ErrorCode.BAD_REQUEST,
-                message="图片描述不能为空",
-            )
-
-        if len(prompt) > 300:
-            raise AppException(
-                code=ErrorCode.BAD_REQUEST,
-                message="图片描述不能超过300字",
-            )
+        self.validate_prompt(prompt)
 
         logger.info(f"开始生成图片，提示词: {prompt[:50]}...")
 
         try:
-            # 在线程池中执行同步调用
-            loop = asyncio.get_event_loop()
+            # 在专用线程池中执行同步调用
+            loop = asyncio.get_running_loop()
             response = await loop.run_in_executor(
-                None,
+                self._executor,
                 lambda: self.client.images.generate(
                     model=self.model_id,
                     prompt=prompt,
@@ -128,10 +156,10 @@ class AIImageService:
         """
         try:
             # 下载图片
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(image_url)
-                response.raise_for_status()
-                image_data = response.content
+            client = http_clients.get("image_download")
+            response = await client.get(image_url)
+            response.raise_for_status()
+            image_data = response.content
 
             # 生成文件名
             date_path = datetime.now().strftime("%Y%m%d")
@@ -159,5 +187,10 @@ class AIImageService:
             )
 
 
+    def shutdown(self) -> None:
+        """关闭 Ark 调用线程池"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 # 创建服务单例
 ai_image_service = AIImageService()
@@ -3,13 +3,17 @@
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import catalog_cache
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
 from src.models.domain import Banner
-from src.models.schemas import BannerCreate, BannerUpdate, BannerResponse
+from src.models.schemas import BannerCreate, BannerUpdate, BannerResponse, ResponseSchema
 from src.repositories.base import BaseRepository
 from src.utils.id_generator import generate_id
 
+# 轮播图缓存命名空间
+BANNER_CACHE_NAMESPACE = "banners"
+
 
 class BannerService:
     """轮播图服务"""
@@ -30,6 +34,7 @@ class BannerService:
             },
         )
         await db.refresh(banner)
+        await catalog_cache.invalidate(db, BANNER_CACHE_NAMESPACE)
         return BannerResponse.model_validate(banner)
 
     async def update_banner(
@@ -44,6 +49,7 @@ class BannerService:
             )
         await self.repo.update(db, banner, data.model_dump(exclude_unset=True))
         await db.refresh(banner)
+        await catalog_cache.invalidate(db, BANNER_CACHE_NAMESPACE)
         return BannerResponse.model_validate(banner)
 
     async def get_banner(self, db: AsyncSession, banner_id: str) -> BannerResponse:
@@ -62,10 +68,19 @@ class BannerService:
         if active_only:
             filters["status"] = 1
 
-        banners = await self.repo.get_multi(db, skip=0, limit=100, **filters)
-        # 按排序字段排序
-        sorted_banners = sorted(banners, key=lambda x: x.sort_order)
-        return [BannerResponse.model_validate(b) for b in sorted_banners]
+        banners = await self.repo.get_multi(
+            db, skip=0, limit=100, order_by="sort_order", **filters
+        )
+        return [BannerResponse.model_validate(b) for b in banners]
+
+    async def list_banners_json(self, db: AsyncSession) -> bytes:
+        """获取启用的轮播图列表（序列化后的响应，带缓存）"""
+
+        async def load() -> bytes:
+            banners = await self.list_banners(db, active_only=True)
+            return ResponseSchema[list[BannerResponse]](data=banners).model_dump_json().encode("utf-8")
+
+        return await catalog_cache.get_or_set(BANNER_CACHE_NAMESPACE, "active", load)
 
     async def delete_banner(self, db: AsyncSession, banner_id: str) -> bool:
         """删除轮播图"""
@@ -75,4 +90,6 @@ class BannerService:
                 code=ErrorCode.BANNER_NOT_FOUND,
                 message="轮播图不存在",
             )
-        return await self.repo.delete(db, banner_id)
+        success = await self.repo.delete(db, banner_id)
+        await catalog_cache.invalidate(db, BANNER_CACHE_NAMESPACE)
+        return success
@@ -2,6 +2,7 @@
 小区服务
 """
 from decimal import Decimal
+from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.errors import ErrorCode
@@ -15,7 +16,7 @@ from src.models.schemas import (
     PaginatedResponseSchema,
 )
 from src.repositories.base import BaseRepository
-from src.utils import generate_id, haversine_distance
+from src.utils import generate_id, bounding_box, haversine_distances
 
 
 class CommunityService:
@@ -95,7 +96,7 @@ class CommunityService:
         Returns:
             分页结果
         """
-        from sqlalchemy import select, func
+        from sqlalchemy import func
 
         skip = (page - 1) * page_size
 
@@ -136,26 +137,44 @@ class CommunityService:
         Returns:
             小区列表（包含距离）
         """
-        # 获取所有小区
-        communities = await self.repo.get_multi(db, limit=1000, status=1)
-
-        # 计算距离并过滤
-        result = []
-        for community in communities:
-            distance = haversine_distance(
-                query.latitude,
-                query.longitude,
-                community.latitude,
-                community.longitude,
+        # 按外接矩形预过滤，命中 idx_location (latitude, longitude) 索引
+        min_lat, max_lat, min_lon, max_lon = bounding_box(
+            query.latitude, query.longitude, query.radius
+        )
+        stmt = select(Community).where(
+            Community.status == 1,
+            Community.latitude.between(min_lat, max_lat),
+        )
+        if min_lon <= max_lon:
+            stmt = stmt.where(Community.longitude.between(min_lon, max_lon))
+        else:
+            # 跨越 ±180 经线
+            stmt = stmt.where(
+                or_(Community.longitude >= min_lon, Community.longitude <= max_lon)
             )
+        result = await db.execute(stmt)
+        communities = result.scalars().all()
 
-            if distance <= query.radius:
-                community_resp = CommunityResponse.model_validate(community)
-                community_resp.distance = distance
-                result.append(community_resp)
+        # 对候选集一次性计算精确距离并过滤
+        distances = haversine_distances(
+            query.latitude,
+            query.longitude,
+            [(c.latitude, c.longitude) for c in communities],
+        )
+        nearby = sorted(
+            (
+                (distance, community)
+                for distance, community in zip(distances, communities)
+                if distance <= query.radius
+            ),
+            key=lambda x: x[0],
+        )
 
-        # 按距离排序
-        result.sort(key=lambda x: x.distance if x.distance else 0)
+        result = []
+        for distance, community in nearby:
+            community_resp = CommunityResponse.model_validate(community)
+            community_resp.distance = distance
+            result.append(community_resp)
 
         return result
 
@@ -0,0 +1,337 @@
+"""
+仪表盘统计服务
+
+仪表盘不再每次请求扫描 users/orders/courses:
+1. 后台定时任务按天汇总新增用户、新增订单、支付订单和收入，写入 daily_order_stats
+   - 最近两天的数据每次重新汇总，覆盖跨天支付
+   - 最近两天内有更新（申请退款、退款完成等状态变更）的订单，重新汇总其支付日
+2. 统计总量由每日统计累加（加上课程表的计数）写入 dashboard_snapshots 快照，不扫描用户和订单表
+3. 每天第一次运行时从头重新汇总每日统计并用全表聚合计算快照，修正删除数据等造成的偏差
+4. 接口只读取快照和每日统计，按周统计由每日统计聚合
+"""
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import select, func, case, true, cast, Date
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import async_session_maker
+from src.models.domain import User, Order, Course, DashboardSnapshot, DailyOrderStats
+
+# 快照名称
+SNAPSHOT_NAME = "overall"
+
+# 每次定时任务重新汇总的天数（含今天）
+ROLLUP_DAYS = 2
+
+# 统计刷新运行统计
+dashboard_refresh_stats = {
+    "last_run_at": None,
+    "last_duration": 0.0,
+    "reconciled_on": None,
+}
+
+
+class DashboardService:
+    """仪表盘统计服务"""
+
+    async def compute_overview(self, db: AsyncSession) -> dict[str, Any]:
+        """实时计算统计总量（单条 SQL，扫描用户和订单表，用于每日对账和首次生成快照）
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            统计总量
+        """
+        is_paid = Order.status == "paid"
+        users = select(func.count().label("total_users")).select_from(User).subquery()
+        orders = select(
+            func.count().label("total_orders"),
+            func.coalesce(func.sum(case((is_paid, 1), else_=0)), 0).label("paid_orders"),
+            func.coalesce(
+                func.sum(case((is_paid, Order.pay_amount), else_=0)), 0
+            ).label("total_revenue"),
+        ).select_from(Order).subquery()
+        courses = select(
+            func.count().label("total_courses"),
+            func.coalesce(
+                func.sum(case((Course.status == "enrolling", 1), else_=0)), 0
+            ).label("enrolling_courses"),
+        ).select_from(Course).subquery()
+
+        stmt = select(users, orders, courses).select_from(
+            users.join(orders, true()).join(courses, true())
+        )
+        row = (await db.execute(stmt)).one()
+        return {
+            "total_users": int(row.total_users),
+            "total_orders": int(row.total_orders),
+            "paid_orders": int(row.paid_orders),
+            "total_revenue": Decimal(row.total_revenue),
+            "total_courses": int(row.total_courses),
+            "enrolling_courses": int(row.enrolling_courses),
+        }
+
+    async def compute_overview_from_daily(self, db: AsyncSession) -> dict[str, Any]:
+        """由每日统计累加用户和订单总量，课程数实时计算（课程表数据量小）
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            统计总量，与 compute_overview 相同
+        """
+        daily = select(
+            func.coalesce(func.sum(DailyOrderStats.new_users), 0).label("total_users"),
+            func.coalesce(func.sum(DailyOrderStats.new_orders), 0).label("total_orders"),
+            func.coalesce(func.sum(DailyOrderStats.paid_orders), 0).label("paid_orders"),
+            func.coalesce(func.sum(DailyOrderStats.revenue), 0).label("total_revenue"),
+        ).subquery()
+        courses = select(
+            func.count().label("total_courses"),
+            func.coalesce(
+                func.sum(case((Course.status == "enrolling", 1), else_=0)), 0
+            ).label("enrolling_courses"),
+        ).select_from(Course).subquery()
+
+        stmt = select(daily, courses).select_from(daily.join(courses, true()))
+        row = (await db.execute(stmt)).one()
+        return {
+            "total_users": int(row.total_users),
+            "total_orders": int(row.total_orders),
+            "paid_orders": int(row.paid_orders),
+            "total_revenue": Decimal(row.total_revenue),
+            "total_courses": int(row.total_courses),
+            "enrolling_courses": int(row.enrolling_courses),
+        }
+
+    async def refresh_snapshot(self, db: AsyncSession, full: bool = False) -> DashboardSnapshot:
+        """重新计算并保存统计快照
+
+        Args:
+            db: 数据库会话
+            full: 是否扫描业务表计算；否则由每日统计累加（每日统计需已汇总到今天）
+
+        Returns:
+            快照
+        """
+        if full:
+            values = await self.compute_overview(db)
+        else:
+            values = await self.compute_overview_from_daily(db)
+        values["refreshed_at"] = datetime.now()
+
+        stmt = mysql_insert(DashboardSnapshot).values(name=SNAPSHOT_NAME, **values)
+        stmt = stmt.on_duplicate_key_update(**values)
+        await db.execute(stmt)
+        return DashboardSnapshot(name=SNAPSHOT_NAME, **values)
+
+    async def get_overview(self, db: AsyncSession) -> DashboardSnapshot:
+        """获取统计快照，尚未生成时实时计算
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            快照
+        """
+        snapshot = await db.get(DashboardSnapshot, SNAPSHOT_NAME)
+        if snapshot is None:
+            snapshot = await self.refresh_snapshot(db, full=True)
+        return snapshot
+
+    async def rollup_daily(self, db: AsyncSession, start: date, end: date) -> int:
+        """汇总 [start, end] 每天的统计并写入 daily_order_stats
+
+        Args:
+            db: 数据库会话
+            start: 开始日期
+            end: 结束日期（含）
+
+        Returns:
+            写入的天数
+        """
+        if start > end:
+            return 0
+        begin = datetime.combine(start, datetime.min.time())
+        finish = datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+        days: dict[date, dict[str, Any]] = {}
+        for offset in range((end - start).days + 1):
+            days[start + timedelta(days=offset)] = {
+                "new_users": 0,
+                "new_orders": 0,
+                "paid_orders": 0,
+                "revenue": Decimal("0"),
+            }
+
+        user_day = cast(User.created_at, Date)
+        result = await db.execute(
+            select(user_day, func.count())
+            .where(User.created_at >= begin, User.created_at < finish)
+            .group_by(user_day)
+        )
+        for day, count in result.all():
+            days[day]["new_users"] = count
+
+        order_day = cast(Order.created_at, Date)
+        result = await db.execute(
+            select(order_day, func.count())
+            .where(Order.created_at >= begin, Order.created_at < finish)
+            .group_by(order_day)
+        )
+        for day, count in result.all():
+            days[day]["new_orders"] = count
+
+        # 支付统计按支付时间归属，与快照口径一致只统计 paid 状态
+        pay_day = cast(Order.pay_time, Date)
+        result = await db.execute(
+            select(pay_day, func.count(), func.coalesce(func.sum(Order.pay_amount), 0))
+            .where(
+                Order.pay_time >= begin,
+                Order.pay_time < finish,
+                Order.status == "paid",
+            )
+            .group_by(pay_day)
+        )
+        for day, count, revenue in result.all():
+            days[day]["paid_orders"] = count
+            days[day]["revenue"] = Decimal(revenue)
+
+        now = datetime.now()
+        rows = [
+            {"stat_date": day, **values, "updated_at": now}
+            for day, values in days.items()
+        ]
+        stmt = mysql_insert(DailyOrderStats).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            new_users=stmt.inserted.new_users,
+            new_orders=stmt.inserted.new_orders,
+            paid_orders=stmt.inserted.paid_orders,
+            revenue=stmt.inserted.revenue,
+            updated_at=stmt.inserted.updated_at,
+        )
+        await db.execute(stmt)
+        return len(rows)
+
+    async def get_series(
+        self, db: AsyncSession, period: str = "day", days: int = 30
+    ) -> list[dict[str, Any]]:
+        """获取最近 days 天的统计序列
+
+        Args:
+            db: 数据库会话
+            period: 统计周期 day/week
+            days: 天数
+
+        Returns:
+            按日期升序的统计列表，按周统计时 date 为该周第一天
+        """
+        start = date.today() - timedelta(days=days - 1)
+        if period == "week":
+            week = func.yearweek(DailyOrderStats.stat_date, 3)
+            stmt = (
+                select(
+                    func.min(DailyOrderStats.stat_date).label("stat_date"),
+                    func.sum(DailyOrderStats.new_users).label("new_users"),
+                    func.sum(DailyOrderStats.new_orders).label("new_orders"),
+                    func.sum(DailyOrderStats.paid_orders).label("paid_orders"),
+                    func.sum(DailyOrderStats.revenue).label("revenue"),
+                )
+                .where(DailyOrderStats.stat_date >= start)
+                .group_by(week)
+                .order_by(week)
+            )
+        else:
+            stmt = (
+                select(
+                    DailyOrderStats.stat_date,
+                    DailyOrderStats.new_users,
+                    DailyOrderStats.new_orders,
+                    DailyOrderStats.paid_orders,
+                    DailyOrderStats.revenue,
+                )
+                .where(DailyOrderStats.stat_date >= start)
+                .order_by(DailyOrderStats.stat_date)
+            )
+
+        result = await db.execute(stmt)
+        return [
+            {
+                "date": row.stat_date.isoformat(),
+                "new_users": int(row.new_users),
+                "new_orders": int(row.new_orders),
+                "paid_orders": int(row.paid_orders),
+                "revenue": float(row.revenue),
+            }
+            for row in result.all()
+        ]
+
+    async def changed_pay_days(
+        self, db: AsyncSession, since: datetime, before: date
+    ) -> list[date]:
+        """updated_at >= since 的已支付过的订单中，支付日早于 before 的日期
+
+        这些订单在支付日之后发生了状态变更（如退款），需要重新汇总支付日
+
+        Args:
+            db: 数据库会话
+            since: 订单更新时间下限
+            before: 支付日上限（不含），此后的日期已在常规汇总范围内
+
+        Returns:
+            升序的支付日列表
+        """
+        pay_day = cast(Order.pay_time, Date)
+        result = await db.execute(
+            select(pay_day)
+            .where(
+                Order.updated_at >= since,
+                Order.pay_time < datetime.combine(before, datetime.min.time()),
+            )
+            .group_by(pay_day)
+            .order_by(pay_day)
+        )
+        return list(result.scalars())
+
+    async def first_day(self, db: AsyncSession) -> Optional[date]:
+        """最早的用户或订单创建日期，没有数据时返回 None"""
+        first_user = await db.scalar(select(func.min(User.created_at)))
+        first_order = await db.scalar(select(func.min(Order.created_at)))
+        candidates = [d.date() for d in (first_user, first_order) if d is not None]
+        return min(candidates) if candidates else None
+
+
+async def refresh_dashboard_stats() -> None:
+    """刷新每日统计和统计快照（定时任务入口）"""
+    service = DashboardService()
+    start_time = time.perf_counter()
+    today = date.today()
+    recent_start = today - timedelta(days=ROLLUP_DAYS - 1)
+    reconcile = dashboard_refresh_stats["reconciled_on"] != today
+
+    async with async_session_maker() as db:
+        if reconcile:
+            # 每天一次：从头汇总每日统计，快照扫描业务表计算
+            start = min(await service.first_day(db) or today, recent_start)
+            logger.info(f"重新汇总全部每日统计: {start} ~ {today}")
+            await service.rollup_daily(db, start, today)
+        else:
+            await service.rollup_daily(db, recent_start, today)
+            since = datetime.combine(recent_start, datetime.min.time())
+            for day in await service.changed_pay_days(db, since, recent_start):
+                await service.rollup_daily(db, day, day)
+        await service.refresh_snapshot(db, full=reconcile)
+        await db.commit()
+
+    if reconcile:
+        dashboard_refresh_stats["reconciled_on"] = today
+    dashboard_refresh_stats.update(
+        last_run_at=datetime.now(),
+        last_duration=time.perf_counter() - start_time,
+    )
@@ -2,11 +2,14 @@
 会员卡服务
 """
 from datetime import datetime, timedelta
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
+from src.core.cache import catalog_cache
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
+from src.core.security import invalidate_principal
 from src.models.domain import MemberCard, UserMember, User
 from src.models.schemas import (
     MemberCardCreate,
@@ -14,10 +17,14 @@ from src.models.schemas import (
     MemberCardResponse,
     MemberPurchaseRequest,
     UserMemberResponse,
+    ResponseSchema,
 )
 from src.repositories.base import BaseRepository
 from src.utils.id_generator import generate_id
 
+# 权益卡缓存命名空间
+MEMBER_CARD_CACHE_NAMESPACE = "member_cards"
+
 
 class MemberCardService:
     """会员卡服务"""
@@ -47,6 +54,7 @@ class MemberCardService:
             },
         )
         await db.refresh(card)
+        await catalog_cache.invalidate(db, MEMBER_CARD_CACHE_NAMESPACE)
         return MemberCardResponse.model_validate(card)
 
     async def update_card(
@@ -64,6 +72,7 @@ class MemberCardService:
         update_data = data.model_dump(exclude_unset=True, exclude={"type", "duration_days", "description"})
         await self.repo.update(db, card, update_data)
         await db.refresh(card)
+        await catalog_cache.invalidate(db, MEMBER_CARD_CACHE_NAMESPACE)
         return MemberCardResponse.model_validate(card)
 
     async def get_card(self, db: AsyncSession, card_id: str) -> MemberCardResponse:
@@ -82,10 +91,19 @@ class MemberCardService:
         if active_only:
             filters["status"] = 1
 
-        cards = await self.repo.get_multi(db, skip=0, limit=100, **filters)
-        # 按排序字段排序
-        sorted_cards = sorted(cards, key=lambda x: x.sort_order)
-        return [MemberCardResponse.model_validate(c) for c in sorted_cards]
+        cards = await self.repo.get_multi(
+            db, skip=0, limit=100, order_by="sort_order", **filters
+        )
+        return [MemberCardResponse.model_validate(c) for c in cards]
+
+    async def list_cards_json(self, db: AsyncSession) -> bytes:
+        """获取上架的会员卡列表（序列化后的响应，带缓存）"""
+
+        async def load() -> bytes:
+            cards = await self.list_cards(db, active_only=True)
+            return ResponseSchema[list[MemberCardResponse]](data=cards).model_dump_json().encode("utf-8")
+
+        return await catalog_cache.get_or_set(MEMBER_CARD_CACHE_NAMESPACE, "active", load)
 
     async def purchase_card(
         self, db: AsyncSession, user_id: str, data: MemberPurchaseRequest
@@ -144,6 +162,7 @@ class MemberCardService:
                     "member_expire_at": expire_at,
                 },
             )
+            await invalidate_principal(db, "user", user_id)
 
         await db.refresh(user_member)
         return UserMemberResponse.model_validate(user_member)
@@ -176,19 +195,24 @@ class MemberCardService:
             }
 
     async def list_user_member_records(
-        self, db: AsyncSession, page: int, page_size: int
+        self,
+        db: AsyncSession,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
     ) -> dict:
         """获取会员购买记录(管理端)"""
         user_member_repo = BaseRepository[UserMember](UserMember)
         total = await user_member_repo.count(db)
-        records = await user_member_repo.get_multi(
-            db, skip=(page - 1) * page_size, limit=page_size
+        records, next_cursor = await user_member_repo.get_page(
+            db, page=page, page_size=page_size, cursor=cursor
         )
         return {
             "items": [UserMemberResponse.model_validate(r) for r in records],
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
 
     async def delete_card(self, db: AsyncSession, card_id: str) -> bool:
@@ -199,4 +223,6 @@ class MemberCardService:
                 code=ErrorCode.MEMBER_CARD_NOT_FOUND,
                 message="会员卡不存在",
             )
-        return await self.repo.delete(db, card_id)
+        success = await self.repo.delete(db, card_id)
+        await catalog_cache.invalidate(db, MEMBER_CARD_CACHE_NAMESPACE)
+        return success
@@ -0,0 +1,153 @@
+"""
+订单过期服务
+
+待支付订单超过 expire_at 后标记为 expired，删除其课程学员关联并释放占用的名额。
+后台定时任务按 (status, expire_at) 索引分批处理，每批一个事务。
+"""
+import time
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.core.config import settings
+from src.core.database import async_session_maker
+from src.models.domain import Order, CourseStudent
+from src.services.seat_service import SeatService
+
+# 过期清理运行统计
+order_expiry_stats = {
+    "last_run_at": None,
+    "last_duration": 0.0,
+    "last_expired": 0,
+    "total_expired": 0,
+    "backlog": 0,
+}
+
+
+class OrderExpiryService:
+    """订单过期服务"""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.seat_service = SeatService()
+
+    async def expire_orders(self, db: AsyncSession, orders: list[Order]) -> int:
+        """将订单标记为过期，删除课程学员关联并释放名额
+
+        先用 FOR UPDATE 锁定仍为 pending 的订单（MySQL 的 UPDATE 不支持 RETURNING），
+        只处理真正变为 expired 的订单；已被支付回调或其他清理抢先处理的订单保持不变，
+        不会删除已支付订单的课程学员，也不会重复释放名额。
+
+        Args:
+            db: 数据库会话
+            orders: 待过期的订单
+
+        Returns:
+            实际过期的订单数
+        """
+        if not orders:
+            return 0
+
+        result = await db.execute(
+            select(Order.id)
+            .where(Order.id.in_([o.id for o in orders]), Order.status == "pending")
+            .with_for_update()
+        )
+        order_ids = list(result.scalars().all())
+        if not order_ids:
+            return 0
+
+        await db.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids))
+            .values(status="expired", updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+
+        # 统计每门课程占用的名额
+        result = await db.execute(
+            select(CourseStudent.course_id, func.count())
+            .where(CourseStudent.order_id.in_(order_ids))
+            .group_by(CourseStudent.course_id)
+        )
+        seats = dict(result.all())
+
+        await db.execute(
+            delete(CourseStudent)
+            .where(CourseStudent.order_id.in_(order_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for course_id, count in seats.items():
+            await self.seat_service.release(db, course_id, count)
+
+        # 同步内存中的订单状态，不再产生额外的 UPDATE
+        expired_ids = set(order_ids)
+        for order in orders:
+            if order.id in expired_ids:
+                set_committed_value(order, "status", "expired")
+        return len(order_ids)
+
+    async def expire_batch(self, db: AsyncSession) -> int:
+        """处理一批已过期的待支付订单
+
+        使用 FOR UPDATE SKIP LOCKED 锁定本批订单，与支付回调等并发写互不阻塞
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            本批处理的订单数
+        """
+        stmt = (
+            select(Order)
+            .where(Order.status == "pending", Order.expire_at < datetime.now())
+            .order_by(Order.expire_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(stmt)
+        orders = list(result.scalars().all())
+        return await self.expire_orders(db, orders)
+
+    async def count_backlog(self, db: AsyncSession) -> int:
+        """统计已过期但尚未处理的待支付订单数"""
+        result = await db.execute(
+            select(func.count(Order.id)).where(
+                Order.status == "pending", Order.expire_at < datetime.now()
+            )
+        )
+        return result.scalar() or 0
+
+
+async def sweep_expired_orders() -> None:
+    """清理所有已过期的待支付订单（定时任务入口）"""
+    service = OrderExpiryService(batch_size=settings.order_expiry_batch_size)
+    start_time = time.perf_counter()
+
+    expired = 0
+    while True:
+        async with async_session_maker() as db:
+            count = await service.expire_batch(db)
+            await db.commit()
+        expired += count
+        if count < service.batch_size:
+            break
+
+    async with async_session_maker() as db:
+        backlog = await service.count_backlog(db)
+
+    duration = time.perf_counter() - start_time
+    order_expiry_stats.update(
+        last_run_at=datetime.now(),
+        last_duration=duration,
+        last_expired=expired,
+        total_expired=order_expiry_stats["total_expired"] + expired,
+        backlog=backlog,
+    )
+    if expired or backlog:
+        logger.info(
+            f"订单过期清理完成: 过期={expired} 积压={backlog} 耗时={duration:.3f}s"
+        )
@@ -3,22 +3,37 @@
 """
 from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
-from src.models.domain import Order, Course, CourseStudent, Student, User, Community, Teacher
+from src.models.domain import Order, Course, CourseStudent, Student, User
 from src.models.schemas import OrderCreate, OrderResponse, RefundRequest
 from src.repositories.base import BaseRepository
+from src.services.seat_service import SeatService
 from src.utils.id_generator import generate_id, generate_order_no
 
+# 上课日显示文本
+SCHEDULE_DAY_MAP = {"1": "周一", "2": "周二", "3": "周三", "4": "周四", "5": "周五", "6": "周六", "7": "周日"}
+
+
+def _format_schedule(course: Course) -> str:
+    """格式化上课时间，如 周六 09:00-10:30"""
+    day_text = SCHEDULE_DAY_MAP.get(str(course.schedule_day), f"周{course.schedule_day}")
+    start_time = course.schedule_start.strftime("%H:%M") if course.schedule_start else ""
+    end_time = course.schedule_end.strftime("%H:%M") if course.schedule_end else ""
+    return f"{day_text} {start_time}-{end_time}"
+
 
 class OrderService:
     """订单服务"""
 
     def __init__(self):
         self.repo = BaseRepository[Order](Order)
+        self.seat_service = SeatService()
 
     async def create_order(
         self, db: AsyncSession, user_id: str, data: OrderCreate
@@ -40,11 +55,11 @@ class OrderService:
                 message="课程当前不可报名",
             )
 
-        # 验证学员是否属于当前用户
+        # 验证学员是否属于当前用户（一次 IN 查询取回全部学员）
         student_repo = BaseRepository[Student](Student)
         students = []
-        for student_id in data.student_ids:
-            student = await student_repo.get(db, student_id)
+        found = await student_repo.get_many(db, data.student_ids)
+        for student_id, student in zip(data.student_ids, found):
             if not student or student.user_id != user_id:
                 raise AppException(
                     code=ErrorCode.STUDENT_NOT_FOUND,
@@ -66,13 +81,6 @@ class OrderService:
                 message="学员已报名该课程",
             )
 
-        # 检查课程名额
-        if course.enrolled_count + len(students) > course.max_students:
-            raise AppException(
-                code=ErrorCode.COURSE_FULL,
-                message="课程名额不足",
-            )
-
         # 获取用户会员状态
         user_repo = BaseRepository[User](User)
         user = await user_repo.get(db, user_id)
@@ -84,7 +92,7 @@ class OrderService:
         discount_amount = Decimal("0.00")
         pay_amount = total_amount - discount_amount
 
-        # 创建订单
+        # 创建订单（字段默认值均在本地生成，无需插入后重新查询）
         order = await self.repo.create(
             db,
             {
@@ -99,13 +107,14 @@ class OrderService:
                 "status": "pending",
                 "expire_at": datetime.now() + timedelta(minutes=30),
             },
+            refresh=False,
         )
 
-        # 创建课程学员关联
+        # 创建课程学员关联（一条多行 INSERT）
         course_student_repo = BaseRepository[CourseStudent](CourseStudent)
-        for student in students:
-            await course_student_repo.create(
-                db,
+        await course_student_repo.create_many(
+            db,
+            [
                 {
                     "id": generate_id(),
                     "course_id": data.course_id,
@@ -114,10 +123,18 @@ class OrderService:
                     "price": unit_price,
                     "is_new_user": 0,
                     "status": "pending",
-                },
+                }
+                for student in students
+            ],
+        )
+
+        # 占用课程名额（放在最后执行，缩短课程行锁的持有时间；名额不足时整个事务回滚）
+        if not await self.seat_service.reserve(db, data.course_id, len(students)):
+            raise AppException(
+                code=ErrorCode.COURSE_FULL,
+                message="课程名额不足",
             )
 
-        await db.refresh(order)
         return OrderResponse.model_validate(order)
 
     async def get_order(self, db: AsyncSession, order_id: str, user_id: str = None) -> OrderResponse:
@@ -138,61 +155,56 @@ class OrderService:
     async def list_orders(
         self, db: AsyncSession, user_id: str, status: str = None, page: int = 1, page_size: int = 20
     ) -> dict:
-        """获取订单列表"""
+        """获取订单列表
+
+        每页固定语句数：count + 订单(联表课程/小区/教练) + 课程学员 + 学员，
+        不随订单数和学员数增长。
+        """
         filters = {"user_id": user_id}
         if status:
             filters["status"] = status
 
         total = await self.repo.count(db, **filters)
-        orders = await self.repo.get_multi(
-            db, skip=(page - 1) * page_size, limit=page_size, order_by="created_at", order_desc=True, **filters
-        )
 
-        # 获取关联的课程、小区、教练信息
-        course_repo = BaseRepository[Course](Course)
-        community_repo = BaseRepository[Community](Community)
-        teacher_repo = BaseRepository[Teacher](Teacher)
-        student_repo = BaseRepository[Student](Student)
+        # 多对一关联用 joinedload 一次联表取回，一对多关联用 selectinload 按 IN 批量加载
+        stmt = (
+            select(Order)
+            .where(Order.user_id == user_id)
+            .options(
+                joinedload(Order.course).joinedload(Course.community),
+                joinedload(Order.course).joinedload(Course.teacher),
+                selectinload(Order.course_students).selectinload(CourseStudent.student),
+            )
+            .order_by(Order.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        if status:
+            stmt = stmt.where(Order.status == status)
+        result = await db.execute(stmt)
+        orders = result.unique().scalars().all()
 
         result_items = []
         for order in orders:
             order_data = OrderResponse.model_validate(order).model_dump()
 
-            # 获取课程信息
-            course = await course_repo.get(db, order.course_id)
+            # 课程信息
+            course = order.course
             if course:
                 order_data["course_name"] = course.name
                 order_data["course_image"] = course.image
                 order_data["total_lessons"] = course.total_lessons
                 order_data["enrolled_count"] = course.enrolled_count
                 order_data["max_students"] = course.max_students
+                order_data["schedule"] = _format_schedule(course)
+
+                if course.community:
+                    order_data["community_name"] = course.community.name
+                if course.teacher:
+                    order_data["teacher_name"] = course.teacher.name
 
-                # 格式化上课时间
-                day_map = {"1": "周一", "2": "周二", "3": "周三", "4": "周四", "5": "周五", "6": "周六", "7": "周日"}
-                day_text = day_map.get(str(course.schedule_day), f"周{course.schedule_day}")
-                start_time = course.schedule_start.strftime("%H:%M") if course.schedule_start else ""
-                end_time = course.schedule_end.strftime("%H:%M") if course.schedule_end else ""
-                order_data["schedule"] = f"{day_text} {start_time}-{end_time}"
-
-                # 获取小区信息
-                community = await community_repo.get(db, course.community_id)
-                if community:
-                    order_data["community_name"] = community.name
-
-                # 获取教练信息
-                teacher = await teacher_repo.get(db, course.teacher_id)
-                if teacher:
-                    order_data["teacher_name"] = teacher.name
-
-            # 获取学员信息
-            stmt = select(CourseStudent).where(CourseStudent.order_id == order.id)
-            result = await db.execute(stmt)
-            course_students = result.scalars().all()
-            student_names = []
-            for cs in course_students:
-                student = await student_repo.get(db, cs.student_id)
-                if student:
-                    student_names.append(student.id_name)
+            # 学员信息
+            student_names = [cs.student.id_name for cs in order.course_students if cs.student]
             order_data["student_name"] = "、".join(student_names) if student_names else ""
 
             result_items.append(OrderResponse(**order_data))
@@ -233,7 +245,10 @@ class OrderService:
         course_students = result.scalars().all()
         for cs in course_students:
             await db.delete(cs)
-        
+
+        # 释放待支付订单占用的名额
+        await self.seat_service.release(db, order.course_id, len(course_students))
+
         await db.refresh(order)
         return OrderResponse.model_validate(order)
 
@@ -298,28 +313,28 @@ class OrderService:
         for cs in course_students:
             cs.status = "refunded"
 
-        # 更新课程报名人数
-        course_repo = BaseRepository[Course](Course)
-        course = await course_repo.get(db, order.course_id)
-        if course:
-            await course_repo.update(
-                db, course, {"enrolled_count": course.enrolled_count - len(course_students)}
-            )
+        # 释放课程名额
+        await self.seat_service.release(db, order.course_id, len(course_students))
 
         await db.refresh(order)
         return OrderResponse.model_validate(order)
 
     async def list_all_orders(
-        self, db: AsyncSession, page: int, page_size: int
+        self,
+        db: AsyncSession,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
     ) -> dict:
         """获取所有订单(管理端)"""
         total = await self.repo.count(db)
-        orders = await self.repo.get_multi(
-            db, skip=(page - 1) * page_size, limit=page_size
+        orders, next_cursor = await self.repo.get_page(
+            db, page=page, page_size=page_size, cursor=cursor
         )
         return {
             "items": [OrderResponse.model_validate(o) for o in orders],
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
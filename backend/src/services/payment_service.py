@@ -4,14 +4,16 @@
 import hashlib
 import time
 from datetime import datetime
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
-from src.models.domain import Payment, Order, Course
+from src.models.domain import Payment, Order, CourseStudent
 from src.models.schemas import PaymentPrepay, PaymentPrepayResponse
 from src.repositories.base import BaseRepository
+from src.services.order_expiry_service import OrderExpiryService
 from src.utils.id_generator import generate_id
 
 
@@ -46,7 +48,17 @@ class PaymentService:
 
         # 检查订单是否已过期
         if order.expire_at < datetime.now():
-            await order_repo.update(db, order, {"status": "expired"})
+            # 标记过期，删除课程学员关联并释放占用的名额
+            expired = await OrderExpiryService().expire_orders(db, [order])
+
+            # 先提交过期处理，避免随异常一起回滚
+            await db.commit()
+            if not expired:
+                # 订单已被并发的支付回调或过期清理处理
+                raise AppException(
+                    code=ErrorCode.ORDER_CANNOT_PAY,
+                    message="订单状态不允许支付",
+                )
             raise AppException(
                 code=ErrorCode.ORDER_EXPIRED,
                 message="订单已过期",
@@ -84,10 +96,21 @@ class PaymentService:
     async def handle_payment_callback(
         self, db: AsyncSession, order_id: str, transaction_id: str
     ) -> bool:
-        """处理支付回调(内部接口)"""
-        # 获取订单
-        order_repo = BaseRepository[Order](Order)
-        order = await order_repo.get(db, order_id)
+        """处理支付回调(内部接口)
+
+        锁定订单后再检查状态，与过期清理互斥：订单已被标记过期时不再置为已支付，
+        支付记录标记为待退款并提交，返回 False。
+        语句数固定：订单 + 支付记录 + 三条 UPDATE，不随学员数增长。
+        """
+        # 锁定订单
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        order = result.scalars().first()
         if not order:
             return False
 
@@ -98,43 +121,35 @@ class PaymentService:
         if not payment:
             return False
 
-        # 更新支付记录
-        await self.repo.update(
-            db,
-            payment,
-            {
-                "transaction_id": transaction_id,
-                "status": "success",
-                "pay_time": datetime.now(),
-            },
-        )
+        if order.status != "pending":
+            if order.status == "expired":
+                # 订单已过期，名额已释放：款项原路退回
+                payment.transaction_id = transaction_id
+                payment.status = "refunding"
+                payment.pay_time = datetime.now()
+                payment.refund_amount = payment.amount
+                # 先提交退款标记，避免随调用方的异常一起回滚
+                await db.commit()
+                logger.warning(
+                    f"订单已过期，支付待退款: order_id={order_id} transaction_id={transaction_id}"
+                )
+            return False
 
-        # 更新订单状态
-        await order_repo.update(
-            db,
-            order,
-            {
-                "status": "paid",
-                "pay_time": datetime.now(),
-            },
+        # 更新支付记录和订单状态（提交时各一条 UPDATE，无需重新查询）
+        pay_time = datetime.now()
+        payment.transaction_id = transaction_id
+        payment.status = "success"
+        payment.pay_time = pay_time
+        order.status = "paid"
+        order.pay_time = pay_time
+
+        # 更新课程学员状态（名额已在下单时占用），一条 UPDATE 而不是逐行加载后修改
+        stmt = (
+            update(CourseStudent)
+            .where(CourseStudent.order_id == order_id)
+            .values(status="active")
+            .execution_options(synchronize_session=False)
         )
-
-        # 更新课程报名人数
-        from src.models.domain import CourseStudent
-        stmt = select(CourseStudent).where(CourseStudent.order_id == order_id)
-        result = await db.execute(stmt)
-        course_students = result.scalars().all()
-
-        for cs in course_students:
-            cs.status = "active"
-
-        course_repo = BaseRepository[Course](Course)
-        course = await course_repo.get(db, order.course_id)
-        if course:
-            await course_repo.update(
-                db,
-                course,
-                {"enrolled_count": course.enrolled_count + len(course_students)},
-            )
+        await db.execute(stmt)
 
         return True
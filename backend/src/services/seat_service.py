@@ -0,0 +1,60 @@
+"""
+课程名额服务
+
+enrolled_count 统计已占用的名额，包括待支付订单的占位和已支付的报名。
+名额的占用与释放都使用单条条件 UPDATE 在数据库内原子完成，
+并发报名不会超卖，也不会因读-改-写产生计数漂移。
+"""
+from sqlalchemy import update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.domain import Course
+
+
+class SeatService:
+    """课程名额服务"""
+
+    async def reserve(self, db: AsyncSession, course_id: str, count: int) -> bool:
+        """占用名额
+
+        UPDATE courses SET enrolled_count = enrolled_count + :count
+        WHERE id = :course_id AND enrolled_count + :count <= max_students
+
+        Args:
+            db: 数据库会话
+            course_id: 课程 ID
+            count: 占用数量
+
+        Returns:
+            是否占用成功，名额不足返回 False
+        """
+        stmt = (
+            update(Course)
+            .where(
+                Course.id == course_id,
+                Course.enrolled_count + count <= Course.max_students,
+            )
+            .values(enrolled_count=Course.enrolled_count + count)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        return result.rowcount == 1
+
+    async def release(self, db: AsyncSession, course_id: str, count: int) -> None:
+        """释放名额
+
+        Args:
+            db: 数据库会话
+            course_id: 课程 ID
+            count: 释放数量
+        """
+        if count <= 0:
+            return
+
+        stmt = (
+            update(Course)
+            .where(Course.id == course_id)
+            .values(enrolled_count=func.greatest(Course.enrolled_count - count, 0))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(stmt)
@@ -1,14 +1,18 @@
 """
 学员服务
 """
+from loguru import logger
+from sqlalchemy import select, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.database import async_session_maker
 from src.core.errors import ErrorCode
 from src.core.exceptions import AppException
+from src.core.executor import crypto_executor
 from src.models.domain import Student
 from src.models.schemas import StudentCreate, StudentUpdate, StudentResponse
 from src.repositories.base import BaseRepository
-from src.utils import generate_id, encrypt_id_number, hash_id_number
+from src.utils import generate_id, encrypt_id_number, hash_id_number, rotate_id_numbers
 
 
 class StudentService:
@@ -129,3 +133,58 @@ class StudentService:
 
         success = await self.repo.delete(db, student_id)
         return success
+
+
+async def rotate_student_id_numbers(batch_size: int = 500) -> dict[str, int]:
+    """使用当前加密密钥重新加密全部学员的证件号（密钥轮换后执行）
+
+    按主键顺序分批读取，每批在线程池中重新加密后用一个短事务写回，
+    只锁定本批次的行，不锁表。写回时校验原密文，期间被修改过的行保持不变。
+
+    Args:
+        batch_size: 每批行数
+
+    Returns:
+        处理统计: scanned 扫描行数, rotated 写回行数, failed 无法解密的行数
+    """
+    table = Student.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.id_number == bindparam("b_old"))
+        .values(id_number=bindparam("b_new"))
+    )
+    stats = {"scanned": 0, "rotated": 0, "failed": 0}
+    last_id = ""
+    while True:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Student.id, Student.id_number)
+                .where(Student.id > last_id)
+                .order_by(Student.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        rotated = await crypto_executor.run(
+            rotate_id_numbers, [row.id_number for row in rows]
+        )
+        params = []
+        for row, new_value in zip(rows, rotated):
+            if new_value is None:
+                stats["failed"] += 1
+                logger.warning(f"学员 {row.id} 证件号无法解密，跳过")
+                continue
+            params.append({"b_id": row.id, "b_old": row.id_number, "b_new": new_value})
+
+        if params:
+            async with async_session_maker() as db:
+                result = await db.execute(stmt, params)
+                await db.commit()
+            stats["rotated"] += result.rowcount
+        stats["scanned"] += len(rows)
+        logger.info(f"证件号重新加密进度: {stats}")
+
+    return stats
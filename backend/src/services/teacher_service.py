@@ -1,6 +1,8 @@
 """
 教练服务
 """
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import AppException
@@ -57,18 +59,23 @@ class TeacherService:
         return TeacherResponse.model_validate(teacher)
 
     async def list_teachers(
-        self, db: AsyncSession, page: int, page_size: int
+        self,
+        db: AsyncSession,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
     ) -> dict:
         """获取教练列表"""
         total = await self.repo.count(db)
-        teachers = await self.repo.get_multi(
-            db, skip=(page - 1) * page_size, limit=page_size
+        teachers, next_cursor = await self.repo.get_page(
+            db, page=page, page_size=page_size, cursor=cursor
         )
         return {
             "items": [TeacherResponse.model_validate(t) for t in teachers],
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
 
     async def delete_teacher(self, db: AsyncSession, teacher_id: str) -> bool:
@@ -0,0 +1,273 @@
+"""
+文件上传服务
+
+multipart/form-data 请求体边接收边解析，不经过表单解析和 SpooledTemporaryFile，
+文件字段的内容直接写入临时文件，边写边计算 SHA-256，超过大小限制立即中止。
+文件以内容哈希命名，相同图片多次上传只保存一份。
+临时文件放在公开的上传目录之外，未完成的上传不会被访问到。
+文件读写均在线程池中执行，不阻塞事件循环。
+"""
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException, BadRequestException
+
+# 上传目录
+UPLOAD_DIR = Path("uploads")
+# 上传中的临时文件目录
+TMP_DIR = Path("tmp") / "uploads"
+
+# 允许的图片格式
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+
+# multipart 边界、表单头等额外开销
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class MultipartFileReader:
+    """从 multipart/form-data 请求体中流式读取一个文件字段
+
+    请求体按接收到的块交给 python-multipart 的增量解析器，
+    只缓存目标字段当前块的内容，其他字段的内容直接丢弃
+    """
+
+    def __init__(self, content_type: str, body: AsyncIterator[bytes], field: str = "file"):
+        """初始化
+
+        Args:
+            content_type: 请求的 Content-Type
+            body: 请求体内容块
+            field: 文件字段名
+
+        Raises:
+            BadRequestException: 请求体不是 multipart/form-data
+        """
+        mime, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if mime != b"multipart/form-data" or not boundary:
+            raise BadRequestException("请求体须为 multipart/form-data")
+
+        self.field = field
+        self.filename: Optional[str] = None
+        self._body = aiter(body)
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._disposition = b""
+        self._in_field = False
+        self._finished = False
+        self._chunks: list[bytes] = []
+
+    async def read_headers(self) -> str:
+        """读取请求体直到文件字段的头部
+
+        Returns:
+            文件名（未提供时为空字符串）
+
+        Raises:
+            BadRequestException: 请求体中没有该字段或格式错误
+        """
+        while self.filename is None:
+            if not await self._feed():
+                raise BadRequestException(f"缺少文件字段: {self.field}")
+        return self.filename
+
+    async def iter_content(self) -> AsyncIterator[bytes]:
+        """按接收顺序返回文件字段的内容块，需先调用 read_headers"""
+        while True:
+            chunks, self._chunks = self._chunks, []
+            for chunk in chunks:
+                yield chunk
+            if self._finished:
+                return
+            if not await self._feed():
+                raise BadRequestException("请求体不完整")
+
+    async def _feed(self) -> bool:
+        """读取并解析下一块请求体，请求体结束时返回 False"""
+        try:
+            chunk = await anext(self._body)
+        except StopAsyncIteration:
+            return False
+        try:
+            self._parser.write(chunk)
+        except FormParserError:
+            raise BadRequestException("请求体格式错误")
+        return True
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if self.filename is None and options.get(b"name") == self.field.encode():
+            self._in_field = True
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self._chunks.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_field:
+            self._in_field = False
+            self._finished = True
+
+
+class UploadService:
+    """文件上传服务"""
+
+    def __init__(
+        self,
+        upload_dir: Path = UPLOAD_DIR,
+        tmp_dir: Path = TMP_DIR,
+        max_size: int = MAX_FILE_SIZE,
+    ):
+        """初始化
+
+        Args:
+            upload_dir: 上传根目录
+            tmp_dir: 临时文件目录，不能位于上传目录内
+            max_size: 单个文件大小上限（字节）
+        """
+        self.upload_dir = upload_dir
+        self.tmp_dir = tmp_dir
+        self.max_size = max_size
+
+    async def save_image(
+        self, content_type: str, body: AsyncIterator[bytes], field: str = "file"
+    ) -> dict:
+        """保存 multipart/form-data 请求体中上传的图片
+
+        Args:
+            content_type: 请求的 Content-Type
+            body: 请求体内容块
+            field: 文件字段名
+
+        Returns:
+            url、原始文件名和文件大小
+
+        Raises:
+            AppException: 请求体格式错误、文件格式不支持或文件过大
+        """
+        reader = MultipartFileReader(content_type, self._limit_body(body), field)
+        filename = await reader.read_headers()
+        ext = Path(filename).suffix.lower()
+        if ext not in ALLOWED_EXTENSIONS:
+            raise AppException(
+                code=ErrorCode.FILE_TYPE_ERROR,
+                message=f"不支持的文件格式,仅支持: {', '.join(ALLOWED_EXTENSIONS)}",
+            )
+
+        url, size = await self.save_stream(reader.iter_content(), ext)
+        return {"url": url, "filename": filename, "size": size}
+
+    async def save_stream(self, chunks: AsyncIterator[bytes], ext: str) -> tuple[str, int]:
+        """按块写入文件并以内容哈希命名
+
+        Args:
+            chunks: 文件内容块
+            ext: 文件扩展名（含点）
+
+        Returns:
+            (文件 URL, 文件大小)
+
+        Raises:
+            AppException: 文件过大
+        """
+        f, tmp_path = await run_in_threadpool(self._open_tmp_file)
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise self._too_large()
+                    digest.update(chunk)
+                    await run_in_threadpool(f.write, chunk)
+            finally:
+                await run_in_threadpool(f.close)
+
+            name = digest.hexdigest()
+            relative = Path(name[:2]) / f"{name}{ext}"
+            await run_in_threadpool(self._commit, tmp_path, self.upload_dir / relative)
+        finally:
+            await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+
+        return f"/{self.upload_dir.as_posix()}/{relative.as_posix()}", size
+
+    def _open_tmp_file(self) -> tuple[BinaryIO, Path]:
+        """在临时文件目录中创建临时文件，返回 (文件对象, 路径)"""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        return os.fdopen(fd, "wb"), Path(tmp_name)
+
+    @staticmethod
+    def _commit(tmp_path: Path, target: Path) -> None:
+        """将临时文件移动到目标位置，目标已存在（相同内容）时直接复用"""
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(tmp_path, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # 临时目录与上传目录不在同一文件系统（如上传目录单独挂载）时，
+            # 先复制为目标目录内的隐藏文件再重命名，静态服务不提供以 . 开头的路径
+            fd, copy_name = tempfile.mkstemp(dir=target.parent, prefix=".")
+            os.close(fd)
+            try:
+                shutil.copyfile(tmp_path, copy_name)
+                os.replace(copy_name, target)
+            finally:
+                Path(copy_name).unlink(missing_ok=True)
+
+    async def _limit_body(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """请求体（含其他字段）超过大小限制时立即中止，不再继续接收"""
+        received = 0
+        async for chunk in body:
+            received += len(chunk)
+            if received > self.max_size + MULTIPART_OVERHEAD:
+                raise self._too_large()
+            yield chunk
+
+    def _too_large(self) -> AppException:
+        return AppException(
+            code=ErrorCode.FILE_TOO_LARGE,
+            message=f"文件大小超过限制({self.max_size / 1024 / 1024}MB)",
+        )
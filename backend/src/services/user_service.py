@@ -2,14 +2,20 @@
 用户服务
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, or_
 
+from src.core.cache import TTLCache
+from src.core.config import settings
 from src.core.exceptions import AppException
 from src.core.errors import ErrorCode
+from src.core.security import invalidate_principal
 from src.models.domain import User
 from src.models.schemas import UserResponse, UserAssetsResponse, UserUpdate
 from src.repositories.base import BaseRepository
 
+# 无过滤条件时的用户总数缓存，管理端翻页不必每次 COUNT 全表
+user_count_cache = TTLCache(maxsize=1, ttl=settings.user_count_cache_ttl)
+
 
 class UserService:
     """用户服务"""
@@ -54,6 +60,7 @@ class UserService:
             )
         await self.repo.update(db, user, data.model_dump(exclude_unset=True))
         await db.refresh(user)
+        await invalidate_principal(db, "user", user_id)
         return UserResponse.model_validate(user)
 
     async def update_user_status(
@@ -68,30 +75,38 @@ class UserService:
             )
         await self.repo.update(db, user, {"status": status})
         await db.refresh(user)
+        await invalidate_principal(db, "user", user_id)
         return UserResponse.model_validate(user)
 
     async def list_users(
         self, db: AsyncSession, page: int, page_size: int, keyword: str = None
     ) -> dict:
-        """获取用户列表"""
+        """获取用户列表
+
+        关键字按昵称或手机号前缀匹配（LIKE 'kw%'），可以使用 idx_nickname / idx_phone 索引；
+        无关键字时总数使用短时缓存
+        """
         # 构建基础查询
         query = select(User)
-        
-        # 如果有关键字，按昵称或手机号搜索
+        count_query = select(func.count(User.id))
+
+        # 如果有关键字，按昵称或手机号前缀搜索
         if keyword:
-            query = query.where(
-                (User.nickname.contains(keyword)) | (User.phone.contains(keyword))
+            condition = or_(
+                User.nickname.startswith(keyword, autoescape=True),
+                User.phone.startswith(keyword, autoescape=True),
             )
-        
+            query = query.where(condition)
+            count_query = count_query.where(condition)
+
         # 计算总数
-        count_query = select(User)
-        if keyword:
-            count_query = count_query.where(
-                (User.nickname.contains(keyword)) | (User.phone.contains(keyword))
-            )
-        result = await db.execute(count_query)
-        total = len(result.scalars().all())
-        
+        total = None if keyword else user_count_cache.get("all")
+        if total is None:
+            result = await db.execute(count_query)
+            total = result.scalar() or 0
+            if not keyword:
+                user_count_cache.set("all", total)
+
         # 分页查询
         query = query.offset((page - 1) * page_size).limit(page_size)
         result = await db.execute(query)
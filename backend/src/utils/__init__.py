@@ -2,21 +2,46 @@
 工具函数包
 """
 from .id_generator import generate_id, generate_order_no
-from .password import hash_password, verify_password
-from .encryption import encrypt_id_number, decrypt_id_number, hash_id_number
+from .password import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+)
+from .encryption import (
+    encrypt_id_number,
+    decrypt_id_number,
+    rotate_id_number,
+    encrypt_id_numbers,
+    decrypt_id_numbers,
+    rotate_id_numbers,
+    encrypt_id_numbers_async,
+    decrypt_id_numbers_async,
+    hash_id_number,
+)
 from .masking import mask_phone, mask_id_number, mask_email
-from .geo import haversine_distance
+from .geo import haversine_distance, haversine_distances, bounding_box
 
 __all__ = [
     "generate_id",
     "generate_order_no",
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
     "encrypt_id_number",
     "decrypt_id_number",
+    "rotate_id_number",
+    "encrypt_id_numbers",
+    "decrypt_id_numbers",
+    "rotate_id_numbers",
+    "encrypt_id_numbers_async",
+    "decrypt_id_numbers_async",
     "hash_id_number",
     "mask_phone",
     "mask_id_number",
     "mask_email",
     "haversine_distance",
+    "haversine_distances",
+    "bounding_box",
 ]
@@ -1,22 +1,56 @@
 """
 身份证加密工具
+
+Fernet 实例按密钥缓存在模块内，加解密时不再重复派生密钥。
+支持密钥轮换：ID_NUMBER_KEYS 第一个密钥用于加密，其余密钥仅用于解密旧数据，
+轮换后通过 scripts/rotate_id_number_key.py 分批重新加密 students 表。
 """
+import asyncio
+import base64
 import hashlib
-from cryptography.fernet import Fernet
+import math
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
 from src.core.config import settings
+from src.core.executor import crypto_executor
+
+# 异步批量加解密时每个线程池任务处理的条数
+BATCH_CHUNK_SIZE = 500
 
 
-# 使用配置中的密钥，如果没有则使用默认密钥（仅用于开发）
-def get_cipher_key() -> bytes:
-    """获取加密密钥"""
-    key = settings.secret_key
+def get_cipher_key(secret: Optional[str] = None) -> bytes:
+    """由密钥字符串派生 Fernet 密钥
+
+    Args:
+        secret: 密钥字符串，默认使用 SECRET_KEY
+
+    Returns:
+        base64 编码的 32 字节密钥
+    """
+    key = settings.secret_key if secret is None else secret
     # 使用 SHA256 派生固定长度的密钥
     derived_key = hashlib.sha256(key.encode()).digest()
     # Fernet 需要 base64 编码的 32 字节密钥
-    import base64
     return base64.urlsafe_b64encode(derived_key)
 
 
+@lru_cache(maxsize=4)
+def _build_cipher(secrets: tuple[str, ...]) -> MultiFernet:
+    return MultiFernet([Fernet(get_cipher_key(secret)) for secret in secrets])
+
+
+def get_cipher() -> MultiFernet:
+    """获取缓存的加密器
+
+    Returns:
+        MultiFernet，使用第一个密钥加密，依次尝试全部密钥解密
+    """
+    return _build_cipher(tuple(settings.id_number_keys or [settings.secret_key]))
+
+
 def encrypt_id_number(id_number: str) -> str:
     """加密身份证号
 
@@ -26,8 +60,7 @@ def encrypt_id_number(id_number: str) -> str:
     Returns:
         加密后的身份证号
     """
-    cipher = Fernet(get_cipher_key())
-    encrypted = cipher.encrypt(id_number.encode('utf-8'))
+    encrypted = get_cipher().encrypt(id_number.encode('utf-8'))
     return encrypted.decode('utf-8')
 
 
@@ -40,11 +73,106 @@ def decrypt_id_number(encrypted_id_number: str) -> str:
     Returns:
         身份证号明文
     """
-    cipher = Fernet(get_cipher_key())
-    decrypted = cipher.decrypt(encrypted_id_number.encode('utf-8'))
+    decrypted = get_cipher().decrypt(encrypted_id_number.encode('utf-8'))
     return decrypted.decode('utf-8')
 
 
+def rotate_id_number(encrypted_id_number: str) -> str:
+    """使用当前加密密钥重新加密身份证号
+
+    Args:
+        encrypted_id_number: 使用任一已配置密钥加密的身份证号
+
+    Returns:
+        使用第一个密钥重新加密后的身份证号
+    """
+    rotated = get_cipher().rotate(encrypted_id_number.encode('utf-8'))
+    return rotated.decode('utf-8')
+
+
+def encrypt_id_numbers(id_numbers: list[str]) -> list[str]:
+    """批量加密身份证号
+
+    Args:
+        id_numbers: 身份证号明文列表
+
+    Returns:
+        与输入顺序一致的密文列表
+    """
+    cipher = get_cipher()
+    return [cipher.encrypt(v.encode('utf-8')).decode('utf-8') for v in id_numbers]
+
+
+def decrypt_id_numbers(encrypted_id_numbers: list[str]) -> list[str]:
+    """批量解密身份证号
+
+    Args:
+        encrypted_id_numbers: 密文列表
+
+    Returns:
+        与输入顺序一致的明文列表
+    """
+    cipher = get_cipher()
+    return [cipher.decrypt(v.encode('utf-8')).decode('utf-8') for v in encrypted_id_numbers]
+
+
+def rotate_id_numbers(encrypted_id_numbers: list[str]) -> list[Optional[str]]:
+    """批量使用当前加密密钥重新加密身份证号
+
+    Args:
+        encrypted_id_numbers: 密文列表
+
+    Returns:
+        与输入顺序一致的新密文列表，无法用任一密钥解密的位置为 None
+    """
+    cipher = get_cipher()
+    result = []
+    for value in encrypted_id_numbers:
+        try:
+            result.append(cipher.rotate(value.encode('utf-8')).decode('utf-8'))
+        except InvalidToken:
+            result.append(None)
+    return result
+
+
+async def decrypt_id_numbers_async(encrypted_id_numbers: list[str]) -> list[str]:
+    """在线程池中批量解密身份证号，适用于导出、名单等大量解密的场景
+
+    Args:
+        encrypted_id_numbers: 密文列表
+
+    Returns:
+        与输入顺序一致的明文列表
+    """
+    return await _run_chunked(decrypt_id_numbers, encrypted_id_numbers)
+
+
+async def encrypt_id_numbers_async(id_numbers: list[str]) -> list[str]:
+    """在线程池中批量加密身份证号
+
+    Args:
+        id_numbers: 身份证号明文列表
+
+    Returns:
+        与输入顺序一致的密文列表
+    """
+    return await _run_chunked(encrypt_id_numbers, id_numbers)
+
+
+async def _run_chunked(func, values: list[str]) -> list[str]:
+    if len(values) <= BATCH_CHUNK_SIZE:
+        return await crypto_executor.run(func, values)
+    # 分块数不超过线程数，单次调用不会占满排队队列
+    chunk_size = max(BATCH_CHUNK_SIZE, math.ceil(len(values) / crypto_executor.max_workers))
+    chunks = await asyncio.gather(
+        *(
+            crypto_executor.run(func, values[i:i + chunk_size])
+            for i in range(0, len(values), chunk_size)
+        )
+    )
+    return [value for chunk in chunks for value in chunk]
+
+
 def hash_id_number(id_number: str) -> str:
     """计算身份证号哈希
 
@@ -3,6 +3,13 @@
 """
 import math
 from decimal import Decimal
+from typing import Iterable
+
+# 地球半径（米）
+EARTH_RADIUS = 6371000
+
+# 每纬度对应的距离（米）
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS / 180
 
 
 def haversine_distance(
@@ -24,8 +31,7 @@ def haversine_distance(
     Returns:
         距离（米）
     """
-    # 地球半径（米）
-    R = 6371000
+    R = EARTH_RADIUS
 
     # 转换为浮点数
     lat1 = float(lat1)
@@ -47,3 +53,79 @@ def haversine_distance(
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     return R * c
+
+
+def haversine_distances(
+    lat: float | Decimal,
+    lon: float | Decimal,
+    points: Iterable[tuple[float | Decimal, float | Decimal]],
+) -> list[float]:
+    """批量计算一个坐标到多个坐标的距离（米）
+
+    原点的三角函数只计算一次，适合对候选集一次性求距离
+
+    Args:
+        lat: 原点纬度
+        lon: 原点经度
+        points: (纬度, 经度) 序列
+
+    Returns:
+        与 points 顺序一致的距离列表（米）
+    """
+    radians = math.radians
+    sin = math.sin
+    cos = math.cos
+    asin = math.asin
+    sqrt = math.sqrt
+
+    phi1 = radians(float(lat))
+    lambda1 = radians(float(lon))
+    cos_phi1 = cos(phi1)
+
+    distances = []
+    for lat2, lon2 in points:
+        phi2 = radians(float(lat2))
+        sin_dphi = sin((phi2 - phi1) / 2)
+        sin_dlambda = sin((radians(float(lon2)) - lambda1) / 2)
+        a = sin_dphi * sin_dphi + cos_phi1 * cos(phi2) * sin_dlambda * sin_dlambda
+        distances.append(2 * EARTH_RADIUS * asin(sqrt(min(1.0, a))))
+    return distances
+
+
+def bounding_box(
+    lat: float | Decimal,
+    lon: float | Decimal,
+    radius: float,
+) -> tuple[float, float, float, float]:
+    """计算以某点为中心、半径为 radius 的外接经纬度矩形
+
+    用于数据库按 (latitude, longitude) 索引做范围预过滤，结果为精确距离的超集
+
+    Args:
+        lat: 中心纬度
+        lon: 中心经度
+        radius: 半径（米）
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon)，经度跨越 ±180 时 min_lon > max_lon
+    """
+    lat = float(lat)
+    lon = float(lon)
+
+    delta_lat = radius / METERS_PER_DEGREE
+    min_lat = max(lat - delta_lat, -90.0)
+    max_lat = min(lat + delta_lat, 90.0)
+
+    # 靠近极点时经度范围覆盖全部
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 0 or radius / (METERS_PER_DEGREE * cos_lat) >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    delta_lon = radius / (METERS_PER_DEGREE * cos_lat)
+    min_lon = lon - delta_lon
+    max_lon = lon + delta_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, max_lat, min_lon, max_lon
@@ -1,9 +1,61 @@
 """
 ID 生成工具
+
+主键使用按时间递增的 UUIDv7（RFC 9562）32 位十六进制字符串:
+- 48 位毫秒时间戳：新记录总是追加到 InnoDB 聚簇索引末尾，避免随机插入导致的页分裂
+- 12 位计数器：同一毫秒内递增，保证同一进程内严格单调
+- 62 位随机数：多个 worker 同一毫秒生成的 ID 也不会冲突
+
+订单号与主键共用同一时钟，按创建顺序排序。
 """
+import os
+import threading
+import time
 import uuid
 from datetime import datetime
 
+# UUIDv7 计数器位数与上限
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _next_timestamp() -> tuple[int, int]:
+    """获取单调递增的 (毫秒时间戳, 计数器)
+
+    同一毫秒内计数器递增；计数器用尽或系统时钟回拨时沿用上一个时间戳继续递增，
+    保证返回值严格递增
+    """
+    global _last_ms, _counter
+    now_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # 随机起始值，只取低半区，为同一毫秒内的后续 ID 预留空间
+            _counter = int.from_bytes(os.urandom(2)) & (_COUNTER_MAX >> 1)
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_ms += 1
+            _counter = 0
+        return _last_ms, _counter
+
+
+def _uuid7_hex() -> str:
+    timestamp_ms, counter = _next_timestamp()
+    rand_b = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    value = (
+        (timestamp_ms << 80)
+        | (0x7 << 76)
+        | (counter << 64)
+        | (0b10 << 62)
+        | rand_b
+    )
+    return f"{value:032x}"
+
 
 def generate_id(prefix: str = "") -> str:
     """生成唯一 ID
@@ -12,24 +64,29 @@ def generate_id(prefix: str = "") -> str:
         prefix: ID 前缀
 
     Returns:
-        生成的唯一 ID
+        生成的唯一 ID，无前缀时为按时间递增的 32 位十六进制字符串
     """
     if prefix:
         # 使用前缀 + 时间戳 + 随机部分
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp_ms, _ = _next_timestamp()
+        timestamp = datetime.fromtimestamp(timestamp_ms / 1000).strftime("%Y%m%d%H%M%S")
         random_part = uuid.uuid4().hex[:8]
         return f"{prefix}_{timestamp}_{random_part}"
     else:
-        # 纯 UUID
-        return uuid.uuid4().hex
+        return _uuid7_hex()
 
 
 def generate_order_no() -> str:
     """生成订单号
 
+    格式: ORD + 年月日时分秒(14) + 毫秒(3) + 计数器(3) + 随机(6)，共 29 位，
+    按创建顺序排序
+
     Returns:
         订单号
     """
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    random_part = uuid.uuid4().hex[:8].upper()
-    return f"ORD{timestamp}{random_part}"
+    timestamp_ms, counter = _next_timestamp()
+    created_at = datetime.fromtimestamp(timestamp_ms / 1000)
+    timestamp = created_at.strftime("%Y%m%d%H%M%S")
+    random_part = os.urandom(3).hex().upper()
+    return f"ORD{timestamp}{timestamp_ms % 1000:03d}{counter:03X}{random_part}"
@@ -1,8 +1,13 @@
 """
 密码加密工具
+
+bcrypt 单次计算耗时 100ms 以上，异步代码中应使用 *_async 版本，
+在专用线程池中执行，避免阻塞事件循环。
 """
 import bcrypt
 
+from src.core.executor import password_executor
+
 
 def hash_password(password: str) -> str:
     """加密密码
@@ -32,3 +37,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+async def hash_password_async(password: str) -> str:
+    """在密码线程池中加密密码
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        加密后的密码哈希
+    """
+    return await password_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在密码线程池中验证密码
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 加密后的密码哈希
+
+    Returns:
+        密码是否正确
+    """
+    return await password_executor.run(verify_password, plain_password, hashed_password)
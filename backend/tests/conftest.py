@@ -0,0 +1,92 @@
+"""
+测试公共配置
+
+使用临时 SQLite 文件库（aiosqlite）代替 MySQL，测试前导入配置时通过环境变量指定。
+测试内的异步代码通过 run fixture 执行：每次在新的事件循环中运行，结束后释放连接池。
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_tmp_dir = tempfile.mkdtemp(prefix="spot-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp_dir}/test.db")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("LOG_DIR", f"{_tmp_dir}/logs")
+os.environ.setdefault("UPLOAD_DIR", f"{_tmp_dir}/uploads")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ORDER_EXPIRY_ENABLED", "false")
+os.environ.setdefault("DASHBOARD_REFRESH_ENABLED", "false")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import delete, event  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+
+from src.core.database import async_session_maker, engine, read_engine  # noqa: E402
+from src.models.domain.base import Base  # noqa: E402
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _sqlite_functions(dbapi_connection, connection_record) -> None:
+    """补充业务 SQL 用到的 MySQL 函数"""
+    dbapi_connection.create_function("greatest", -1, max)
+    dbapi_connection.create_function("least", -1, min)
+
+
+def _create_schema(conn) -> None:
+    """建表；SQLite 的索引名在库内全局唯一，索引名加上表名前缀"""
+    for table in Base.metadata.sorted_tables:
+        conn.execute(CreateTable(table))
+        for index in table.indexes:
+            columns = ", ".join(column.name for column in index.columns)
+            unique = "UNIQUE " if index.unique else ""
+            conn.exec_driver_sql(
+                f"CREATE {unique}INDEX {table.name}__{index.name} ON {table.name} ({columns})"
+            )
+
+
+async def _dispose() -> None:
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await _dispose()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_schema)
+
+    _run(create())
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+
+    async def clean():
+        async with async_session_maker() as db:
+            for table in reversed(Base.metadata.sorted_tables):
+                await db.execute(delete(table))
+            await db.commit()
+
+    _run(clean())
+
+
+@pytest.fixture
+def run():
+    """在新的事件循环中执行协程并返回结果"""
+    return _run
@@ -0,0 +1,231 @@
+"""
+AI 图片生成任务测试
+
+使用模拟的 Ark 客户端（不访问火山引擎），图片下载替换为直接返回本地 URL
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.database import async_session_maker
+from src.core.exceptions import AppException
+from src.models.domain import AIImageJob
+from src.services.ai_image_job_service import AIImageJobService
+from src.services.ai_image_service import AIImageService
+
+
+class FakeImages:
+    """模拟 Ark 客户端的 images 接口，按顺序返回 outcomes 中的结果"""
+
+    def __init__(self, outcomes=None, block: bool = False):
+        self.outcomes = list(outcomes or [])
+        self.calls: list[dict] = []
+        self.started = threading.Event()
+        # block=True 时阻塞到 release 被设置，模拟耗时的生成
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        self.started.set()
+        self.release.wait(5)
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, Exception):
+            raise outcome
+        url = f"https://ark.example.com/{len(self.calls)}.png"
+        return SimpleNamespace(data=[SimpleNamespace(url=url)])
+
+
+class FakeArk:
+    def __init__(self, **kwargs):
+        self.images = FakeImages(**kwargs)
+
+
+def _job_service(fake: FakeArk, **kwargs) -> AIImageJobService:
+    image_service = AIImageService(client=fake)
+
+    async def download(image_url: str) -> str:
+        return "/uploads/ai_images/" + image_url.rsplit("/", 1)[-1]
+
+    image_service._download_and_save_image = download
+    kwargs.setdefault("retry_backoff", 0.01)
+    return AIImageJobService(image_service=image_service, concurrency=1, **kwargs)
+
+
+async def _submit(service: AIImageJobService, prompt: str = "小朋友踢足球") -> str:
+    async with async_session_maker() as db:
+        job = await service.submit(db, prompt)
+        await db.commit()
+    return job.id
+
+
+async def _get(job_id: str) -> AIImageJob:
+    async with async_session_maker() as db:
+        return await db.get(AIImageJob, job_id)
+
+
+def test_job_succeeds(run):
+    async def scenario():
+        fake = FakeArk()
+        service = _job_service(fake)
+        await service.start()
+        try:
+            job_id = await _submit(service)
+            job = await service.wait_until_done(job_id, 5)
+        finally:
+            await service.stop()
+        return fake, job
+
+    fake, job = run(scenario())
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+    assert job.url == "/uploads/ai_images/1.png"
+    assert job.original_url == "https://ark.example.com/1.png"
+    assert fake.images.calls[0]["prompt"] == "小朋友踢足球"
+
+
+def test_job_retries_with_backoff(run):
+    async def scenario():
+        fake = FakeArk(outcomes=[RuntimeError("timeout"), RuntimeError("timeout")])
+        service = _job_service(fake, max_attempts=3)
+        await service.start()
+        try:
+            job_id = await _submit(service)
+            job = await service.wait_until_done(job_id, 5)
+        finally:
+            await service.stop()
+        return fake, job
+
+    fake, job = run(scenario())
+    assert job.status == "succeeded"
+    assert job.attempts == 3
+    assert len(fake.images.calls) == 3
+
+    async def exhausted():
+        fake = FakeArk(outcomes=[RuntimeError("timeout")] * 2)
+        service = _job_service(fake, max_attempts=2)
+        await service.start()
+        try:
+            job_id = await _submit(service)
+            return await service.wait_until_done(job_id, 5)
+        finally:
+            await service.stop()
+
+    job = run(exhausted())
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert "timeout" in job.error
+
+
+def test_submit_requires_api_key(run, monkeypatch):
+    image_service = AIImageService()
+    monkeypatch.setattr(image_service, "api_key", "")
+    service = AIImageJobService(image_service=image_service)
+
+    async def scenario():
+        async with async_session_maker() as db:
+            with pytest.raises(AppException):
+                await service.submit(db, "小朋友踢足球")
+
+    run(scenario())
+
+
+def test_rolled_back_job_is_not_enqueued(run):
+    service = _job_service(FakeArk())
+
+    async def scenario():
+        async with async_session_maker() as db:
+            job = await service.submit(db, "小朋友踢足球")
+            await db.rollback()
+            # 同一会话之后无关的提交不应带出已回滚的任务
+            await service.submit(db, "小朋友跳绳")
+            await db.commit()
+        queued = []
+        while not service._queue.empty():
+            queued.append(service._queue.get_nowait())
+        return job.id, queued, await _get(job.id)
+
+    rolled_back_id, queued, rolled_back = run(scenario())
+    assert rolled_back is None
+    assert len(queued) == 1 and queued[0] != rolled_back_id
+
+
+def test_stop_returns_running_job_to_pending(run):
+    fake = FakeArk(block=True)
+
+    async def interrupted():
+        service = _job_service(fake)
+        await service.start()
+        job_id = await _submit(service)
+        await asyncio.to_thread(fake.images.started.wait, 5)
+        await service.stop()
+        return job_id
+
+    job_id = run(interrupted())
+    fake.images.release.set()
+
+    job = run(_get(job_id))
+    assert job.status == "pending"
+    assert job.attempts == 0
+
+    async def restarted():
+        service = _job_service(FakeArk())
+        await service.start()
+        try:
+            return await service.wait_until_done(job_id, 5)
+        finally:
+            await service.stop()
+
+    job = run(restarted())
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+
+
+def test_periodic_recovery_picks_up_abandoned_jobs(run):
+    async def scenario():
+        long_ago = datetime.now() - timedelta(hours=1)
+        async with async_session_maker() as db:
+            # 已退出进程留下的执行中任务和待执行任务
+            db.add(AIImageJob(
+                id="abandonedrunning0000000000000001", prompt="跳绳", size="2K",
+                watermark=False, status="running", attempts=1, started_at=long_ago,
+                created_at=long_ago, updated_at=long_ago,
+            ))
+            db.add(AIImageJob(
+                id="abandonedpending0000000000000001", prompt="篮球", size="2K",
+                watermark=False, status="pending", attempts=0,
+                created_at=long_ago, updated_at=long_ago,
+            ))
+            await db.commit()
+
+        service = _job_service(FakeArk(), recover_interval=0.05, stale_timeout=600)
+        # 启动时的恢复由定期恢复代替，验证运行期间也能接管
+        service._recover = _skip_startup(service._recover)
+        await service.start()
+        try:
+            return [
+                await service.wait_until_done(job_id, 5)
+                for job_id in (
+                    "abandonedrunning0000000000000001",
+                    "abandonedpending0000000000000001",
+                )
+            ]
+        finally:
+            await service.stop()
+
+    running, pending = run(scenario())
+    assert running.status == "succeeded"
+    assert running.attempts == 2
+    assert pending.status == "succeeded"
+
+
+def _skip_startup(recover):
+    async def wrapper(overdue_only: bool = False):
+        if overdue_only:
+            await recover(overdue_only=True)
+
+    return wrapper
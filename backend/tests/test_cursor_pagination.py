@@ -0,0 +1,60 @@
+"""
+游标分页测试
+
+创建时间有重复的记录逐页翻完，结果应与按 (created_at, id) 倒序排列的完整列表一致
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.core.database import async_session_maker
+from src.core.exceptions import BadRequestException
+from src.models.domain import Student, User
+from src.repositories.base import BaseRepository
+
+USER_ID = "cursoruser000000000000000000001"
+ROWS = 23
+
+
+async def _seed() -> list[str]:
+    start = datetime(2024, 1, 1)
+    rows = []
+    async with async_session_maker() as db:
+        db.add(User(id=USER_ID, openid="cursor-openid", status=1))
+        for number in range(ROWS):
+            student = Student(
+                id=f"cursorstudent{number:019d}", user_id=USER_ID, id_type="id_card",
+                id_name=f"学员{number}", id_number="encrypted", id_number_hash=f"hash{number}",
+                birthday=date(2018, 1, 1), gender="male",
+                # 每三条记录的创建时间相同
+                created_at=start + timedelta(seconds=number // 3),
+            )
+            db.add(student)
+            rows.append((student.created_at, student.id))
+        await db.commit()
+    return [id for _, id in sorted(rows, reverse=True)]
+
+
+def test_cursor_pages_cover_all_rows_in_order(run):
+    async def scenario():
+        expected = await _seed()
+        repo = BaseRepository(Student)
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            async with async_session_maker() as db:
+                items, cursor = await repo.get_multi_by_cursor(db, limit=5, cursor=cursor)
+            seen.extend(item.id for item in items)
+        return expected, seen
+
+    expected, seen = run(scenario())
+    assert seen == expected
+
+
+def test_invalid_cursor_is_rejected(run):
+    async def scenario():
+        async with async_session_maker() as db:
+            await BaseRepository(Student).get_multi_by_cursor(db, limit=5, cursor="not-a-cursor")
+
+    with pytest.raises(BadRequestException):
+        run(scenario())
@@ -0,0 +1,38 @@
+"""
+AI 描述缓存清理测试
+
+- 写入不再触发清理，由定时任务调用 evict
+- evict 删除过期条目，超过条目上限时淘汰最久未使用的条目
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from src.core.database import async_session_maker
+from src.models.domain import AIDescriptionCacheEntry
+from src.services.ai_description_service import DescriptionCache
+
+
+def test_evict_removes_expired_and_least_recently_used(run):
+    async def scenario():
+        cache = DescriptionCache(ttl=3600, max_entries=2)
+        now = datetime.now()
+        async with async_session_maker() as db:
+            for key, age in (("expired", 7200), ("old", 300), ("recent", 60), ("newest", 0)):
+                used_at = now - timedelta(seconds=age)
+                db.add(AIDescriptionCacheEntry(
+                    cache_key=key, model="model", description=key,
+                    tokens_used=10, created_at=used_at, last_used_at=used_at,
+                ))
+            await db.commit()
+
+        evicted = await cache.evict()
+        async with async_session_maker() as db:
+            keys = set(await db.scalars(select(AIDescriptionCacheEntry.cache_key)))
+        # 再次清理时没有可删除的条目
+        return evicted, keys, await cache.evict()
+
+    evicted, keys, evicted_again = run(scenario())
+    assert evicted == 2
+    assert keys == {"recent", "newest"}
+    assert evicted_again == 0
@@ -0,0 +1,71 @@
+"""
+实体加载器测试
+
+- 同一会话内并发 get 不同模型：各模型一条 IN 查询，查询依次执行
+- 不存在的 ID 不缓存，之后写入的记录能读到
+"""
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from src.core.database import async_session_maker
+from src.core.query_monitor import statement_budget
+from src.models.domain import Community, User
+from src.repositories.base import BaseRepository
+
+USER_IDS = [f"loaderuser{number:022d}" for number in range(3)]
+COMMUNITY_ID = "loadercommunity00000000000000001"
+
+
+async def _seed() -> None:
+    async with async_session_maker() as db:
+        for number, user_id in enumerate(USER_IDS):
+            db.add(User(id=user_id, openid=f"loader-openid-{number}", status=1))
+        db.add(Community(
+            id=COMMUNITY_ID, name="小区", address="地址",
+            latitude=Decimal("30.0"), longitude=Decimal("120.0"),
+        ))
+        await db.commit()
+
+
+def test_concurrent_gets_across_models_share_the_session(run):
+    user_repo, community_repo = BaseRepository(User), BaseRepository(Community)
+
+    async def scenario():
+        await _seed()
+        async with async_session_maker() as db:
+            with statement_budget(2) as stats:
+                results = await asyncio.gather(
+                    *(user_repo.get(db, user_id) for user_id in USER_IDS),
+                    community_repo.get(db, COMMUNITY_ID),
+                    user_repo.get(db, "loadermissing000000000000000001"),
+                )
+            # 再次读取直接命中会话缓存
+            with statement_budget(0):
+                cached = await user_repo.get_many(db, USER_IDS)
+        return results, cached, stats["statements"]
+
+    results, cached, statements = run(scenario())
+    assert [obj.id for obj in results[:3]] == USER_IDS
+    assert results[3].id == COMMUNITY_ID
+    assert results[4] is None
+    assert [obj.id for obj in cached] == USER_IDS
+    assert statements == 2
+
+
+def test_misses_are_not_cached(run):
+    user_repo = BaseRepository(User)
+    user_id = "loaderlate000000000000000000001"
+
+    async def scenario():
+        async with async_session_maker() as db:
+            before = await user_repo.get(db, user_id)
+            # 绕过 repo.create 直接写入，加载器不知道这条记录
+            await db.execute(insert(User).values(id=user_id, openid="loader-late", status=1))
+            after = await user_repo.get(db, user_id)
+        return before, after
+
+    before, after = run(scenario())
+    assert before is None
+    assert after is not None and after.id == user_id
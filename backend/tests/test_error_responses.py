@@ -0,0 +1,40 @@
+"""
+异常响应测试
+
+- AppException.details 中的 Decimal、datetime 等值与正常响应一样序列化
+- 服务繁忙（SERVICE_BUSY）时返回 Retry-After
+"""
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from starlette.requests import Request
+
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.main import app_exception_handler
+
+
+def test_app_exception_details_are_serialized(run):
+    exc = AppException(
+        code=ErrorCode.ORDER_CANNOT_PAY,
+        message="订单不可支付",
+        details={"amount": Decimal("99.90"), "expire_at": datetime(2026, 1, 1, 12, 30)},
+    )
+    response = run(app_exception_handler(Request({"type": "http"}), exc))
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {
+        "code": ErrorCode.ORDER_CANNOT_PAY,
+        "message": "订单不可支付",
+        "data": {"amount": "99.90", "expire_at": "2026-01-01T12:30:00"},
+    }
+
+
+def test_service_busy_asks_clients_to_retry(run):
+    response = run(app_exception_handler(
+        Request({"type": "http"}), AppException(ErrorCode.SERVICE_BUSY)
+    ))
+
+    assert response.headers["Retry-After"] == "1"
+    assert json.loads(response.body)["code"] == ErrorCode.SERVICE_BUSY
@@ -0,0 +1,36 @@
+"""
+有界线程池测试
+
+排队已满时以 SERVICE_BUSY 拒绝，与业务错误区分
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.core.executor import BoundedExecutor
+
+
+def test_full_queue_is_rejected_as_service_busy(run):
+    release = threading.Event()
+
+    async def scenario():
+        executor = BoundedExecutor("test-executor", max_workers=1, max_queue=0)
+        try:
+            running = asyncio.create_task(executor.run(release.wait, 5))
+            await asyncio.sleep(0)
+            with pytest.raises(AppException) as exc_info:
+                await executor.run(lambda: None)
+            release.set()
+            await running
+            return exc_info.value, executor.stats()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    exc, stats = run(scenario())
+    assert exc.code == ErrorCode.SERVICE_BUSY
+    assert exc.message == "系统繁忙，请稍后重试"
+    assert stats["rejected"] == 1
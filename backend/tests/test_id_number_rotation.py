@@ -0,0 +1,78 @@
+"""
+证件号密钥轮换测试
+
+旧密钥加密的学员证件号经 rotate_student_id_numbers 重新加密后，只配置新密钥也能解密出原值；
+无法解密的行保持不变
+"""
+from datetime import date
+
+import pytest
+from cryptography.fernet import InvalidToken
+from sqlalchemy import select
+
+from src.core.config import settings
+from src.core.database import async_session_maker
+from src.models.domain import Student, User
+from src.services.student_service import rotate_student_id_numbers
+from src.utils.encryption import decrypt_id_number, encrypt_id_number
+
+USER_ID = "rotateuser000000000000000000001"
+ID_NUMBERS = [f"11010520180101{number:04d}" for number in range(7)]
+BROKEN_ID = "rotatestudent0000000000000broken"
+
+
+async def _seed() -> dict[str, str]:
+    expected = {}
+    async with async_session_maker() as db:
+        db.add(User(id=USER_ID, openid="rotate-openid", status=1))
+        for number, id_number in enumerate(ID_NUMBERS):
+            student_id = f"rotatestudent{number:019d}"
+            db.add(Student(
+                id=student_id, user_id=USER_ID, id_type="id_card", id_name=f"学员{number}",
+                id_number=encrypt_id_number(id_number), id_number_hash=f"hash{number}",
+                birthday=date(2018, 1, 1), gender="male",
+            ))
+            expected[student_id] = id_number
+        db.add(Student(
+            id=BROKEN_ID, user_id=USER_ID, id_type="id_card", id_name="损坏",
+            id_number="not-a-token", id_number_hash="hash-broken",
+            birthday=date(2018, 1, 1), gender="male",
+        ))
+        await db.commit()
+    return expected
+
+
+async def _load() -> dict[str, str]:
+    async with async_session_maker() as db:
+        result = await db.execute(select(Student.id, Student.id_number))
+        return dict(result.all())
+
+
+def test_rotate_round_trip(run, monkeypatch):
+    monkeypatch.setattr(settings, "id_number_keys", ["old-key"])
+    expected = run(_seed())
+    before = run(_load())
+
+    monkeypatch.setattr(settings, "id_number_keys", ["new-key", "old-key"])
+    # 每批 3 行，覆盖多批次和最后一个不满的批次
+    stats = run(rotate_student_id_numbers(batch_size=3))
+    assert stats == {"scanned": len(ID_NUMBERS) + 1, "rotated": len(ID_NUMBERS), "failed": 1}
+
+    monkeypatch.setattr(settings, "id_number_keys", ["new-key"])
+    after = run(_load())
+    assert after[BROKEN_ID] == "not-a-token"
+    for student_id, id_number in expected.items():
+        assert after[student_id] != before[student_id]
+        assert decrypt_id_number(after[student_id]) == id_number
+        # 旧密文在移除旧密钥后无法解密，确认确实已经重新加密
+        with pytest.raises(InvalidToken):
+            decrypt_id_number(before[student_id])
+
+    # 重复执行时已是新密钥的密文仍可轮换，结果不变
+    stats = run(rotate_student_id_numbers(batch_size=3))
+    assert stats["failed"] == 1
+    assert {
+        student_id: decrypt_id_number(value)
+        for student_id, value in run(_load()).items()
+        if student_id != BROKEN_ID
+    } == expected
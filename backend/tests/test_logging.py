@@ -0,0 +1,37 @@
+"""
+日志配置测试
+
+重复调用 setup_logging 或 shutdown_logging 时，旧的日志文件在队列写完后关闭
+"""
+import os
+
+from loguru import logger
+
+from src.core import logging as app_logging
+from src.core.config import settings
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_setup_and_shutdown_close_log_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "log_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "log_level", "WARNING")
+    try:
+        app_logging.setup_logging()
+        first = app_logging._active_sink
+        fds = _open_fds()
+        for _ in range(3):
+            app_logging.setup_logging()
+        # 每次重新配置都关闭上一组文件，打开的文件数不增长
+        assert _open_fds() == fds
+        assert all(output.handler.stream is None for output in first.outputs if output.handler)
+
+        current = app_logging._active_sink
+        logger.error("关闭前的最后一条日志")
+        app_logging.shutdown_logging()
+        assert all(output.handler.stream is None for output in current.outputs if output.handler)
+        assert "关闭前的最后一条日志" in (tmp_path / "error.log").read_text(encoding="utf-8")
+    finally:
+        app_logging.shutdown_logging()
@@ -0,0 +1,64 @@
+"""
+请求指标测试
+
+通过 ASGI 直接调用应用，检查 /metrics 中的路由模板标签：
+include_router 引入的 /api/v1 路由、应用顶层路由和 /uploads 挂载都按模板记录，未匹配的路径不记录
+"""
+import httpx
+import pytest
+
+from src.core.config import settings
+from src.main import app
+
+
+@pytest.fixture(autouse=True)
+def metrics_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    monkeypatch.setattr(settings, "metrics_token", "")
+
+
+def _samples(text: str, name: str) -> dict[str, float]:
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{"):
+            labels, value = line[len(name):].rsplit(" ", 1)
+            samples[labels] = float(value)
+    return samples
+
+
+def test_requests_are_recorded_by_route_template(run):
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            before = _samples(
+                (await client.get("/metrics")).text, "http_request_duration_seconds_count"
+            )
+            for path in (
+                "/",
+                "/api/v1/courses",
+                "/api/v1/courses/metricscourse000000000000000001",
+                "/api/v1/courses/metricscourse000000000000000002",
+                "/uploads/metrics-missing.png",
+                "/metrics-missing-route",
+            ):
+                await client.get(path)
+            response = await client.get("/metrics")
+        return before, response
+
+    before, response = run(scenario())
+    assert response.status_code == 200
+    after = _samples(response.text, "http_request_duration_seconds_count")
+
+    def recorded(labels: str) -> float:
+        return after.get(labels, 0) - before.get(labels, 0)
+
+    assert recorded('{method="GET",route="/",status="200"}') == 1
+    assert recorded('{method="GET",route="/api/v1/courses",status="200"}') == 1
+    assert recorded('{method="GET",route="/api/v1/courses/{course_id}",status="200"}') == 2
+    assert recorded('{method="GET",route="/uploads/{path}",status="404"}') == 1
+    assert not any("metrics-missing" in labels or "metricscourse" in labels for labels in after)
+
+    in_flight = _samples(response.text, "http_requests_in_flight")
+    # 只有正在处理的 /metrics 请求本身
+    assert in_flight == {'{method="GET"}': 1.0}
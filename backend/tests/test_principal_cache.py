@@ -0,0 +1,36 @@
+"""
+登录主体缓存测试
+
+多个 worker 共用版本号后端：一个 worker 修改用户并提交后，其他 worker 的缓存快照失效
+"""
+from src.core.cache import LocalCacheBackend
+from src.core.database import async_session_maker
+from src.core.security import PrincipalCache
+
+USER_ID = "principaluser000000000000000001"
+
+
+def test_invalidation_reaches_other_workers(run):
+    async def scenario():
+        backend = LocalCacheBackend()
+        worker_a = PrincipalCache(backend, maxsize=10, ttl=60)
+        worker_b = PrincipalCache(backend, maxsize=10, ttl=60)
+
+        version, _ = await worker_b.get("user", USER_ID)
+        worker_b.set("user", USER_ID, version, {"status": 1})
+        before = (await worker_b.get("user", USER_ID))[1]
+
+        async with async_session_maker() as db:
+            await worker_a.invalidate(db, "user", USER_ID)
+            await db.commit()
+
+        # 旧版本号读取的快照在失效后写入，同样不会命中
+        worker_b.set("user", USER_ID, version, {"status": 1})
+        version, after = await worker_b.get("user", USER_ID)
+        worker_b.set("user", USER_ID, version, {"status": 0})
+        return before, after, (await worker_b.get("user", USER_ID))[1]
+
+    before, after, refilled = run(scenario())
+    assert before == {"status": 1}
+    assert after is None
+    assert refilled == {"status": 0}
@@ -0,0 +1,128 @@
+"""
+只读路由测试
+
+- 只读会话不开启事务：关闭时不向数据库发送 COMMIT/ROLLBACK
+- 写入主库的请求下发签名的 X-Primary-Pin，带回后只读请求走主库；伪造、过期的令牌无效
+"""
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite.aiosqlite import AsyncAdapt_aiosqlite_connection
+from starlette.requests import Request
+
+from src.core import database
+from src.core.config import settings
+from src.core.database import (
+    PRIMARY_PIN_HEADER,
+    create_primary_pin,
+    engine,
+    get_db,
+    get_read_db,
+    is_primary_pinned,
+    read_engine,
+)
+from src.core.security import create_access_token, principal_cache
+from src.main import app
+from src.models.domain import Community, User
+
+USER_ID = "routinguser00000000000000000001"
+
+
+@pytest.fixture
+def replica_enabled(monkeypatch):
+    monkeypatch.setattr(database, "REPLICA_ENABLED", True)
+
+
+@pytest.fixture
+def dbapi_calls(monkeypatch):
+    """记录 DBAPI 连接上的 commit/rollback 调用"""
+    calls = []
+    for name in ("commit", "rollback"):
+        method = getattr(AsyncAdapt_aiosqlite_connection, name)
+
+        def record(self, method=method, name=name):
+            calls.append(name)
+            return method(self)
+
+        monkeypatch.setattr(AsyncAdapt_aiosqlite_connection, name, record)
+    return calls
+
+
+def _request(headers: dict[str, str] = None) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "state": {},
+    })
+
+
+async def _read_with(dependency, request: Request):
+    """按 FastAPI 的方式使用依赖：取得会话、执行查询、恢复生成器直至结束"""
+    dependency_gen = dependency(request)
+    session = await dependency_gen.__anext__()
+    await session.execute(select(Community.id))
+    with pytest.raises(StopAsyncIteration):
+        await dependency_gen.__anext__()
+    return session.bind
+
+
+def test_read_session_does_not_open_a_transaction(run, dbapi_calls):
+    async def calls_of_second_read(dependency) -> list[str]:
+        # 第一次读取建立连接（新连接初始化时会回滚一次），只统计第二次
+        await _read_with(dependency, _request())
+        dbapi_calls.clear()
+        await _read_with(dependency, _request())
+        return list(dbapi_calls)
+
+    assert run(calls_of_second_read(get_read_db)) == []
+    # 主库会话即使只读，关闭时也要回滚读事务
+    assert "rollback" in run(calls_of_second_read(get_db))
+
+
+def test_pinned_reads_use_the_primary(run, replica_enabled):
+    assert run(_read_with(get_read_db, _request())) is read_engine
+    pinned = _request({PRIMARY_PIN_HEADER: create_primary_pin()})
+    assert run(_read_with(get_read_db, pinned)) is engine
+
+
+def test_primary_pin_validation(monkeypatch):
+    token = create_primary_pin()
+    assert is_primary_pinned(token)
+
+    until, signature = token.split(".")
+    assert not is_primary_pinned(None)
+    assert not is_primary_pinned(f"{until}.{'0' * len(signature)}")
+    assert not is_primary_pinned(f"{int(until) + 1}.{signature}")
+    assert not is_primary_pinned(create_primary_pin(-10))
+    # 签名正确但超出固定窗口的令牌同样无效
+    assert not is_primary_pinned(create_primary_pin(3600))
+
+    monkeypatch.setattr(settings, "secret_key", "another-secret-key")
+    assert not is_primary_pinned(token)
+
+
+def test_writes_return_a_primary_pin(run, replica_enabled):
+    async def scenario():
+        principal_cache.clear()
+        async with database.async_session_maker() as db:
+            db.add(User(id=USER_ID, openid="routing-openid", status=1))
+            await db.commit()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"Authorization": "Bearer " + create_access_token({"sub": USER_ID})},
+        ) as client:
+            read = await client.get("/api/v1/user/info")
+            write = await client.post("/api/v1/students", json={
+                "id_name": "学员", "id_number": "110105201801010011",
+                "birthday": "2018-01-01", "gender": "male",
+            })
+        return read, write
+
+    read, write = run(scenario())
+    assert read.status_code == 200 and read.json()["code"] == 0
+    assert PRIMARY_PIN_HEADER not in read.headers
+    assert write.status_code == 200 and write.json()["code"] == 0, write.text
+    assert is_primary_pinned(write.headers[PRIMARY_PIN_HEADER])
@@ -0,0 +1,139 @@
+"""
+热点路由 SQL 语句数预算测试
+
+通过 ASGI 直接调用应用，读取调试模式下的 X-SQL-Count 响应头，
+与 core/query_monitor.py 中的 STATEMENT_BUDGETS 比较；认证缓存命中和未命中两种情况都要满足预算
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.core.config import settings
+from src.core.database import async_session_maker
+from src.core.query_monitor import STATEMENT_BUDGETS
+from src.core.security import create_access_token, principal_cache
+from src.main import app
+from src.models.domain import Community, Course, Student, Teacher, User
+
+USER_ID = "budgetuser0000000000000000000001"
+COURSE_ID = "budgetcourse00000000000000000001"
+STUDENT_IDS = [f"budgetstudent000000000000000000{i}" for i in range(2)]
+
+
+@pytest.fixture(autouse=True)
+def debug_headers(monkeypatch):
+    monkeypatch.setattr(settings, "debug", True)
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+async def _seed() -> None:
+    async with async_session_maker() as db:
+        db.add(User(id=USER_ID, openid="budget-openid", status=1))
+        db.add(Community(
+            id="budgetcommunity00000000000000001", name="小区", address="地址",
+            latitude=Decimal("30.0"), longitude=Decimal("120.0"),
+        ))
+        db.add(Teacher(id="budgetteacher0000000000000000001", name="教练"))
+        await db.flush()
+        db.add(Course(
+            id=COURSE_ID, community_id="budgetcommunity00000000000000001",
+            teacher_id="budgetteacher0000000000000000001", name="课程",
+            age_min=3, age_max=12, total_weeks=10, total_lessons=10, schedule_day="6",
+            schedule_start=time(9), schedule_end=time(10, 30),
+            price=Decimal("100.00"), member_price=Decimal("80.00"),
+            min_students=1, max_students=10, enrolled_count=0,
+            deadline=datetime.now() + timedelta(days=7), status="enrolling",
+        ))
+        for index, student_id in enumerate(STUDENT_IDS):
+            db.add(Student(
+                id=student_id, user_id=USER_ID, id_type="id_card", id_name=f"学员{index}",
+                id_number="encrypted", id_number_hash=f"hash{index}",
+                birthday=date(2018, 1, 1), gender="male",
+            ))
+        await db.commit()
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": "Bearer " + create_access_token({"sub": USER_ID})},
+    )
+
+
+def _assert_within_budget(response: httpx.Response, method: str, route: str) -> None:
+    assert response.status_code == 200, response.text
+    statements = int(response.headers["X-SQL-Count"])
+    budget = STATEMENT_BUDGETS[(method, route)]
+    assert statements <= budget, f"{method} {route} 执行 {statements} 条 SQL，超出预算 {budget}"
+
+
+@pytest.mark.parametrize("cached_principal", [False, True])
+def test_create_order_within_budget(run, cached_principal):
+    async def scenario():
+        await _seed()
+        async with _client() as client:
+            if cached_principal:
+                response = await client.get("/api/v1/orders")
+                _assert_within_budget(response, "GET", "/api/v1/orders")
+            else:
+                principal_cache.clear()
+            response = await client.post(
+                "/api/v1/orders",
+                json={"course_id": COURSE_ID, "student_ids": STUDENT_IDS},
+            )
+            _assert_within_budget(response, "POST", "/api/v1/orders")
+
+    run(scenario())
+
+
+def test_list_orders_within_budget(run):
+    async def scenario():
+        await _seed()
+        async with _client() as client:
+            for _ in range(3):
+                response = await client.post(
+                    "/api/v1/orders",
+                    json={"course_id": COURSE_ID, "student_ids": STUDENT_IDS[:1]},
+                )
+                assert response.status_code == 200, response.text
+                # 取消后同一学员可以再次报名，列表中积累多个订单
+                order_id = response.json()["data"]["id"]
+                response = await client.post(f"/api/v1/orders/{order_id}/cancel")
+                assert response.status_code == 200, response.text
+
+            for cached_principal in (False, True):
+                if not cached_principal:
+                    principal_cache.clear()
+                response = await client.get("/api/v1/orders")
+                _assert_within_budget(response, "GET", "/api/v1/orders")
+                assert response.json()["data"]["total"] == 3
+
+    run(scenario())
+
+
+def test_payment_confirm_within_budget(run):
+    async def scenario():
+        await _seed()
+        async with _client() as client:
+            response = await client.post(
+                "/api/v1/orders",
+                json={"course_id": COURSE_ID, "student_ids": STUDENT_IDS},
+            )
+            order_id = response.json()["data"]["id"]
+            response = await client.post(
+                "/api/v1/payment/prepay", json={"order_id": order_id}
+            )
+            assert response.status_code == 200, response.text
+
+            principal_cache.clear()
+            response = await client.post(
+                "/api/v1/payment/confirm", json={"order_id": order_id}
+            )
+            _assert_within_budget(response, "POST", "/api/v1/payment/confirm")
+
+    run(scenario())
@@ -0,0 +1,154 @@
+"""
+上传文件测试
+
+- multipart 请求体边接收边解析，超过大小限制的请求体在读取前或读取中途被拒绝
+- 上传中的临时文件写在上传目录之外，完成后移动到按内容哈希命名的位置
+- 临时目录与上传目录不在同一文件系统时复制后重命名
+- 静态服务不提供以 . 开头的路径
+"""
+import errno
+import hashlib
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.core.errors import ErrorCode
+from src.core.exceptions import AppException
+from src.core.static_files import ImageStaticFiles
+from src.main import app as main_app
+from src.services import upload_service
+from src.services.upload_service import MAX_FILE_SIZE, MULTIPART_OVERHEAD, UploadService
+
+CONTENT = b"image-bytes" * 1000
+BOUNDARY = "test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+async def _chunks(data: bytes, size: int = 4096):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _multipart(filename: str, content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        "备注\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _files(root) -> list[str]:
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root)
+        for dirpath, _, names in os.walk(root)
+        for name in names
+    )
+
+
+def test_save_stream_writes_temp_files_outside_upload_dir(run, tmp_path):
+    service = UploadService(tmp_path / "uploads", tmp_path / "tmp", max_size=len(CONTENT))
+    url, size = run(service.save_stream(_chunks(CONTENT), ".png"))
+
+    name = hashlib.sha256(CONTENT).hexdigest()
+    assert url == f"/{(tmp_path / 'uploads').as_posix()}/{name[:2]}/{name}.png"
+    assert size == len(CONTENT)
+    assert _files(tmp_path / "uploads") == [f"{name[:2]}/{name}.png"]
+    assert _files(tmp_path / "tmp") == []
+
+    with pytest.raises(AppException):
+        run(service.save_stream(_chunks(CONTENT + b"x"), ".png"))
+    assert _files(tmp_path / "tmp") == []
+
+
+def test_save_stream_across_filesystems(run, tmp_path, monkeypatch):
+    replace = os.replace
+
+    def cross_device_replace(src, dst):
+        if Path(src).parent == tmp_path / "tmp":
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return replace(src, dst)
+
+    monkeypatch.setattr(upload_service.os, "replace", cross_device_replace)
+    service = UploadService(tmp_path / "uploads", tmp_path / "tmp")
+    run(service.save_stream(_chunks(CONTENT), ".png"))
+
+    name = hashlib.sha256(CONTENT).hexdigest()
+    assert _files(tmp_path / "uploads") == [f"{name[:2]}/{name}.png"]
+    assert _files(tmp_path / "tmp") == []
+
+
+def test_hidden_paths_are_not_served(run, tmp_path):
+    (tmp_path / "uploads" / "ab").mkdir(parents=True)
+    (tmp_path / "uploads" / "ab" / "image.png").write_bytes(CONTENT)
+    (tmp_path / "uploads" / "ab" / ".partial").write_bytes(CONTENT)
+    app = FastAPI()
+    app.mount("/uploads", ImageStaticFiles(
+        directory=str(tmp_path / "uploads"), cache_dir=str(tmp_path / "cache")
+    ))
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return [
+                (await client.get(path)).status_code
+                for path in ("/uploads/ab/image.png", "/uploads/ab/.partial")
+            ]
+
+    assert run(scenario()) == [200, 404]
+
+
+def test_save_image_streams_multipart_body(run, tmp_path):
+    service = UploadService(tmp_path / "uploads", tmp_path / "tmp")
+    # 小块输入，边界和表单头跨块
+    body = _chunks(_multipart("photo.PNG", CONTENT), size=7)
+    result = run(service.save_image(CONTENT_TYPE, body))
+
+    name = hashlib.sha256(CONTENT).hexdigest()
+    assert result["filename"] == "photo.PNG" and result["size"] == len(CONTENT)
+    assert (tmp_path / "uploads" / name[:2] / f"{name}.png").read_bytes() == CONTENT
+
+    with pytest.raises(AppException) as exc_info:
+        run(service.save_image(CONTENT_TYPE, _chunks(_multipart("notes.txt", CONTENT))))
+    assert exc_info.value.code == ErrorCode.FILE_TYPE_ERROR
+    with pytest.raises(AppException) as exc_info:
+        run(service.save_image("application/json", _chunks(b"{}")))
+    assert exc_info.value.code == ErrorCode.BAD_REQUEST
+
+
+def test_oversize_upload_is_rejected_before_it_is_read(run, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chunk = b"x" * 64 * 1024
+    received: list[int] = []
+
+    async def body(total: int):
+        yield _multipart("big.png", b"")[:-len(f"\r\n--{BOUNDARY}--\r\n")]
+        for _ in range(total // len(chunk)):
+            received.append(len(chunk))
+            yield chunk
+
+    async def upload(headers: dict[str, str]):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main_app), base_url="http://test"
+        ) as client:
+            return await client.post(
+                "/api/v1/upload/image", content=body(4 * MAX_FILE_SIZE),
+                headers={"Content-Type": CONTENT_TYPE, **headers},
+            )
+
+    # Content-Length 超限：不读取请求体
+    response = run(upload({"Content-Length": str(4 * MAX_FILE_SIZE)}))
+    assert response.json()["code"] == ErrorCode.FILE_TOO_LARGE
+    assert received == []
+
+    # 分块传输没有 Content-Length：超过限制时中止，不读取剩余内容
+    response = run(upload({}))
+    assert response.json()["code"] == ErrorCode.FILE_TOO_LARGE
+    assert sum(received) <= MAX_FILE_SIZE + MULTIPART_OVERHEAD
+    assert _files(tmp_path / "tmp") == []
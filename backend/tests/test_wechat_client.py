@@ -0,0 +1,118 @@
+"""
+微信接口客户端测试
+
+用 httpx.MockTransport 模拟微信服务端：每次获取 access_token 都会使之前的 token 失效
+（比真实服务端更严格），多个 WechatClient 共享同一个存储模拟多个 worker
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.core.http_client import http_clients
+from src.core.wechat import LocalTokenStore, WechatAPIError, WechatClient
+
+
+class MockWechatServer:
+    """模拟的微信服务端"""
+
+    def __init__(self):
+        self.token_requests = 0
+        self.valid_token = None
+
+    def revoke(self) -> None:
+        """使当前 token 失效（如在公众平台重置了 AppSecret）"""
+        self.valid_token = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        # 让出事件循环，使并发请求真正交错
+        await asyncio.sleep(0.01)
+        if request.url.path == "/cgi-bin/token":
+            self.token_requests += 1
+            self.valid_token = f"token-{self.token_requests}"
+            return httpx.Response(
+                200, json={"access_token": self.valid_token, "expires_in": 7200}
+            )
+
+        if request.url.params.get("access_token") != self.valid_token:
+            return httpx.Response(200, json={"errcode": 40001, "errmsg": "invalid credential"})
+        code = json.loads(request.content)["code"]
+        if code == "bad":
+            return httpx.Response(200, json={"errcode": 40029, "errmsg": "invalid code"})
+        return httpx.Response(
+            200,
+            json={"errcode": 0, "errmsg": "ok", "phone_info": {"phoneNumber": "13800138000"}},
+        )
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = MockWechatServer()
+    client = httpx.AsyncClient(
+        base_url="https://api.weixin.qq.com", transport=httpx.MockTransport(server)
+    )
+    monkeypatch.setitem(http_clients._clients, "wechat", client)
+    return server
+
+
+def _workers(count: int) -> list[WechatClient]:
+    store = LocalTokenStore()
+    return [WechatClient("wx-app", "secret", store) for _ in range(count)]
+
+
+def test_concurrent_calls_share_one_refresh(run, server):
+    (client,) = _workers(1)
+
+    async def scenario():
+        return await asyncio.gather(*(client.get_phone_number("ok") for _ in range(20)))
+
+    results = run(scenario())
+    assert all(result["phoneNumber"] == "13800138000" for result in results)
+    assert server.token_requests == 1
+
+
+def test_uses_token_refreshed_by_other_worker(run, server):
+    worker_a, worker_b = _workers(2)
+
+    async def scenario():
+        await worker_a.get_phone_number("ok")
+        await worker_b.get_phone_number("ok")
+        # A 的 token 被拒绝后刷新，B 缓存的旧 token 随之失效
+        server.revoke()
+        await worker_a.get_phone_number("ok")
+        assert server.token_requests == 2
+        # B 被拒绝后从存储中取到 A 刷新的 token，不再刷新
+        await worker_b.get_phone_number("ok")
+
+    run(scenario())
+    assert server.token_requests == 2
+
+
+def test_rejected_token_refreshed_once_across_workers(run, server):
+    workers = _workers(4)
+
+    async def scenario():
+        await workers[0].get_phone_number("ok")
+        await asyncio.gather(*(worker.get_access_token() for worker in workers))
+        server.revoke()
+        return await asyncio.gather(
+            *(worker.get_phone_number("ok") for worker in workers for _ in range(5))
+        )
+
+    results = run(scenario())
+    assert len(results) == 20
+    assert server.token_requests == 2
+
+
+def test_other_errors_do_not_refresh(run, server):
+    (client,) = _workers(1)
+
+    async def scenario():
+        with pytest.raises(WechatAPIError) as exc_info:
+            await client.get_phone_number("bad")
+        return exc_info.value
+
+    error = run(scenario())
+    assert error.errcode == 40029
+    assert server.token_requests == 1
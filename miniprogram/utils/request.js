@@ -10,6 +10,21 @@ const config = {
   retryCount: 2,
 };
 
+// 写操作后服务端下发的主库固定令牌，原样带回，保证随后的读取能看到刚写入的数据
+const PRIMARY_PIN_HEADER = 'X-Primary-Pin';
+let primaryPin = '';
+
+/**
+ * 保存响应中的主库固定令牌
+ * @param {Object} header 响应头
+ */
+function savePrimaryPin(header) {
+  const pin = header && (header[PRIMARY_PIN_HEADER] || header[PRIMARY_PIN_HEADER.toLowerCase()]);
+  if (pin) {
+    primaryPin = pin;
+  }
+}
+
 /**
  * 发起请求
  * @param {Object} options 请求选项
@@ -27,11 +42,13 @@ function request(options) {
       header: {
         'Content-Type': 'application/json',
         'Authorization': token ? `Bearer ${token}` : '',
+        ...(primaryPin ? { [PRIMARY_PIN_HEADER]: primaryPin } : {}),
         ...options.header,
       },
       timeout: options.timeout || config.timeout,
       success: (res) => {
         const { statusCode, data } = res;
+        savePrimaryPin(res.header);
         
         if (statusCode >= 200 && statusCode < 300) {
           // 业务状态码检查
@@ -180,6 +197,7 @@ function upload(filePath, name = 'file', formData = {}) {
         'Authorization': token ? `Bearer ${token}` : '',
       },
       success: (res) => {
+        savePrimaryPin(res.header);
         if (res.statusCode === 200) {
           try {
             const data = JSON.parse(res.data);
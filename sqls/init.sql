@@ -56,6 +56,55 @@ INSERT INTO `admins` VALUES ('admin_001','admin','$2b$12$6JUd.7Nisbv3QJqyotz6Nue
 /*!40000 ALTER TABLE `admins` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `ai_description_cache`
+--
+
+DROP TABLE IF EXISTS `ai_description_cache`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `ai_description_cache` (
+  `cache_key` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '缓存键(模型+提示词+温度的SHA-256)',
+  `model` varchar(128) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '模型',
+  `description` text COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '生成的描述',
+  `tokens_used` int NOT NULL DEFAULT '0' COMMENT '生成时消耗的tokens',
+  `hit_count` int NOT NULL DEFAULT '0' COMMENT '命中次数',
+  `created_at` datetime NOT NULL COMMENT '创建时间',
+  `last_used_at` datetime NOT NULL COMMENT '最近使用时间',
+  PRIMARY KEY (`cache_key`),
+  KEY `idx_last_used_at` (`last_used_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI描述缓存表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `ai_image_jobs`
+--
+
+DROP TABLE IF EXISTS `ai_image_jobs`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `ai_image_jobs` (
+  `id` varchar(32) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '任务ID',
+  `admin_id` varchar(32) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '提交的管理员ID',
+  `prompt` varchar(512) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '提示词',
+  `size` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '图片尺寸',
+  `watermark` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否添加水印',
+  `status` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'pending' COMMENT '状态 pending/running/succeeded/failed',
+  `attempts` int NOT NULL DEFAULT '0' COMMENT '已尝试次数',
+  `url` varchar(512) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '本地图片URL',
+  `original_url` varchar(1024) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '原始图片URL',
+  `model` varchar(128) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '使用的模型',
+  `error` varchar(512) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '失败原因',
+  `next_run_at` datetime DEFAULT NULL COMMENT '下次执行时间(重试退避)',
+  `started_at` datetime DEFAULT NULL COMMENT '开始执行时间',
+  `finished_at` datetime DEFAULT NULL COMMENT '完成时间',
+  `created_at` datetime NOT NULL COMMENT '创建时间',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`id`),
+  KEY `idx_status_created_at` (`status`,`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI图片生成任务表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `banners`
 --
@@ -89,6 +138,20 @@ INSERT INTO `banners` VALUES ('banner_001','冬季体能特训营','/uploads/202
 /*!40000 ALTER TABLE `banners` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `cache_versions`
+--
+
+DROP TABLE IF EXISTS `cache_versions`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `cache_versions` (
+  `namespace` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '缓存命名空间',
+  `version` int NOT NULL DEFAULT '0' COMMENT '版本号',
+  PRIMARY KEY (`namespace`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='缓存版本表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `communities`
 --
@@ -214,6 +277,44 @@ INSERT INTO `courses` VALUES ('course_001','community_001','teacher_001','体能
 /*!40000 ALTER TABLE `courses` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `daily_order_stats`
+--
+
+DROP TABLE IF EXISTS `daily_order_stats`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `daily_order_stats` (
+  `stat_date` date NOT NULL COMMENT '统计日期',
+  `new_users` int NOT NULL DEFAULT '0' COMMENT '新增用户数',
+  `new_orders` int NOT NULL DEFAULT '0' COMMENT '新增订单数',
+  `paid_orders` int NOT NULL DEFAULT '0' COMMENT '支付订单数',
+  `revenue` decimal(14,2) NOT NULL DEFAULT '0.00' COMMENT '支付金额',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`stat_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='每日订单统计表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `dashboard_snapshots`
+--
+
+DROP TABLE IF EXISTS `dashboard_snapshots`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `dashboard_snapshots` (
+  `name` varchar(32) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '快照名称',
+  `total_users` int NOT NULL DEFAULT '0' COMMENT '用户总数',
+  `total_orders` int NOT NULL DEFAULT '0' COMMENT '订单总数',
+  `paid_orders` int NOT NULL DEFAULT '0' COMMENT '已支付订单数',
+  `total_revenue` decimal(14,2) NOT NULL DEFAULT '0.00' COMMENT '总收入',
+  `total_courses` int NOT NULL DEFAULT '0' COMMENT '课程总数',
+  `enrolling_courses` int NOT NULL DEFAULT '0' COMMENT '报名中的课程数',
+  `refreshed_at` datetime NOT NULL COMMENT '刷新时间',
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='仪表盘统计快照表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `member_cards`
 --
@@ -280,6 +381,9 @@ CREATE TABLE `orders` (
   KEY `idx_course_id` (`course_id`),
   KEY `idx_status` (`status`),
   KEY `idx_created_at` (`created_at`),
+  KEY `idx_status_expire_at` (`status`,`expire_at`),
+  KEY `idx_pay_time` (`pay_time`),
+  KEY `idx_updated_at` (`updated_at`),
   CONSTRAINT `fk_orders_course_id` FOREIGN KEY (`course_id`) REFERENCES `courses` (`id`) ON DELETE CASCADE,
   CONSTRAINT `fk_orders_user_id` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='订单表';
@@ -356,6 +460,7 @@ CREATE TABLE `students` (
   PRIMARY KEY (`id`),
   KEY `idx_user_id` (`user_id`),
   KEY `idx_id_number_hash` (`id_number_hash`),
+  KEY `idx_created_at_id` (`created_at`,`id`),
   CONSTRAINT `fk_students_user_id` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='学员表';
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -387,7 +492,8 @@ CREATE TABLE `teachers` (
   `created_at` datetime NOT NULL COMMENT '创建时间',
   `updated_at` datetime NOT NULL COMMENT '更新时间',
   PRIMARY KEY (`id`),
-  KEY `idx_name` (`name`)
+  KEY `idx_name` (`name`),
+  KEY `idx_created_at_id` (`created_at`,`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='教练表';
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -421,6 +527,7 @@ CREATE TABLE `user_members` (
   KEY `idx_user_id` (`user_id`),
   KEY `idx_expire_at` (`expire_at`),
   KEY `fk_user_members_card_id` (`card_id`),
+  KEY `idx_created_at_id` (`created_at`,`id`),
   CONSTRAINT `fk_user_members_card_id` FOREIGN KEY (`card_id`) REFERENCES `member_cards` (`id`) ON DELETE CASCADE,
   CONSTRAINT `fk_user_members_user_id` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='用户会员记录表';
@@ -462,7 +569,9 @@ CREATE TABLE `users` (
   UNIQUE KEY `phone` (`phone`),
   KEY `idx_openid` (`openid`),
   KEY `idx_phone` (`phone`),
-  KEY `idx_unionid` (`unionid`)
+  KEY `idx_unionid` (`unionid`),
+  KEY `idx_nickname` (`nickname`),
+  KEY `idx_created_at` (`created_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='用户表';
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -476,6 +585,22 @@ INSERT INTO `users` VALUES ('184a240da0be4d7e87af92425b1e04f7','mock_openid_cb49
 /*!40000 ALTER TABLE `users` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `wechat_access_tokens`
+--
+
+DROP TABLE IF EXISTS `wechat_access_tokens`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `wechat_access_tokens` (
+  `app_id` varchar(64) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '小程序 AppID',
+  `access_token` varchar(512) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '接口调用凭证',
+  `expires_at` datetime NOT NULL COMMENT '过期时间',
+  `updated_at` datetime NOT NULL COMMENT '更新时间',
+  PRIMARY KEY (`app_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='微信access_token表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Dumping events for database 'spot'
 --